@@ -1,7 +1,12 @@
+import asyncio
 import traceback
 
 from app.bigquery.client import BigqueryClient
-from app.bigquery.queue import BigqueryQueue
+from app.bigquery.queue import (
+    BigqueryQueue,
+    queue_gauges,
+    replay_queues as replay_bigquery_queues,
+)
 from app.logging import logger
 
 from zoneinfo import ZoneInfo
@@ -71,6 +76,17 @@ if settings.ENV == "prod":
         # 서버 저장소 동기화
         store = Store(client=SpreadSheetClient())
 
+        # 빅쿼리 로그 테이블 생성 및 스키마 확인
+        try:
+            await asyncio.to_thread(BigqueryClient().ensure_tables)
+        except Exception as e:  # noqa: BLE001
+            # 테이블을 확인하지 못해도 서버는 계속 시작합니다.
+            logger.error(f"BigQuery 테이블 확인 실패: {e}")
+
+        # 이전 프로세스에서 업로드하지 못한 큐 복구
+        store.replay_queues()
+        replay_bigquery_queues()
+
         # # 업로드 스케줄러
         async_schedule.add_job(
             upload_queue, "interval", seconds=20, args=[store, slack_app]
@@ -80,8 +96,11 @@ if settings.ENV == "prod":
         # log_trigger = IntervalTrigger(minutes=1, timezone=ZoneInfo("Asia/Seoul"))
         # async_schedule.add_job(upload_logs, trigger=log_trigger, args=[store])
 
-        # 빅쿼리 업로드 스케줄러
-        bigquery_trigger = IntervalTrigger(minutes=10, timezone=ZoneInfo("Asia/Seoul"))
+        # 빅쿼리 업로드 스케줄러: 행 수/바이트/나이 기준에 닿은 테이블만 업로드
+        bigquery_trigger = IntervalTrigger(
+            seconds=settings.BIGQUERY_FLUSH_CHECK_SECONDS,
+            timezone=ZoneInfo("Asia/Seoul"),
+        )
         queue = BigqueryQueue(client=BigqueryClient())
         async_schedule.add_job(upload_bigquery, trigger=bigquery_trigger, args=[queue])
 
@@ -124,9 +143,8 @@ if settings.ENV == "prod":
 
     async def upload_bigquery(queue: BigqueryQueue) -> None:
         try:
-            logger.info("BigQuery 업로드 작업 시작")
-            await queue.upload()
-            logger.info("BigQuery 업로드 작업 완료")
+            logger.debug(f"BigQuery 업로드 대기: {queue_gauges()}")
+            await queue.upload(only_due=True)
         except Exception as e:
             trace = traceback.format_exc()
             error = f"빅쿼리 업로드 중 에러가 발생했어요. {str(e)}"
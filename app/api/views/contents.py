@@ -1,6 +1,5 @@
 from enum import StrEnum
 from typing import Any, Literal
-import polars as pl
 
 from starlette import status
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -8,6 +7,7 @@ from app.api.auth import current_user
 from app.constants import ContentCategoryEnum, ContentSortEnum
 from app.api import dto
 from app.models import SimpleUser
+from app.tables import table_cache
 from app.utils import translate_keywords
 from app.config import settings
 from app.slack.event_handler import app as slack_app
@@ -52,14 +52,15 @@ async def fetch_contents(
     # TODO: 결과가 없을 경우, 글감 추천하기 <- 클라이언트가 처리
     # TODO: 북마크 글 연동하기
     # TODO: 큐레이션 탭 추가하기
+    import polars as pl  # 서버 시작 시간을 줄이기 위해 처음 검색할 때 불러옵니다.
 
     # 원본 데이터 불러오기
     users_df = pl.read_csv(
-        "store/users.csv",
+        table_cache.table("users").csv_source(),
         columns=["user_id", "name", "cohort", "channel_name"],
     )
     contents_df = pl.read_csv(
-        "store/contents.csv",
+        table_cache.table("contents").csv_source(),
         columns=[
             "user_id",
             "title",
@@ -1,6 +1,7 @@
-import csv
 from fastapi import APIRouter, status
 
+from app.tables import table_cache
+
 router = APIRouter()
 
 
@@ -10,7 +11,4 @@ router = APIRouter()
 )
 async def fetch_writing_participation() -> list[dict[str, str]]:
     """글쓰기 참여 신청 목록을 가져옵니다."""
-    with open("store/writing_participation.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        data = [each for each in reader]
-    return data
+    return table_cache.table("writing_participation").all()
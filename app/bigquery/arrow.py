@@ -0,0 +1,57 @@
+import io
+from collections.abc import Iterable
+from itertools import islice
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 빅쿼리 컬럼 타입 -> Arrow 타입
+ARROW_TYPES: dict[str, pa.DataType] = {
+    "STRING": pa.string(),
+    "INTEGER": pa.int64(),
+    "INT64": pa.int64(),
+    "FLOAT": pa.float64(),
+    "FLOAT64": pa.float64(),
+    "BOOLEAN": pa.bool_(),
+    "BOOL": pa.bool_(),
+    "DATE": pa.date32(),
+    "DATETIME": pa.timestamp("us"),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+}
+
+ROW_GROUP_SIZE = 10_000
+
+
+def to_arrow_schema(schema: list[dict[str, Any]]) -> pa.Schema:
+    """app/bigquery/schemas 의 json 스키마를 Arrow 스키마로 변환합니다."""
+    fields = []
+    for column in schema:
+        column_type = column["type"].upper()
+        if column_type not in ARROW_TYPES:
+            raise ValueError(
+                f"지원하지 않는 빅쿼리 타입입니다: {column['name']} {column_type}"
+            )
+        nullable = column.get("mode", "NULLABLE").upper() != "REQUIRED"
+        fields.append(pa.field(column["name"], ARROW_TYPES[column_type], nullable))
+    return pa.schema(fields)
+
+
+def write_parquet(
+    rows: Iterable[dict[str, Any]],
+    schema: pa.Schema,
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> tuple[io.BytesIO, int]:
+    """
+    행(dict)들을 스키마에 맞춰 Parquet 버퍼로 직렬화하고 (버퍼, 행 수)를 반환합니다.
+    row_group_size 개씩 나눠 쓰므로 제너레이터를 넘기면 전체 행을 메모리에 올리지 않습니다.
+    """
+    buffer = io.BytesIO()
+    count = 0
+    iterator = iter(rows)
+    with pq.ParquetWriter(buffer, schema) as writer:
+        while chunk := list(islice(iterator, row_group_size)):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    buffer.seek(0)
+    return buffer, count
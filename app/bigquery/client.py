@@ -1,24 +1,58 @@
+from datetime import UTC, date, datetime, timedelta
 from enum import StrEnum
+import threading
+import uuid
 import orjson
-from typing import Any
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any
 
-from google.cloud import bigquery
-from google.oauth2 import service_account
+from app.bigquery.query import QueryCache, cache_key, to_query_parameters
 from app.config import settings
 from app.logging import logger
 
-import pandas as pd
-from pandas_gbq import to_gbq
-
-credentials = service_account.Credentials.from_service_account_info(
-    info=settings.BIGQUERY_CREDENTIALS
-)
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from google.cloud import bigquery
+    from google.oauth2.service_account import Credentials
 
 
 class TableNameEnum(StrEnum):
     COMMENTS_LOG = "comments_log"
     POSTS_LOG = "posts_log"
     EMOJIS_LOG = "emojis_log"
+    DAILY_ACTIVITY = "daily_activity"  # 댓글/이모지 일별 집계
+
+
+# 같은 이벤트를 다시 적재해도 한 행만 남도록 MERGE 에서 비교하는 키
+MERGE_KEYS: dict[TableNameEnum, tuple[str, ...]] = {
+    TableNameEnum.COMMENTS_LOG: ("channel_id", "ts", "comment_ts"),
+    TableNameEnum.EMOJIS_LOG: ("channel_id", "ts", "reactions_ts"),
+    TableNameEnum.POSTS_LOG: ("channel_id", "ts"),
+    TableNameEnum.DAILY_ACTIVITY: (
+        "batch_id",
+        "tddate",
+        "channel_id",
+        "user_id",
+        "activity",
+        "reaction",
+    ),
+}
+
+# MERGE 에서 키가 이미 있으면 새 값으로 바꾸는 컬럼 (없으면 추가만 합니다.)
+MERGE_UPDATE_COLUMNS: dict[TableNameEnum, tuple[str, ...]] = {
+    TableNameEnum.DAILY_ACTIVITY: ("count",),
+}
+
+# 로그 테이블은 tddate 로 일 단위 파티션을 나누고 channel_id, user_id 로 클러스터링합니다.
+PARTITION_FIELD = "tddate"
+CLUSTER_FIELDS = ["channel_id", "user_id"]
+
+# 같은 타입의 다른 이름
+TYPE_ALIASES = {"INT64": "INTEGER", "FLOAT64": "FLOAT", "BOOL": "BOOLEAN"}
+
+# MERGE 전에 실패해 지우지 못한 스테이징 테이블도 이 시간이 지나면 만료됩니다.
+STAGING_TABLE_EXPIRATION = timedelta(hours=1)
 
 
 class BigqueryClient:
@@ -31,12 +65,14 @@ class BigqueryClient:
 
     def __init__(self) -> None:
         if not hasattr(self, "_initialized"):
-            self.credentials = credentials
-            self.project_id = self.credentials.project_id
+            # 인증 정보와 빅쿼리 클라이언트는 처음 사용할 때 만듭니다.
+            self._credentials: Credentials | None = None
+            self._client: bigquery.Client | None = None
+            self._arrow_schemas: dict[TableNameEnum, pa.Schema] = {}
+            self.query_cache = QueryCache(max_size=settings.BIGQUERY_QUERY_CACHE_SIZE)
+            # 테이블별 업로드가 여러 스레드에서 동시에 클라이언트를 만들지 않도록 합니다.
+            self._lazy_lock = threading.RLock()
             self.database_id = settings.BIGQUERY_DATABASE_ID
-            self.client = bigquery.Client(
-                credentials=credentials, project=self.project_id
-            )
             self.schemas = {
                 TableNameEnum.COMMENTS_LOG: self._read_schema(
                     "app/bigquery/schemas/comments_log.json"
@@ -47,14 +83,46 @@ class BigqueryClient:
                 TableNameEnum.EMOJIS_LOG: self._read_schema(
                     "app/bigquery/schemas/emojis_log.json"
                 ),
+                TableNameEnum.DAILY_ACTIVITY: self._read_schema(
+                    "app/bigquery/schemas/daily_activity.json"
+                ),
             }
             self._initialized = True
 
+    @property
+    def credentials(self) -> "Credentials":
+        with self._lazy_lock:
+            if self._credentials is None:
+                from google.oauth2 import service_account
+
+                self._credentials = (
+                    service_account.Credentials.from_service_account_info(
+                        info=settings.BIGQUERY_CREDENTIALS
+                    )
+                )
+            return self._credentials
+
+    @property
+    def project_id(self) -> str:
+        return self.credentials.project_id
+
+    @property
+    def client(self) -> "bigquery.Client":
+        with self._lazy_lock:
+            if self._client is None:
+                from google.cloud import bigquery
+
+                self._client = bigquery.Client(
+                    credentials=self.credentials, project=self.project_id
+                )
+            return self._client
+
     def create_table(
         self,
         table_name: TableNameEnum,
         partition: bool = False,
         partition_key: str | None = None,
+        cluster_fields: list[str] | None = None,
     ) -> None:
         """
         파이썬에서 빅쿼리 테이블을 생성합니다.
@@ -67,7 +135,11 @@ class BigqueryClient:
             파티션 키를 만들것인지 체크, by default False
         partition_key : str, optional
             파티션 키를 만든다면 어떤 컬럼을 사용할 것인지 명시, by default None
+        cluster_fields : list[str], optional
+            클러스터링할 컬럼, by default None
         """
+        from google.cloud import bigquery
+
         table_path = f"{self.project_id}.{self.database_id}.{table_name}"
         table = bigquery.Table(table_path, schema=self.schemas[table_name])
 
@@ -78,24 +150,96 @@ class BigqueryClient:
             )
             table.time_partitioning = partitioning
 
+        if cluster_fields:
+            table.clustering_fields = cluster_fields
+
         self.client.create_table(table)
         logger.info(f"BigQuery 테이블 생성 완료: {table_path}")
 
-    def run_query_to_dataframe(self, query: str) -> pd.DataFrame:
+    def ensure_tables(self) -> dict[TableNameEnum, list[str]]:
+        """
+        로그 테이블이 모두 있는지 확인하고,
+        없으면 tddate 파티션과 channel_id, user_id 클러스터링으로 만듭니다.
+        이미 있는 테이블은 클러스터링을 맞추고,
+        json 스키마와 다른 점을 경고한 뒤 테이블별로 반환합니다.
+        """
+        from google.api_core.exceptions import NotFound
+
+        drifts = {}
+        for table_name in TableNameEnum:
+            table_path = f"{self.project_id}.{self.database_id}.{table_name}"
+            try:
+                table = self.client.get_table(table_path)
+            except NotFound:
+                self.create_table(
+                    table_name,
+                    partition=True,
+                    partition_key=PARTITION_FIELD,
+                    cluster_fields=CLUSTER_FIELDS,
+                )
+                drifts[table_name] = []
+                continue
+
+            drift = self._schema_drift(table_name, table.schema)
+            partitioning = table.time_partitioning
+            if not partitioning or partitioning.field != PARTITION_FIELD:
+                # 파티션은 테이블을 다시 만들어야 바꿀 수 있으므로 경고만 합니다.
+                drift.append(f"{PARTITION_FIELD} 파티션이 없습니다.")
+            if table.clustering_fields != CLUSTER_FIELDS:
+                table.clustering_fields = CLUSTER_FIELDS
+                self.client.update_table(table, ["clustering_fields"])
+                logger.info(f"BigQuery 테이블 클러스터링 변경: {table_path}, {CLUSTER_FIELDS}")
+
+            for message in drift:
+                logger.warning(f"BigQuery 테이블 스키마 불일치: {table_path}, {message}")
+            drifts[table_name] = drift
+        return drifts
+
+    def run_query_to_dataframe(
+        self,
+        query: str,
+        params: Mapping[str, Any] | None = None,
+        ttl: float | None = None,
+    ) -> "pd.DataFrame":
         """
         빅쿼리에 직접 쿼리를 날립니다
 
         Parameters
         ----------
+        query : str
+            쿼리. 값은 문자열로 붙이지 말고 @이름 으로 params 에 넘깁니다.
+        params : Mapping[str, Any], optional
+            쿼리 파라미터, by default None
+        ttl : float, optional
+            결과를 캐시할 시간(초). 0 이면 캐시하지 않습니다,
+            by default BIGQUERY_QUERY_CACHE_SECONDS
+        """
+        # 호출한 쪽에서 수정해도 캐시된 결과가 바뀌지 않도록 복사본을 반환합니다.
+        return self._cached_query(
+            query, params, ttl, "dataframe", lambda result: result.to_dataframe()
+        ).copy()
 
+    def query_rows(
+        self,
+        query: str,
+        params: Mapping[str, Any] | None = None,
+        ttl: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        쿼리 결과를 판다스 변환 없이 Arrow 에서 바로 행(dict) 목록으로 반환합니다.
+        캐시된 결과를 그대로 돌려주므로 반환값을 수정하지 않습니다.
+        인자는 run_query_to_dataframe 과 같습니다.
         """
-        return self.client.query(query=query).result().to_dataframe()
+        return self._cached_query(
+            query, params, ttl, "rows", lambda result: result.to_arrow().to_pylist()
+        )
 
     def read_table(
         self,
         table_name: TableNameEnum,
         where_clause: str | None = None,
-    ) -> pd.DataFrame:
+        params: Mapping[str, Any] | None = None,
+    ) -> "pd.DataFrame":
         """
         빅쿼리 테이블을 판다스로 읽어옵니다.
 
@@ -105,6 +249,8 @@ class BigqueryClient:
             테이블명
         where_clause : str
             조건절을 입력합니다. 만약 파티션 키가 있는데 조건절을 입력하지 않으면 에러가 발생합니다, by default None
+        params : Mapping[str, Any], optional
+            조건절에서 @이름 으로 사용하는 쿼리 파라미터, by default None
         """
         table_path = f"{self.project_id}.{self.database_id}.{table_name}"
         table = self.client.get_table(table_path)
@@ -123,11 +269,11 @@ class BigqueryClient:
                 WHERE {where_clause}
                 """
 
-        return self.client.query(qr).to_dataframe()
+        return self.run_query_to_dataframe(qr, params)
 
     def update_table(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         table_name: TableNameEnum,
         if_exists: str,
     ) -> None:
@@ -143,6 +289,8 @@ class BigqueryClient:
         if_exists : str
             테이블이 만약에 존재한다면 어떤 조건을 사용할 것인지 3가지 사용가능 - fail, replace, append
         """
+        from pandas_gbq import to_gbq
+
         table_path = f"{self.project_id}.{self.database_id}.{table_name}"
         to_gbq(
             dataframe=df,
@@ -153,10 +301,169 @@ class BigqueryClient:
         )
         logger.info(f"BigQuery 테이블 업데이트 완료: {table_path}, 행 수: {len(df)}, 모드: {if_exists}")
 
+    def load_rows(
+        self,
+        rows: Iterable[dict[str, Any]],
+        table_name: TableNameEnum,
+        write_disposition: str = "WRITE_APPEND",
+        destination: str | None = None,
+    ) -> tuple[int, int]:
+        """
+        행(dict)들을 Parquet 으로 직렬화해 빅쿼리 load job 으로 적재합니다.
+        적재한 (행 수, 바이트)를 반환합니다.
+        판다스 변환과 to_gbq 의 스키마 확인 없이 json 스키마로 만든 Arrow 스키마를 씁니다.
+
+        Parameters
+        ----------
+        rows : Iterable[dict[str, Any]]
+            적재할 행. 제너레이터를 넘기면 나눠서 직렬화합니다.
+        table_name : str
+            테이블명
+        write_disposition : str, optional
+            WRITE_APPEND, WRITE_TRUNCATE, WRITE_EMPTY 중 하나, by default WRITE_APPEND
+        destination : str, optional
+            table_name 스키마로 다른 테이블(스테이징 등)에 적재할 때 테이블명, by default table_name
+        """
+        from google.cloud import bigquery
+
+        from app.bigquery.arrow import to_arrow_schema, write_parquet
+
+        if table_name not in self._arrow_schemas:
+            self._arrow_schemas[table_name] = to_arrow_schema(self.schemas[table_name])
+        buffer, count = write_parquet(rows, self._arrow_schemas[table_name])
+        size = buffer.getbuffer().nbytes
+        if not count:
+            return 0, 0
+
+        table_path = f"{self.project_id}.{self.database_id}.{destination or table_name}"
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=write_disposition,
+            schema=[
+                bigquery.SchemaField.from_api_repr(field)
+                for field in self.schemas[table_name]
+            ],
+        )
+        job = self.client.load_table_from_file(
+            buffer, table_path, job_config=job_config, rewind=True
+        )
+        job.result()
+        logger.info(f"BigQuery 테이블 적재 완료: {table_path}, 행 수: {count}")
+        return count, size
+
+    def merge_rows(
+        self,
+        rows: Iterable[dict[str, Any]],
+        table_name: TableNameEnum,
+    ) -> tuple[int, int]:
+        """
+        행들을 스테이징 테이블에 적재한 뒤 MERGE_KEYS 로 비교해 대상 테이블에 없는 행만 추가합니다.
+        적재한 (행 수, 바이트)를 반환합니다.
+        업로드가 중간에 실패해 같은 행을 다시 보내도 대상 테이블에는 한 번만 남습니다.
+
+        Parameters
+        ----------
+        rows : Iterable[dict[str, Any]]
+            적재할 행
+        table_name : str
+            대상 테이블명
+        """
+        from google.cloud import bigquery
+
+        staging_name = f"{table_name}_staging_{uuid.uuid4().hex}"
+        staging_path = f"{self.project_id}.{self.database_id}.{staging_name}"
+        staging_table = bigquery.Table(
+            staging_path,
+            schema=[
+                bigquery.SchemaField.from_api_repr(field)
+                for field in self.schemas[table_name]
+            ],
+        )
+        staging_table.expires = datetime.now(UTC) + STAGING_TABLE_EXPIRATION
+        self.client.create_table(staging_table)
+
+        # 대상 테이블에서 배치의 tddate 파티션만 읽도록 날짜 범위를 모읍니다.
+        tddates: set[date] = set()
+
+        def _collect_tddates(
+            rows: Iterable[dict[str, Any]],
+        ) -> Iterable[dict[str, Any]]:
+            for row in rows:
+                tddates.add(row[PARTITION_FIELD])
+                yield row
+
+        try:
+            count, size = self.load_rows(
+                _collect_tddates(rows), table_name, destination=staging_name
+            )
+            if not count:
+                return 0, 0
+            job = self.client.query(
+                self._merge_query(table_name, staging_path),
+                job_config=self._query_config(
+                    {"min_tddate": min(tddates), "max_tddate": max(tddates)}
+                ),
+            )
+            job.result()
+        finally:
+            self.client.delete_table(staging_path, not_found_ok=True)
+
+        inserted = job.num_dml_affected_rows or 0
+        logger.info(
+            f"BigQuery 테이블 병합 완료: {table_name}, 행 수: {count}, "
+            f"추가: {inserted}, 중복 제외: {count - inserted}"
+        )
+        return count, size
+
+    def ingest_rows(
+        self,
+        rows: Iterable[dict[str, Any]],
+        table_name: TableNameEnum,
+    ) -> tuple[int, int]:
+        """
+        BIGQUERY_INGEST_MODE 에 따라 로그를 적재하고, (행 수, 바이트)를 반환합니다.
+        - merge: 스테이징 테이블을 거쳐 중복 없이 추가합니다.
+        - append: load job 으로 그대로 추가합니다.
+        """
+        if settings.BIGQUERY_INGEST_MODE == "merge":
+            return self.merge_rows(rows, table_name)
+        return self.load_rows(rows, table_name)
+
+    def _merge_query(self, table_name: TableNameEnum, staging_path: str) -> str:
+        """
+        스테이징 테이블에서 키별로 한 행만 골라, 대상 테이블에 없는 행을 추가하는 MERGE 쿼리입니다.
+        MERGE_UPDATE_COLUMNS 가 있는 테이블은 이미 있는 행의 값도 바꿉니다.
+        대상 테이블은 @min_tddate ~ @max_tddate 파티션만 비교합니다.
+        """
+        target_path = f"{self.project_id}.{self.database_id}.{table_name}"
+        keys = MERGE_KEYS[table_name]
+        on_clause = " AND ".join(f"T.{key} = S.{key}" for key in keys)
+        on_clause += f" AND T.{PARTITION_FIELD} BETWEEN @min_tddate AND @max_tddate"
+        update_columns = MERGE_UPDATE_COLUMNS.get(table_name)
+        matched_clause = ""
+        if update_columns:
+            matched_clause = "WHEN MATCHED THEN UPDATE SET " + ", ".join(
+                f"{column} = S.{column}" for column in update_columns
+            )
+        return f"""
+        MERGE `{target_path}` T
+        USING (
+            SELECT *
+            FROM `{staging_path}`
+            WHERE TRUE
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {", ".join(keys)}) = 1
+        ) S
+        ON {on_clause}
+        {matched_clause}
+        WHEN NOT MATCHED THEN
+            INSERT ROW
+        """
+
     def delete_table(
         self,
         table_name: TableNameEnum,
         where_clause: str,
+        params: Mapping[str, Any] | None = None,
     ) -> None:
         """
         파이썬에서 빅쿼리 내에서 특정 조건에 해당하는 데이터를 삭재합니다.
@@ -168,14 +475,18 @@ class BigqueryClient:
             테이블명
         where_clause : str
             삭제 조건을 입력합니다.
+        params : Mapping[str, Any], optional
+            조건절에서 @이름 으로 사용하는 쿼리 파라미터, by default None
         """
         table_path = f"{self.project_id}.{self.database_id}.{table_name}"
         qr = f"""
         DELETE FROM `{table_path}`
         {where_clause}
         """
-        query_job = self.client.query(qr)
+        query_job = self.client.query(qr, job_config=self._query_config(params))
         query_job.result()
+        # 지운 행이 캐시된 조회 결과에 남지 않도록 합니다.
+        self.query_cache.clear()
 
         logger.info(f"BigQuery 테이블 삭제 완료: {table_path}, 조건: {where_clause}")
 
@@ -228,6 +539,65 @@ class BigqueryClient:
 
         logger.info(f"BigQuery 테이블 upsert 완료: {target_path}")
 
+    def _cached_query(
+        self,
+        query: str,
+        params: Mapping[str, Any] | None,
+        ttl: float | None,
+        kind: str,
+        convert: Callable[[Any], Any],
+    ) -> Any:
+        """
+        캐시에 결과가 있으면 돌려주고,
+        없으면 파라미터 쿼리를 실행해 convert 한 결과를 캐시합니다.
+        """
+        ttl = settings.BIGQUERY_QUERY_CACHE_SECONDS if ttl is None else ttl
+        key = cache_key(query, params, kind)
+        if ttl > 0:
+            found, value = self.query_cache.get(key)
+            if found:
+                return value
+
+        job = self.client.query(query, job_config=self._query_config(params))
+        value = convert(job.result())
+        if ttl > 0:
+            self.query_cache.set(key, value, ttl)
+        return value
+
+    def _query_config(
+        self, params: Mapping[str, Any] | None
+    ) -> "bigquery.QueryJobConfig | None":
+        if not params:
+            return None
+
+        from google.cloud import bigquery
+
+        return bigquery.QueryJobConfig(query_parameters=to_query_parameters(params))
+
+    def _schema_drift(
+        self, table_name: TableNameEnum, live_schema: list["bigquery.SchemaField"]
+    ) -> list[str]:
+        """json 스키마와 실제 테이블 스키마의 컬럼, 타입, 모드가 다른 점을 반환합니다."""
+
+        def _column(column_type: str, mode: str | None) -> tuple[str, str]:
+            column_type = column_type.upper()
+            return TYPE_ALIASES.get(column_type, column_type), (mode or "NULLABLE").upper()
+
+        expected = {
+            column["name"]: _column(column["type"], column.get("mode"))
+            for column in self.schemas[table_name]
+        }
+        live = {field.name: _column(field.field_type, field.mode) for field in live_schema}
+
+        drift = [f"{name} 컬럼이 테이블에 없습니다." for name in expected if name not in live]
+        drift += [f"{name} 컬럼이 json 스키마에 없습니다." for name in live if name not in expected]
+        drift += [
+            f"{name} 컬럼이 다릅니다. 스키마: {expected[name]}, 테이블: {live[name]}"
+            for name in expected
+            if name in live and expected[name] != live[name]
+        ]
+        return drift
+
     def _read_schema(self, file_path: str) -> list[dict[str, Any]]:
         """
         스키마를 읽어옵니다.
@@ -0,0 +1,109 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+# 파이썬 값 -> 빅쿼리 쿼리 파라미터 타입 (bool 은 int 보다 먼저 확인합니다.)
+PARAMETER_TYPES: list[tuple[type, str]] = [
+    (bool, "BOOL"),
+    (int, "INT64"),
+    (float, "FLOAT64"),
+    (str, "STRING"),
+    (datetime, "DATETIME"),
+    (date, "DATE"),
+]
+
+
+def normalize_query(query: str) -> str:
+    """공백과 줄바꿈만 다른 쿼리가 같은 캐시 키를 갖도록 정리합니다."""
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def _parameter_type(value: Any) -> str:
+    for python_type, parameter_type in PARAMETER_TYPES:
+        if isinstance(value, python_type):
+            if parameter_type == "DATETIME" and value.tzinfo is not None:
+                return "TIMESTAMP"
+            return parameter_type
+    raise ValueError(f"지원하지 않는 쿼리 파라미터 타입입니다: {type(value).__name__}")
+
+
+def to_query_parameters(
+    params: Mapping[str, Any],
+) -> list["bigquery.ScalarQueryParameter | bigquery.ArrayQueryParameter"]:
+    """
+    {이름: 값} 을 빅쿼리 쿼리 파라미터로 변환합니다. 쿼리에서는 @이름 으로 사용합니다.
+    list, tuple, set 은 ARRAY 파라미터가 되며 `IN UNNEST(@이름)` 으로 사용합니다.
+    """
+    from google.cloud import bigquery
+
+    parameters: list[bigquery.ScalarQueryParameter | bigquery.ArrayQueryParameter] = []
+    for name, value in params.items():
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                raise ValueError(f"빈 배열 파라미터의 타입을 알 수 없습니다: {name}")
+            parameters.append(
+                bigquery.ArrayQueryParameter(name, _parameter_type(values[0]), values)
+            )
+        else:
+            parameters.append(
+                bigquery.ScalarQueryParameter(name, _parameter_type(value), value)
+            )
+    return parameters
+
+
+def cache_key(query: str, params: Mapping[str, Any] | None, kind: str) -> Hashable:
+    """정리한 쿼리, 파라미터, 결과 형태(rows, dataframe)로 캐시 키를 만듭니다."""
+    items = tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, (list, tuple, set)) else value)
+            for name, value in (params or {}).items()
+        )
+    )
+    return kind, normalize_query(query), items
+
+
+class QueryCache:
+    """
+    쿼리 결과를 ttl 초 동안 보관하는 캐시입니다.
+    max_size 개를 넘으면 가장 오래전에 사용한 결과부터 버립니다.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """(찾았는지, 결과)를 반환합니다. 만료된 결과는 지웁니다."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return False, None
+            self._items.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -1,11 +1,18 @@
 import asyncio
+import threading
+import time
 from datetime import date, datetime
-from typing import TypedDict
+from typing import Any, TypedDict
 
-import pandas as pd
+import tenacity
+from pydantic import BaseModel
 
 from app.bigquery.client import BigqueryClient, TableNameEnum
+from app.bigquery.rollup import ROLLUP_ACTIVITIES, rollup_rows
+from app.config import settings
 from app.logging import logger
+from app.queues import OffsetQueue
+from app.spool import SegmentedSpoolQueue
 
 
 class CommentDataType(TypedDict):
@@ -39,78 +46,211 @@ class PostDataType(TypedDict):
 
 queue_lock = asyncio.Lock()
 
-comments_upload_queue: list[CommentDataType] = []
-emojis_upload_queue: list[EmojiDataType] = []
-posts_upload_queue: list[PostDataType] = []
+
+def _decode_event(data: dict[str, Any]) -> Any:
+    """스풀에 문자열로 기록된 날짜/시간을 되돌립니다."""
+    data["tddate"] = date.fromisoformat(data["tddate"])
+    data["createtime"] = datetime.fromisoformat(data["createtime"])
+    return data
+
+
+comments_upload_queue: SegmentedSpoolQueue[CommentDataType] = SegmentedSpoolQueue(
+    "bigquery_comments", decode=_decode_event
+)
+emojis_upload_queue: SegmentedSpoolQueue[EmojiDataType] = SegmentedSpoolQueue(
+    "bigquery_emojis", decode=_decode_event
+)
+posts_upload_queue: SegmentedSpoolQueue[PostDataType] = SegmentedSpoolQueue(
+    "bigquery_posts", decode=_decode_event
+)
+
+
+def queue_gauges() -> dict[TableNameEnum, dict[str, float]]:
+    """
+    테이블별 업로드 대기 지표를 반환합니다.
+    - depth: 업로드를 기다리는 행 수
+    - bytes: 업로드를 기다리는 행이 스풀에서 차지하는 바이트
+    - lag: 업로드를 기다리는 가장 오래된 행이 쌓인 뒤 지난 시간(초)
+    """
+    return {
+        table_name: {
+            "depth": len(queue),
+            "bytes": queue.pending_bytes,
+            "lag": queue.oldest_age,
+        }
+        for table_name, _, queue in _upload_targets()
+    }
+
+
+def _upload_targets() -> list[tuple[TableNameEnum, str, SegmentedSpoolQueue[Any]]]:
+    return [
+        (TableNameEnum.COMMENTS_LOG, "댓글", comments_upload_queue),
+        (TableNameEnum.EMOJIS_LOG, "이모지", emojis_upload_queue),
+        (TableNameEnum.POSTS_LOG, "게시글", posts_upload_queue),
+    ]
+
+
+def _is_due(table_name: TableNameEnum, queue: SegmentedSpoolQueue[Any]) -> bool:
+    """
+    행 수, 바이트, 가장 오래된 행의 나이 중 하나라도 기준에 닿으면 업로드합니다.
+    실패한 테이블은 BIGQUERY_FLUSH_AGE_SECONDS 동안 쉬었다가 다시 시도합니다.
+    """
+    if not len(queue):
+        return False
+    failed_at = flush_metrics[table_name].last_failed_at
+    if time.time() - failed_at < settings.BIGQUERY_FLUSH_AGE_SECONDS:
+        return False
+    return (
+        len(queue) >= settings.BIGQUERY_FLUSH_ROWS
+        or queue.pending_bytes >= settings.BIGQUERY_FLUSH_BYTES
+        or queue.oldest_age >= settings.BIGQUERY_FLUSH_AGE_SECONDS
+    )
+
+
+def replay_queues() -> None:
+    """서버 시작 시 스풀에 남아있는 빅쿼리 로그를 복구합니다."""
+    for queue in (comments_upload_queue, emojis_upload_queue, posts_upload_queue):
+        count = queue.replay()
+        if count:
+            logger.info(f"{queue.name} 큐 {count}개 항목을 스풀에서 복구했습니다.")
+
+
+class FlushMetrics(BaseModel):
+    """테이블별 빅쿼리 업로드 지표입니다."""
+
+    flushes: int = 0  # 성공한 업로드 횟수
+    failures: int = 0  # 재시도 후에도 실패한 업로드 횟수
+    rows: int = 0  # 누적 적재 행 수
+    bytes: int = 0  # 누적 적재 바이트 (Parquet 기준)
+    last_latency: float = 0.0  # 마지막 업로드 소요 시간(초), 재시도 대기 포함
+    last_error: str = ""
+    last_failed_at: float = 0.0  # 마지막으로 실패한 시각(epoch 초)
+
+
+flush_metrics: dict[TableNameEnum, FlushMetrics] = {
+    table_name: FlushMetrics() for table_name in TableNameEnum
+}
+
+# 테이블별로 원본 로그를 적재한 끝 offset. 집계만 실패해 다시 올릴 때 원본을 중복 적재하지 않습니다.
+ingested_offsets: dict[TableNameEnum, int] = {}
+
+# daily_activity 의 같은 파티션에 MERGE 가 동시에 실행되면 빅쿼리가 거부하므로 하나씩 병합합니다.
+rollup_lock = threading.Lock()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """할당량 초과, 서버 오류, 네트워크 오류는 다시 시도합니다."""
+    from google.api_core import exceptions
+
+    return isinstance(
+        exc,
+        (
+            exceptions.TooManyRequests,
+            exceptions.ServerError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
 
 
 class BigqueryQueue:
     def __init__(self, client: BigqueryClient) -> None:
         self._client = client
 
-    async def upload(self) -> None:
-        global comments_upload_queue, emojis_upload_queue, posts_upload_queue
-
+    async def upload(self, only_due: bool = False) -> None:
+        """
+        댓글, 이모지, 게시글 로그를 테이블별로 동시에 업로드합니다.
+        한 테이블이 실패해도 나머지 테이블은 업로드하고,
+        실패한 테이블의 로그는 다음 업로드에 다시 시도합니다.
+        only_due 이면 BIGQUERY_FLUSH_ROWS/BYTES/AGE_SECONDS 기준에 닿은 테이블만 업로드합니다.
+        """
+        targets = [
+            target
+            for target in _upload_targets()
+            if not only_due or _is_due(target[0], target[2])
+        ]
         async with queue_lock:
-            # 댓글 로그 업로드
-            temp_comments_queue = list(comments_upload_queue)
-            if temp_comments_queue:
-                try:
-                    logger.info(f"BigQuery 댓글 로그 업로드 시작: {len(temp_comments_queue)}개")
-                    await asyncio.to_thread(
-                        self._client.update_table,
-                        pd.DataFrame(temp_comments_queue),
-                        TableNameEnum.COMMENTS_LOG,
-                        "append",
-                    )
-                    comments_upload_queue = [
-                        entry
-                        for entry in comments_upload_queue
-                        if entry not in temp_comments_queue
-                    ]
-                    logger.info(f"BigQuery 댓글 로그 업로드 완료: {len(temp_comments_queue)}개")
-                except Exception as e:
-                    logger.error(f"BigQuery 댓글 로그 업로드 실패: {str(e)}")
-                    raise
-
-            # 이모지 로그 업로드
-            temp_emojis_queue = list(emojis_upload_queue)
-            if temp_emojis_queue:
-                try:
-                    logger.info(f"BigQuery 이모지 로그 업로드 시작: {len(temp_emojis_queue)}개")
-                    await asyncio.to_thread(
-                        self._client.update_table,
-                        pd.DataFrame(temp_emojis_queue),
-                        TableNameEnum.EMOJIS_LOG,
-                        "append",
-                    )
-                    emojis_upload_queue = [
-                        entry
-                        for entry in emojis_upload_queue
-                        if entry not in temp_emojis_queue
-                    ]
-                    logger.info(f"BigQuery 이모지 로그 업로드 완료: {len(temp_emojis_queue)}개")
-                except Exception as e:
-                    logger.error(f"BigQuery 이모지 로그 업로드 실패: {str(e)}")
-                    raise
-
-            # 게시글 로그 업로드
-            temp_posts_queue = list(posts_upload_queue)
-            if temp_posts_queue:
-                try:
-                    logger.info(f"BigQuery 게시글 로그 업로드 시작: {len(temp_posts_queue)}개")
-                    await asyncio.to_thread(
-                        self._client.update_table,
-                        pd.DataFrame(temp_posts_queue),
-                        TableNameEnum.POSTS_LOG,
-                        "append",
+            results = await asyncio.gather(
+                *(self._flush(*target) for target in targets),
+                return_exceptions=True,
+            )
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            raise ExceptionGroup("BigQuery 로그 업로드 실패", errors)
+
+    async def _flush(
+        self, table_name: TableNameEnum, label: str, queue: OffsetQueue[Any]
+    ) -> None:
+        offset, rows = queue.snapshot()
+        if not rows:
+            return
+
+        metrics = flush_metrics[table_name]
+        logger.info(f"BigQuery {label} 로그 업로드 시작: {len(rows)}개")
+        started_at = time.monotonic()
+        try:
+            async for attempt in tenacity.AsyncRetrying(
+                retry=tenacity.retry_if_exception(_is_retryable),
+                wait=tenacity.wait_random_exponential(multiplier=1, max=30),
+                stop=tenacity.stop_after_attempt(settings.BIGQUERY_FLUSH_MAX_ATTEMPTS),
+                reraise=True,
+            ):
+                with attempt:
+                    count, size = await asyncio.to_thread(
+                        self._ingest, table_name, offset - len(rows), rows
                     )
-                    posts_upload_queue = [
-                        entry
-                        for entry in posts_upload_queue
-                        if entry not in temp_posts_queue
-                    ]
-                    logger.info(f"BigQuery 게시글 로그 업로드 완료: {len(temp_posts_queue)}개")
-                except Exception as e:
-                    logger.error(f"BigQuery 게시글 로그 업로드 실패: {str(e)}")
-                    raise
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_latency = time.monotonic() - started_at
+            metrics.last_error = str(e)
+            metrics.last_failed_at = time.time()
+            logger.error(f"BigQuery {label} 로그 업로드 실패: {str(e)}")
+            raise
+
+        queue.commit(offset)
+        ingested_offsets.pop(table_name, None)
+        metrics.flushes += 1
+        metrics.rows += count
+        metrics.bytes += size
+        metrics.last_latency = time.monotonic() - started_at
+        metrics.last_error = ""
+        logger.info(
+            f"BigQuery {label} 로그 업로드 완료: {count}개, {size} bytes, "
+            f"{metrics.last_latency:.2f}초 (누적 실패 {metrics.failures}회)"
+        )
+
+    def _ingest(
+        self, table_name: TableNameEnum, head: int, rows: list[Any]
+    ) -> tuple[int, int]:
+        """
+        BIGQUERY_ROLLUP_MODE 에 따라 원본 로그와 일별 집계를 적재하고, (행 수, 바이트)를 반환합니다.
+        - 원본 로그는 ingested_offsets 이후의 행만 적재하므로,
+          집계만 다시 시도해도 중복되지 않습니다.
+        - 집계는 커밋된 offset(head) 부터 다시 세므로, 재시도하면 같은 batch_id 의 개수를 바꿉니다.
+        """
+        mode = settings.BIGQUERY_ROLLUP_MODE
+        rollup = table_name in ROLLUP_ACTIVITIES and mode != "off"
+
+        end = head + len(rows)
+        size = 0
+        if not rollup or mode == "both":
+            done = ingested_offsets.get(table_name, head)
+            if not head <= done <= end:
+                done = head
+            if done < end:
+                _, size = self._client.ingest_rows(rows[done - head :], table_name)
+                ingested_offsets[table_name] = end
+        if rollup:
+            activities = rollup_rows(rows, table_name, batch_id=f"{table_name}:{head}")
+            with rollup_lock:
+                _, rollup_size = self._client.merge_rows(
+                    activities, TableNameEnum.DAILY_ACTIVITY
+                )
+            size += rollup_size
+            logger.info(
+                f"BigQuery {table_name} 일별 집계: {len(rows)}개 -> {len(activities)}개"
+            )
+        return len(rows), size
@@ -0,0 +1,51 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date
+from typing import Any, TypedDict
+
+from app.bigquery.client import TableNameEnum
+
+
+class DailyActivityDataType(TypedDict):
+    batch_id: str  # 집계한 스풀 구간 ({원본 테이블}:{시작 offset})
+    tddate: date
+    channel_id: str
+    user_id: str
+    activity: str  # comment, emoji
+    reaction: str  # 댓글은 빈 문자열
+    count: int
+
+
+# 원본 로그 테이블 -> 집계 테이블의 activity 값
+ROLLUP_ACTIVITIES: dict[TableNameEnum, str] = {
+    TableNameEnum.COMMENTS_LOG: "comment",
+    TableNameEnum.EMOJIS_LOG: "emoji",
+}
+
+
+def rollup_rows(
+    rows: Iterable[dict[str, Any]],
+    table_name: TableNameEnum,
+    batch_id: str,
+) -> list[DailyActivityDataType]:
+    """
+    댓글/이모지 로그를 (tddate, channel_id, user_id, reaction) 별 개수로 집계합니다.
+    같은 날짜의 집계 행은 업로드할 때마다 batch_id 별로 쌓이므로, 조회할 때 SUM(count) 로 합칩니다.
+    """
+    activity = ROLLUP_ACTIVITIES[table_name]
+    counter = Counter(
+        (row["tddate"], row["channel_id"], row["user_id"], row.get("reaction", ""))
+        for row in rows
+    )
+    return [
+        DailyActivityDataType(
+            batch_id=batch_id,
+            tddate=tddate,
+            channel_id=channel_id,
+            user_id=user_id,
+            activity=activity,
+            reaction=reaction,
+            count=count,
+        )
+        for (tddate, channel_id, user_id, reaction), count in counter.items()
+    ]
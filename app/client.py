@@ -1,16 +1,117 @@
-from typing import Any
+import re
+import threading
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import tenacity
 from app.logging import logger
 from app.config import settings
 
-from gspread import authorize, Spreadsheet, Worksheet
-from oauth2client.service_account import ServiceAccountCredentials
 from app.models import StoreModel
+from app.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    from gspread import Spreadsheet, Worksheet
+
+R = TypeVar("R")
+F = TypeVar("F", bound=Callable[..., Any])
+
+_spreadsheet: "Spreadsheet | None" = None
+_spreadsheet_lock = threading.Lock()
+
+
+def open_spreadsheet() -> "Spreadsheet":
+    """
+    서비스 계정으로 인증하고 스프레드시트를 엽니다.
+    import 시점이 아닌 처음 호출할 때 한 번만 인증과 네트워크 요청을 합니다.
+    """
+    global _spreadsheet
+    with _spreadsheet_lock:
+        if _spreadsheet is None:
+            from gspread import authorize
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            credentials = ServiceAccountCredentials.from_json_keyfile_dict(
+                settings.JSON_KEYFILE_DICT, settings.SCOPE
+            )
+            _spreadsheet = authorize(credentials).open_by_url(
+                settings.SPREAD_SHEETS_URL
+            )
+        return _spreadsheet
+
+
+# 행 위치 인덱스를 유지할 시트와 키 컬럼 (0부터 시작하는 열 번호)
+ROW_KEY_COLUMNS: dict[str, tuple[int, ...]] = {
+    "users": (0,),  # user_id
+    "bookmark": (0, 2),  # user_id, content_ts
+    "subscriptions": (0,),  # id
+}
+
+
+# append_rows 한 번에 보낼 행 수
+APPEND_BATCH_SIZE = 1000
+
+# 잠시 후 다시 시도하면 성공할 수 있는 응답 코드 (할당량 초과, 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# 쓰기는 5xx 응답을 받아도 이미 반영되었을 수 있으므로 할당량 초과만 그대로 다시 보냅니다.
+RETRYABLE_WRITE_STATUS_CODES = {429}
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    from gspread.exceptions import APIError
+
+    return isinstance(exc, APIError) and exc.code in RETRYABLE_STATUS_CODES
+
+
+def _is_retryable_write(exc: BaseException) -> bool:
+    from gspread.exceptions import APIError
+
+    return isinstance(exc, APIError) and exc.code in RETRYABLE_WRITE_STATUS_CODES
+
 
+def _log_retry(retry_state: tenacity.RetryCallState) -> None:
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    sleep = retry_state.next_action.sleep if retry_state.next_action else 0
+    logger.warning(
+        f"시트 API 요청 실패, {sleep:.1f}초 후 다시 시도합니다. "
+        f"({retry_state.attempt_number}번째 시도) {exc}"
+    )
 
-credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-    settings.JSON_KEYFILE_DICT, settings.SCOPE
-)
-gc = authorize(credentials)
+
+def _retry(predicate: Callable[[BaseException], bool]) -> Callable[[F], F]:
+    """predicate 에 해당하는 오류면 지수 백오프(지터 포함) 후 다시 시도합니다."""
+    return tenacity.retry(
+        retry=tenacity.retry_if_exception(predicate),
+        wait=tenacity.wait_random_exponential(multiplier=1, max=60),
+        stop=tenacity.stop_after_attempt(settings.SHEET_MAX_ATTEMPTS),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+
+
+def _ends_with(values: list[list[str]], rows: list[list[Any]]) -> bool:
+    """시트 값의 마지막 행들이 rows 와 같은지 확인합니다. 시트는 끝의 빈 칸을 돌려주지 않습니다."""
+
+    def _normalize(row: list[Any]) -> list[str]:
+        cells = [str(cell) for cell in row]
+        while cells and cells[-1] == "":
+            cells.pop()
+        return cells
+
+    if not rows or len(values) < len(rows):
+        return False
+    tail = values[len(values) - len(rows) :]
+    return all(_normalize(a) == _normalize(b) for a, b in zip(tail, rows))
+
+
+def _appended_start_row(response: Any) -> int | None:
+    """append_rows 응답의 updatedRange(예: bookmark!A120:G121)에서 시작 행을 가져옵니다."""
+    try:
+        updated_range = response["updates"]["updatedRange"]
+    except (KeyError, TypeError):
+        return None
+    match = re.search(r"!\$?[A-Z]+\$?(\d+)", updated_range)
+    return int(match.group(1)) if match else None
 
 
 class SpreadSheetClient:
@@ -23,79 +124,127 @@ class SpreadSheetClient:
 
     def __init__(
         self,
-        doc: Spreadsheet = gc.open_by_url(settings.SPREAD_SHEETS_URL),
-        sheets: dict[str, Worksheet] | None = None,
+        doc: "Spreadsheet | None" = None,
+        sheets: "dict[str, Worksheet] | None" = None,
     ) -> None:
         if not hasattr(self, "_initialized"):
-            self._doc = doc
-            self._sheets = (
-                {
-                    "contents": self._doc.worksheet("contents"),
-                    "users": self._doc.worksheet("users"),
-                    "logs": self._doc.worksheet("logs"),
-                    "backup": self._doc.worksheet("backup"),
-                    "bookmark": self._doc.worksheet("bookmark"),
-                    "coffee_chat_proof": self._doc.worksheet("coffee_chat_proof"),
-                    "point_histories": self._doc.worksheet("point_histories"),
-                    "paper_plane": self._doc.worksheet("paper_plane"),
-                    "subscriptions": self._doc.worksheet("subscriptions"),
+            if not sheets:
+                doc = doc or open_spreadsheet()
+                sheets = {
+                    "contents": doc.worksheet("contents"),
+                    "users": doc.worksheet("users"),
+                    "logs": doc.worksheet("logs"),
+                    "backup": doc.worksheet("backup"),
+                    "bookmark": doc.worksheet("bookmark"),
+                    "coffee_chat_proof": doc.worksheet("coffee_chat_proof"),
+                    "point_histories": doc.worksheet("point_histories"),
+                    "paper_plane": doc.worksheet("paper_plane"),
+                    "subscriptions": doc.worksheet("subscriptions"),
                 }
-                if not sheets
-                else sheets
-            )
+            self._doc = doc
+            self._sheets = sheets
+            # 시트별 키 -> 행 번호 인덱스
+            self._row_index: dict[str, dict[tuple[str, ...], int]] = {}
+            self._row_index_lock = threading.RLock()
+            # Sheets 분당 할당량에 맞춘 읽기/쓰기 요청 제한기
+            self._read_bucket = TokenBucket(settings.SHEET_READ_REQUESTS_PER_MINUTE)
+            self._write_bucket = TokenBucket(settings.SHEET_WRITE_REQUESTS_PER_MINUTE)
             self._initialized = True
 
+    def _read(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """읽기 할당량 안에서 시트 읽기 요청을 보냅니다."""
+        return self._call(self._read_bucket, func, *args, **kwargs)
+
+    def _write(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """쓰기 할당량 안에서 시트 쓰기 요청을 보냅니다. 429 응답만 다시 시도합니다."""
+        return self._call_write(self._write_bucket, func, *args, **kwargs)
+
+    @_retry(_is_retryable)
+    def _call(
+        self, bucket: TokenBucket, func: Callable[..., R], *args: Any, **kwargs: Any
+    ) -> R:
+        """토큰을 얻은 뒤 요청하고, 429/5xx 응답이면 지수 백오프(지터 포함) 후 다시 시도합니다."""
+        bucket.acquire()
+        return func(*args, **kwargs)
+
+    @_retry(_is_retryable_write)
+    def _call_write(
+        self, bucket: TokenBucket, func: Callable[..., R], *args: Any, **kwargs: Any
+    ) -> R:
+        """토큰을 얻은 뒤 요청하고, 429 응답이면 지수 백오프(지터 포함) 후 다시 시도합니다."""
+        bucket.acquire()
+        return func(*args, **kwargs)
+
     def get_values(self, sheet_name: str, column: str = "") -> list[list[str]]:
         """스프레드 시트로 부터 값을 가져옵니다."""
         if column:
-            return self._sheets[sheet_name].get_values(column)
-        else:
-            return self._sheets[sheet_name].get_all_values()
+            return self._read(self._sheets[sheet_name].get_values, column)
+
+        values = self._read(self._sheets[sheet_name].get_all_values)
+        # 전체를 받아올 때 행 위치 인덱스도 함께 만들어 업데이트 시 재사용합니다.
+        self._build_row_index(sheet_name, values)
+        return values
+
+    def get_values_from(self, sheet_name: str, start_row: int) -> list[list[str]]:
+        """start_row 행부터 마지막 행까지의 값을 가져옵니다."""
+        sheet = self._sheets[sheet_name]
+        from gspread.utils import rowcol_to_a1
+
+        last_column = rowcol_to_a1(1, sheet.col_count).rstrip("0123456789")
+        return self._read(sheet.get_values, f"A{start_row}:{last_column}")
 
     def backup(self, values: list[list[str]]) -> None:
         """백업 시트에 데이터를 업로드 합니다."""
         # TODO: 추후 백업 시트를 자동 생성할 수 있도록 변경 필요
         sheet = self._sheets["backup"]
-        sheet.clear()
-        self._batch_append_rows(values, sheet, batch_size=1000)
+        self._write(sheet.clear)
+        for _ in self._batch_append_rows(values, sheet, batch_size=APPEND_BATCH_SIZE):
+            pass
 
     def clear(self, sheet_name: str) -> None:
         """해당 시트의 모든 데이터를 삭제합니다."""
-        self._sheets[sheet_name].clear()
+        self._write(self._sheets[sheet_name].clear)
 
     def upload(self, sheet_name: str, values: list[list[str]]) -> None:
         """해당 시트에 데이터를 하나씩 업로드 합니다."""
         sheet = self._sheets[sheet_name]
         for value in values:
-            sheet.append_row(value)
+            self._write(sheet.append_row, value)
 
-    def bulk_upload(self, sheet_name: str, values: list[list[str]]) -> None:
-        """해당 시트에 데이터를 업로드 합니다."""
+    def bulk_upload(
+        self,
+        sheet_name: str,
+        values: list[list[str]],
+        on_progress: Callable[[int], None] | None = None,
+    ) -> None:
+        """
+        해당 시트에 데이터를 업로드 합니다.
+        배치를 올릴 때마다 지금까지 올린 행 수로 on_progress 를 호출합니다.
+        중간에 실패하더라도 호출한 쪽은 마지막으로 성공한 배치 이후부터 다시 올릴 수 있습니다.
+        """
         sheet = self._sheets[sheet_name]
-        self._batch_append_rows(values, sheet, batch_size=1000)
+        track_index = sheet_name in ROW_KEY_COLUMNS
+        uploaded = 0
+        for batch, response in self._batch_append_rows(
+            values, sheet, batch_size=APPEND_BATCH_SIZE
+        ):
+            uploaded += len(batch)
+            if track_index:
+                start_row = _appended_start_row(response)
+                if start_row is None:
+                    # 추가된 위치를 알 수 없으면 다음 조회 때 인덱스를 다시 만듭니다.
+                    self._row_index.pop(sheet_name, None)
+                    track_index = False
+                else:
+                    self._index_rows(sheet_name, batch, start_row)
+            if on_progress:
+                on_progress(uploaded)
 
     def update_bookmark(self, sheet_name: str, obj: StoreModel) -> None:
         """해당 객체 정보를 시트에 업데이트 합니다."""
-        sheet = self._sheets[sheet_name]
-        records = sheet.get_all_records()
-
-        target_record = dict()
-        row_number = 2  # 1은 인덱스가 0부터 시작하기 때문이며 나머지 1은 시드 헤더 행이 있기 때문.
-        for idx, record in enumerate(records):
-            # TODO: 추후 조건 바꾸기
-            if obj.user_id == record["user_id"] and obj.content_ts == str(  # type: ignore
-                record["content_ts"]
-            ):
-                target_record = record
-                row_number += idx
-                break
-
-        values = obj.to_list_for_sheet()
-
-        if not target_record:
-            logger.error(f"시트에 해당 값이 존재하지 않습니다. {values}")
-
-        sheet.update(f"A{row_number}:G{row_number}", [values])
+        # TODO: 추후 조건 바꾸기
+        key = (obj.user_id, obj.content_ts)  # type: ignore
+        self._update_row(sheet_name, key, obj.to_list_for_sheet(), "G")
 
     def update_subscription(
         self,
@@ -103,49 +252,187 @@ class SpreadSheetClient:
         subscription_dict: dict[str, Any],
     ) -> None:
         """해당 객체 정보를 시트에 업데이트 합니다."""
-        sheet = self._sheets[sheet_name]
-        records = sheet.get_all_records()
+        key = (subscription_dict["id"],)
+        self._update_row(sheet_name, key, list(subscription_dict.values()), "G")
 
-        target_record = dict()
-        row_number = 2  # 1은 인덱스가 0부터 시작하기 때문이며 나머지 1은 시드 헤더 행이 있기 때문.
-        for idx, record in enumerate(records):
-            if subscription_dict["id"] == record["id"]:
-                target_record = record
-                row_number += idx
-                break
+    def update_user(self, sheet_name: str, values: list[str]) -> None:
+        """유저 정보를 시트에 업데이트 합니다."""
+        # TODO: 추후 업데이트 함수 통합하기
+        self._update_row(sheet_name, (values[0],), values, "F")
 
-        values = list(subscription_dict.values())
+    def batch_update_bookmarks(self, sheet_name: str, objs: list[StoreModel]) -> int:
+        """북마크 정보를 한 번의 요청으로 시트에 업데이트 합니다."""
+        updates = [
+            ((obj.user_id, obj.content_ts), obj.to_list_for_sheet())  # type: ignore
+            for obj in objs
+        ]
+        return self.batch_update_rows(sheet_name, updates, "G")
 
-        if not target_record:
-            logger.error(f"시트에 해당 값이 존재하지 않습니다. {values}")
+    def batch_update_subscriptions(
+        self,
+        sheet_name: str,
+        subscription_dicts: list[dict[str, Any]],
+    ) -> int:
+        """구독 정보를 한 번의 요청으로 시트에 업데이트 합니다."""
+        updates = [
+            ((subscription_dict["id"],), list(subscription_dict.values()))
+            for subscription_dict in subscription_dicts
+        ]
+        return self.batch_update_rows(sheet_name, updates, "G")
 
-        sheet.update(f"A{row_number}:G{row_number}", [values])
+    def batch_update_users(self, sheet_name: str, values_list: list[list[str]]) -> int:
+        """유저 정보를 한 번의 요청으로 시트에 업데이트 합니다."""
+        updates = [((values[0],), values) for values in values_list]
+        return self.batch_update_rows(sheet_name, updates, "F")
 
-    def update_user(self, sheet_name: str, values: list[str]) -> None:
-        """유저 정보를 시트에 업데이트 합니다."""
-        # TODO: 추후 업데이트 함수 통합하기
+    def batch_update_rows(
+        self,
+        sheet_name: str,
+        updates: list[tuple[tuple[str, ...], list[str]]],
+        last_column: str,
+    ) -> int:
+        """
+        여러 행의 업데이트를 하나의 batch_update 요청으로 보냅니다.
+        같은 키의 업데이트가 여러 번 있으면 마지막 값만 씁니다.
+        행마다 update 했을 때(행 확인 1회 + 쓰기 1회)보다 줄어든 API 호출 수를 반환합니다.
+        """
+        pending: dict[tuple[str, ...], list[str]] = {}
+        for key, values in updates:
+            # 마지막 업데이트의 순서대로 쓰도록 기존 값을 지우고 다시 넣습니다.
+            pending.pop(key, None)
+            pending[key] = values
+        if not pending:
+            return 0
+
+        rows, calls = self.find_rows(sheet_name, list(pending))
+        data = []
+        for key, values in pending.items():
+            row_number = rows.get(key)
+            if row_number is None:
+                logger.error(f"시트에 해당 값이 존재하지 않습니다. {values}")
+                continue
+            data.append(
+                {
+                    "range": f"A{row_number}:{last_column}{row_number}",
+                    "values": [values],
+                }
+            )
+
+        if data:
+            self._write(self._sheets[sheet_name].batch_update, data)
+            calls += 1
+        return len(updates) * 2 - calls
+
+    def find_rows(
+        self, sheet_name: str, keys: list[tuple[str, ...]]
+    ) -> tuple[dict[tuple[str, ...], int], int]:
+        """
+        여러 키의 행 번호를 찾아 (키 -> 행 번호, 사용한 API 호출 수)를 반환합니다.
+        모든 키가 인덱스에 있으면 batch_get 한 번으로 가리키는 행들을 확인하고,
+        인덱스에 없거나 하나라도 다르면 시트를 한 번 다시 읽어 인덱스를 만듭니다.
+        """
         sheet = self._sheets[sheet_name]
-        records = sheet.get_all_records()
+        index = self._row_index.get(sheet_name, {})
+        rows = {key: index[key] for key in keys if key in index}
+        calls = 0
+        if rows and len(rows) == len(keys):
+            ranges = [f"A{row_number}:{row_number}" for row_number in rows.values()]
+            fetched = self._read(sheet.batch_get, ranges)
+            calls += 1
+            if all(
+                self._row_key(sheet_name, value_range[0] if value_range else []) == key
+                for key, value_range in zip(rows, fetched)
+            ):
+                return rows, calls
+            logger.info(f"{sheet_name} 시트의 행 위치가 바뀌어 인덱스를 다시 만듭니다.")
+
+        self._build_row_index(sheet_name, self._read(sheet.get_all_values))
+        calls += 1
+        index = self._row_index[sheet_name]
+        return {key: index[key] for key in keys if key in index}, calls
 
-        target_record = dict()
-        row_number = 2  # 1은 인덱스가 0부터 시작하기 때문이며 나머지 1은 시드 헤더 행이 있기 때문.
-        for idx, record in enumerate(records):
-            if values[0] == record["user_id"]:
-                target_record = record
-                row_number += idx
-                break
+    def find_row(self, sheet_name: str, key: tuple[str, ...]) -> int | None:
+        """
+        키에 해당하는 시트의 행 번호를 찾습니다.
+        인덱스가 가리키는 행만 다시 읽어 확인하고, 다르면 시트를 다시 읽어 인덱스를 만듭니다.
+        """
+        sheet = self._sheets[sheet_name]
+        row_number = self._row_index.get(sheet_name, {}).get(key)
+        if row_number is not None:
+            row = self._read(sheet.row_values, row_number)
+            if self._row_key(sheet_name, row) == key:
+                return row_number
+            logger.info(f"{sheet_name} 시트의 행 위치가 바뀌어 인덱스를 다시 만듭니다.")
 
-        if not target_record:
+        self._build_row_index(sheet_name, self._read(sheet.get_all_values))
+        return self._row_index[sheet_name].get(key)
+
+    def _update_row(
+        self, sheet_name: str, key: tuple[str, ...], values: list[str], last_column: str
+    ) -> None:
+        row_number = self.find_row(sheet_name, key)
+        if row_number is None:
             logger.error(f"시트에 해당 값이 존재하지 않습니다. {values}")
+            return
 
-        sheet.update(f"A{row_number}:F{row_number}", [values])
+        sheet = self._sheets[sheet_name]
+        self._write(sheet.update, f"A{row_number}:{last_column}{row_number}", [values])
+
+    def _row_key(self, sheet_name: str, row: list[Any]) -> tuple[str, ...]:
+        return tuple(
+            str(row[i]) if i < len(row) else "" for i in ROW_KEY_COLUMNS[sheet_name]
+        )
+
+    def _build_row_index(self, sheet_name: str, values: list[list[str]]) -> None:
+        """헤더를 포함한 시트 값으로 행 위치 인덱스를 새로 만듭니다."""
+        if sheet_name not in ROW_KEY_COLUMNS:
+            return
+        with self._row_index_lock:
+            self._row_index[sheet_name] = {}
+            self._index_rows(sheet_name, values[1:], start_row=2)
+
+    def _index_rows(
+        self, sheet_name: str, values: list[list[str]], start_row: int
+    ) -> None:
+        with self._row_index_lock:
+            index = self._row_index.setdefault(sheet_name, {})
+            for offset, row in enumerate(values):
+                # 같은 키가 여러 행에 있으면 기존처럼 위쪽 행을 사용합니다.
+                index.setdefault(self._row_key(sheet_name, row), start_row + offset)
 
     def _batch_append_rows(
         self,
         values: list[list[str]],
-        sheet: Worksheet,
+        sheet: "Worksheet",
         batch_size: int,
-    ) -> None:
+    ) -> Iterator[tuple[list[list[str]], Any]]:
+        """batch_size 만큼 나눠 행을 추가하고, 배치마다 (추가한 행, API 응답)을 내보냅니다."""
         for i in range(0, len(values), batch_size):
             batch = values[i : i + batch_size]
-            sheet.append_rows(batch)
+            yield batch, self._append_rows(sheet, batch)
+
+    def _append_rows(self, sheet: "Worksheet", batch: list[list[str]]) -> Any:
+        """
+        행을 추가하고 API 응답을 반환합니다.
+        5xx 응답은 이미 추가됐을 수 있으므로 그대로 다시 보내지 않고 _resend_rows 로 확인합니다.
+        """
+        from gspread.exceptions import APIError
+
+        try:
+            return self._write(sheet.append_rows, batch)
+        except APIError as exc:
+            if not _is_retryable(exc):
+                raise
+            logger.warning(
+                f"{sheet.title} 시트 행 추가 중 {exc.code} 응답, 추가 여부를 확인합니다."
+            )
+        return self._resend_rows(sheet, batch)
+
+    @_retry(_is_retryable)
+    def _resend_rows(self, sheet: "Worksheet", batch: list[list[str]]) -> Any:
+        """시트 마지막 행들이 batch 와 같으면 추가된 것으로 보고, 아니면 다시 추가합니다."""
+        values = self._read(sheet.get_all_values)
+        if _ends_with(values, batch):
+            start_row = len(values) - len(batch) + 1
+            return {"updates": {"updatedRange": f"{sheet.title}!A{start_row}"}}
+        return self._write(sheet.append_rows, batch)
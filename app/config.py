@@ -33,6 +33,40 @@ class Settings(BaseSettings):
 
     POINT_MAP: dict[str, Any]
 
+    STORE_BACKEND: str = "csv"  # "csv" 또는 "sqlite"
+    SQLITE_PATH: str = "store/store.db"
+
+    SHEET_PULL_CONCURRENCY: int = 3  # 시트 동시 다운로드 수 (Sheets 읽기 할당량 고려)
+    SHEET_READ_REQUESTS_PER_MINUTE: int = 60  # Sheets 분당 읽기 요청 할당량
+    SHEET_WRITE_REQUESTS_PER_MINUTE: int = 60  # Sheets 분당 쓰기 요청 할당량
+    SHEET_MAX_ATTEMPTS: int = 5  # 429/5xx 응답 시 최대 시도 횟수
+
+    # merge: 스테이징 테이블을 거쳐 중복 없이 추가, append: 그대로 추가
+    BIGQUERY_INGEST_MODE: str = "merge"
+    # 댓글/이모지 일별 집계(daily_activity) 업로드
+    # off: 원본 로그만, both: 원본 로그와 집계, only: 집계만
+    BIGQUERY_ROLLUP_MODE: str = "off"
+    BIGQUERY_QUERY_CACHE_SECONDS: float = 300.0  # 조회 결과 캐시 시간(초)
+    BIGQUERY_QUERY_CACHE_SIZE: int = 128  # 캐시할 최대 조회 결과 수
+    BIGQUERY_FLUSH_MAX_ATTEMPTS: int = 3  # 테이블별 빅쿼리 업로드 최대 시도 횟수
+    # 테이블별로 행 수, 바이트, 가장 오래된 행의 나이(초) 중 하나라도 기준에 닿으면 업로드합니다.
+    BIGQUERY_FLUSH_ROWS: int = 1000
+    BIGQUERY_FLUSH_BYTES: int = 1024 * 1024
+    BIGQUERY_FLUSH_AGE_SECONDS: float = 120.0
+    BIGQUERY_FLUSH_CHECK_SECONDS: int = 10  # 업로드 기준을 확인하는 주기(초)
+
+    SPOOL_DIR: str = "store/spool"
+    SPOOL_FSYNC_BATCH: int = 16  # 이 개수만큼 쌓이면 fsync 합니다.
+    SPOOL_FSYNC_INTERVAL: float = (
+        1.0  # 마지막 fsync 후 이 시간(초)이 지나면 fsync 합니다.
+    )
+    # 세그먼트가 이 크기(바이트)를 넘거나, 연 뒤 이 시간(초)이 지나면 새 세그먼트를 엽니다.
+    SPOOL_SEGMENT_BYTES: int = 4 * 1024 * 1024
+    SPOOL_SEGMENT_SECONDS: float = 600.0
+    SPOOL_MEMORY_CAP: int = 50_000  # 세그먼트 스풀 큐가 메모리에 들고 있는 최대 항목 수
+    # 스풀에 커밋된 줄이 이 개수만큼 쌓이면 커밋되지 않은 줄만 남기고 다시 씁니다.
+    SPOOL_COMPACT_LINES: int = 10_000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -4,6 +4,7 @@ from enum import Enum
 
 URL_REGEX = r"((http|https):\/\/)?[a-zA-Z0-9.-]+(\.[a-zA-Z]{2,})"
 MAX_PASS_COUNT = 2
+RECENT_POINT_HISTORY_COUNT = 20  # 홈 탭/포인트 내역에 표시하는 최근 포인트 내역 수
 DUE_DATES = [  # 글또 시작일 을 포함한 오름차순 마감일 리스트
     datetime.date(2024, 9, 29),  # 0회차 - 글또 10기 시작
     datetime.date(2024, 10, 13),  # 1회차
@@ -1,19 +1,221 @@
 from __future__ import annotations
 
+import bisect
+import heapq
 from abc import abstractmethod
 
-import csv
 from enum import Enum
 from zoneinfo import ZoneInfo
-from pydantic import BaseModel, Field, field_validator
+from collections.abc import Callable
+from typing import Any
+from pydantic import BaseModel, Field, PrivateAttr
 import datetime
 from app.config import settings
-from app.constants import DUE_DATES, MAX_PASS_COUNT
+from app.constants import DUE_DATES, MAX_PASS_COUNT, RECENT_POINT_HISTORY_COUNT
 from app.exception import BotException
+from app.rounds import RoundCalendar
+from app.tables import TableSnapshot, TableView
 
 from app.utils import generate_unique_id, tz_now, tz_now_to_str
 
 
+def _writing_participants(snapshot: TableSnapshot) -> frozenset[str]:
+    return frozenset(
+        row["user_id"]
+        for row in snapshot.all()
+        if row["is_writing_participation"] == "True"
+    )
+
+
+_round_calendar: RoundCalendar | None = None
+
+
+def round_calendar() -> RoundCalendar:
+    """DUE_DATES 로 만든 회차 달력을 반환합니다. DUE_DATES 가 바뀌면 다시 만듭니다."""
+    global _round_calendar
+    if _round_calendar is None or _round_calendar.source is not DUE_DATES:
+        _round_calendar = RoundCalendar(DUE_DATES)
+    return _round_calendar
+
+
+# 글쓰기 참여 신청한 유저 아이디 집합
+writing_participants = TableView("writing_participation", _writing_participants)
+
+# 콘텐츠 타입 -> 회차 제출 상태
+SUBMIT_STATUS = {"submit": "제출", "pass": "패스"}
+
+
+class SubmissionState(BaseModel):
+    """
+    유저의 회차별 제출 상태입니다. 콘텐츠를 생성일시 오름차순으로 하나씩 반영합니다.
+    같은 회차에 콘텐츠가 여러 개라면 가장 마지막 콘텐츠로 판단합니다.
+    """
+
+    rounds: dict[int, tuple[str, str]] = {}  # 회차 -> (마지막 콘텐츠 생성일시, 타입)
+    pass_count: int = 0
+    recent_dt: str = ""  # 가장 최근 콘텐츠 생성일시
+    recent_type: str = ""  # 가장 최근 콘텐츠 타입
+    last_submit_dt: str = ""  # 가장 최근에 글을 제출한 일시
+
+    @classmethod
+    def from_contents(cls, contents: list[Content]) -> SubmissionState:
+        state = cls()
+        for content in contents:
+            state.add(content.dt, content.type, content.round)
+        return state
+
+    def add(self, dt: str, type: str, round: int | None) -> None:
+        """콘텐츠 하나를 반영합니다. dt 는 "%Y-%m-%d %H:%M:%S" 형식이라 문자열로 비교합니다."""
+        if type == "pass":
+            self.pass_count += 1
+        if type == "submit" and dt >= self.last_submit_dt:
+            self.last_submit_dt = dt
+        if dt >= self.recent_dt:
+            self.recent_dt, self.recent_type = dt, type
+        if round is not None and dt >= self.rounds.get(round, ("", ""))[0]:
+            self.rounds[round] = (dt, type)
+
+    @property
+    def submitted_rounds(self) -> list[int]:
+        return sorted(r for r, (_, type) in self.rounds.items() if type == "submit")
+
+    @property
+    def passed_rounds(self) -> list[int]:
+        return sorted(r for r, (_, type) in self.rounds.items() if type == "pass")
+
+    def submit_status(self, now_date: datetime.date) -> dict[int, str]:
+        """현재 회차는 제외한 회차별 제출 여부를 반환합니다. 0회차는 시작일이므로 제외합니다."""
+        calendar = round_calendar()
+        current_round = calendar.round_of(now_date)
+        last_round = len(calendar) if current_round is None else current_round
+        return {
+            round: SUBMIT_STATUS.get(self.rounds.get(round, ("", ""))[1], "미제출")
+            for round in range(1, last_round)
+        }
+
+    def continuous_submit_count(self, now_date: datetime.date) -> int:
+        """직전 회차부터 거슬러 올라가며 연속으로 제출한 횟수를 반환합니다."""
+        count = 0
+        for _, status in sorted(self.submit_status(now_date).items(), reverse=True):
+            if status == "제출":
+                count += 1
+            elif status == "패스":  # 패스는 연속 제출 횟수에 포함하지 않는다.
+                continue
+            else:  # 미제출은 연속 제출 횟수를 끊는다.
+                break
+        return count
+
+    def is_submit(self, now_date: datetime.date) -> bool:
+        """최근 콘텐츠가 직전 마감일 초과, 현재 날짜 이하에 제출한 글인지 여부를 반환합니다."""
+        if self.recent_type != "submit":
+            return False
+        round = round_calendar().round_of(now_date)
+        if round is None:  # 글또 활동 기간이 끝났다.
+            return False
+        latest_due_date = round_calendar().previous_due_date(round)
+        return latest_due_date < self.recent_date <= now_date
+
+    def is_prev_pass(self, now_date: datetime.date) -> bool:
+        """최근 콘텐츠가 전전회차 마감일 초과, 현재 날짜 이하에 사용한 pass 인지 반환합니다."""
+        if self.recent_type != "pass":
+            return False
+        calendar = round_calendar()
+        round = calendar.round_of(now_date)
+        if round is None:
+            second_latest_due_date = calendar.due_dates[-2]
+        else:
+            second_latest_due_date = calendar.previous_due_date(round, 2)
+        return second_latest_due_date < self.recent_date <= now_date
+
+    @property
+    def recent_date(self) -> datetime.date:
+        return datetime.date.fromisoformat(self.recent_dt[:10])
+
+
+def _content_round(dt: str) -> int | None:
+    return round_calendar().round_of(datetime.date.fromisoformat(dt[:10]))
+
+
+def _apply_submissions(
+    states: tuple[RoundCalendar, dict[str, SubmissionState]],
+    rows: list[dict[str, str]],
+) -> tuple[RoundCalendar, dict[str, SubmissionState]]:
+    for row in rows:
+        state = states[1].setdefault(row["user_id"], SubmissionState())
+        state.add(row["dt"], row["type"], _content_round(row["dt"]))
+    return states
+
+
+def _build_submissions(
+    snapshot: TableSnapshot,
+) -> tuple[RoundCalendar, dict[str, SubmissionState]]:
+    return _apply_submissions((round_calendar(), {}), snapshot.all())
+
+
+# 유저별 제출 상태. contents.csv 를 다시 받아오면 새로 만들고, 글을 제출하면 추가된 행만 반영합니다.
+_submission_states = TableView("contents", _build_submissions, _apply_submissions)
+
+
+def get_submission_state(user_id: str) -> SubmissionState:
+    """contents 테이블로 만든 유저의 제출 상태를 반환합니다."""
+    calendar, states = _submission_states.get()
+    if calendar is not round_calendar():
+        # 회차 달력이 바뀌면 콘텐츠의 회차도 바뀌므로 다시 만듭니다.
+        _submission_states.invalidate()
+        calendar, states = _submission_states.get()
+    return states.get(user_id) or SubmissionState()
+
+
+class RoundSubmissions:
+    """회차별로 처음 글을 제출한 유저를 제출 순서(ts)대로 담습니다."""
+
+    def __init__(self, calendar: RoundCalendar) -> None:
+        self.calendar = calendar
+        # 회차 -> [(ts, 유저 아이디)]
+        self._rounds: dict[int, list[tuple[str, str]]] = {}
+        self._submitted: set[tuple[int, str]] = set()  # (회차, 유저 아이디)
+
+    def add(self, row: dict[str, str]) -> None:
+        if row["type"] != "submit":
+            return
+        round = self.calendar.round_of(datetime.date.fromisoformat(row["dt"][:10]))
+        if round is None or (round, row["user_id"]) in self._submitted:
+            return
+        self._submitted.add((round, row["user_id"]))
+        bisect.insort(self._rounds.setdefault(round, []), (row["ts"], row["user_id"]))
+
+    def first_submitters(self, round: int) -> list[str]:
+        """회차에 처음 제출한 순서대로 유저 아이디를 반환합니다."""
+        return [user_id for _, user_id in self._rounds.get(round, [])]
+
+
+def _apply_round_submissions(
+    submissions: RoundSubmissions, rows: list[dict[str, str]]
+) -> RoundSubmissions:
+    for row in rows:
+        submissions.add(row)
+    return submissions
+
+
+def _build_round_submissions(snapshot: TableSnapshot) -> RoundSubmissions:
+    return _apply_round_submissions(RoundSubmissions(round_calendar()), snapshot.all())
+
+
+# 회차별 제출 순서. 제출 순위를 매길 때 채널 유저들의 콘텐츠를 모두 불러오지 않도록 합니다.
+_round_submissions = TableView(
+    "contents", _build_round_submissions, _apply_round_submissions
+)
+
+
+def get_round_submitters(round: int) -> list[str]:
+    """contents 테이블로 만든 회차의 제출 순서(유저 아이디)를 반환합니다."""
+    submissions = _round_submissions.get()
+    if submissions.calendar is not round_calendar():
+        _round_submissions.invalidate()
+        submissions = _round_submissions.get()
+    return submissions.first_submitters(round)
+
+
 class User(BaseModel):
     user_id: str  # 슬랙 아이디
     name: str  # 이름
@@ -22,16 +224,46 @@ class User(BaseModel):
     intro: str  # 자기소개
     deposit: str = ""  # 예치금
     cohort: str = ""  # 기수
-    contents: list[Content] = []  # 제출한 콘텐츠
+    # 제출한 콘텐츠. 대부분의 핸들러는 콘텐츠를 보지 않으므로 처음 접근할 때 불러옵니다.
+    _contents: list[Content] | None = PrivateAttr(default=None)
+    _contents_loader: Callable[[], list[Content]] | None = PrivateAttr(default=None)
+
+    def __init__(self, contents: list[Content] | None = None, **data: Any) -> None:
+        super().__init__(**data)
+        if contents is not None:
+            self.contents = contents
+
+    @property
+    def contents(self) -> list[Content]:
+        """콘텐츠를 생성일시 오름차순으로 정렬하여 반환합니다."""
+        if self._contents is None:
+            loader, self._contents_loader = self._contents_loader, None
+            self._contents = self._sorted_contents(loader() if loader else [])
+        return self._contents
+
+    @contents.setter
+    def contents(self, contents: list[Content]) -> None:
+        self._contents = self._sorted_contents(contents)
+        self._contents_loader = None
+
+    def set_contents_loader(self, loader: Callable[[], list[Content]]) -> None:
+        """콘텐츠를 처음 접근할 때 loader 로 불러오도록 합니다."""
+        self._contents = None
+        self._contents_loader = loader
+
+    @property
+    def is_contents_loaded(self) -> bool:
+        """콘텐츠를 이미 불러왔는지 여부를 반환합니다."""
+        return self._contents is not None
+
+    @staticmethod
+    def _sorted_contents(contents: list[Content]) -> list[Content]:
+        return sorted(contents, key=lambda content: content.dt_)
 
     @property
     def is_writing_participation(self) -> bool:
-        with open("store/writing_participation.csv", "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["user_id"] == self.user_id:
-                    return row["is_writing_participation"] == "True"
-        return False
+        """글쓰기 참여 여부를 반환합니다."""
+        return self.user_id in writing_participants.get()
 
     @property
     def writing_channel_id(self) -> str:
@@ -40,38 +272,26 @@ class User(BaseModel):
             return settings.WRITING_CHANNEL
         return self.channel_id
 
-    @field_validator("contents", mode="before")
-    def get_contents(cls, v: list[Content]) -> list[Content]:
-        """콘텐츠를 생성일시 오름차순으로 정렬하여 반환합니다."""
-        return sorted(v, key=lambda content: content.dt_)
+    @property
+    def submission_state(self) -> SubmissionState:
+        """
+        제출 상태를 반환합니다.
+        저장소에서 가져온 유저의 콘텐츠를 아직 불러오지 않았다면
+        contents 테이블로 만든 상태를 그대로 읽습니다.
+        """
+        if self._contents is None and self._contents_loader is not None:
+            return get_submission_state(self.user_id)
+        return SubmissionState.from_contents(self.contents)
 
     @property
     def pass_count(self) -> int:
         """pass 횟수를 반환합니다."""
-        return len([content for content in self.contents if content.type == "pass"])
+        return self.submission_state.pass_count
 
     @property
     def is_prev_pass(self) -> bool:
-        """직전에 pass 했는지 여부를 반환합니다."""
-        try:
-            recent_content = self.recent_content
-        except Exception:
-            return False
-
-        if recent_content.type != "pass":
-            return False
-
-        return self._is_prev_pass(recent_content)
-
-    def _is_prev_pass(self, recent_content: Content) -> bool:
-        """전전회차 마감일 초과, 현재 날짜 이하 사이에 pass 했는지 여부를 반환합니다."""
-        now_date = tz_now().date()
-        second_latest_due_date = DUE_DATES[-2]
-        for i, due_date in enumerate(DUE_DATES):
-            if now_date <= due_date:
-                second_latest_due_date = DUE_DATES[i - 2]
-                break
-        return second_latest_due_date < recent_content.date <= now_date
+        """직전에 pass 했는지(전전회차 마감일 초과, 현재 날짜 이하) 여부를 반환합니다."""
+        return self.submission_state.is_prev_pass(tz_now().date())
 
     @property
     def recent_content(self) -> Content:
@@ -91,74 +311,24 @@ class User(BaseModel):
 
     def get_due_date(self) -> tuple[int, datetime.date]:
         """현재 회차와 마감일을 반환합니다."""
-        now_date = tz_now().date()
-        for i, due_date in enumerate(DUE_DATES):
-            if now_date <= due_date:
-                round = i
-                return round, due_date
-        raise BotException("지금은 글또 글 제출 기간이 아니에요.")
+        calendar = round_calendar()
+        round = calendar.round_of(tz_now().date())
+        if round is None:
+            raise BotException("지금은 글또 글 제출 기간이 아니에요.")
+        return round, calendar.due_date(round)
 
     @property
     def is_submit(self) -> bool:
         """현재 회차의 제출여부를 반환합니다."""
-        try:
-            recent_content = self.recent_content
-        except Exception:
-            return False
-
-        if recent_content.type != "submit":
-            return False
-
-        now_date = tz_now().date()
-        for i, due_date in enumerate(DUE_DATES):
-            if now_date <= due_date:  # 현재 날짜가 보다 같거나 크면 현재 마감일이다.
-                # 현재 마감일의 직전 마감일을 구한다.
-                latest_due_date = DUE_DATES[i - 1]
-                break
-
-        # 최근 제출한 콘텐츠의 날짜가 직전 마감일 초과, 현재 날짜 이하 라면 제출했다고 판단한다.
-        return latest_due_date < recent_content.date <= now_date
+        return self.submission_state.is_submit(tz_now().date())
 
     def get_submit_status(self) -> dict[int, str]:
         """현재 회차는 제외한 회차별 제출 여부를 반환합니다."""
-        submit_status = {}
-        for i, due_date in enumerate(DUE_DATES):
-            # 0회차는 시작일이므로 제외한다.
-            if i == 0:
-                continue
-
-            # 현재 회차는 제출 여부를 판단하지 않는다.
-            if due_date >= tz_now().date():
-                break
-
-            # 기본값은 미제출
-            submit_status[i] = "미제출"
-
-            # 콘텐츠의 제출 날짜가 직전 마감일 초과, 마감일 이하 라면 제출했다고 판단한다.
-            for content in self.fetch_contents():
-                latest_due_date = DUE_DATES[i - 1]
-                if latest_due_date < content.date <= due_date:
-                    if content.type == "submit":
-                        submit_status[i] = "제출"
-                    elif content.type == "pass":
-                        submit_status[i] = "패스"
-                    else:
-                        submit_status[i] = "미제출"
-
-        return submit_status
+        return self.submission_state.submit_status(tz_now().date())
 
     def get_continuous_submit_count(self) -> int:
         """내림차순으로 연속으로 제출한 횟수를 반환합니다."""
-        count = 0
-        submit_status = self.get_submit_status()
-        for _, v in sorted(submit_status.items(), reverse=True):
-            if v == "제출":
-                count += 1
-            elif v == "패스":  # 패스는 연속 제출 횟수에 포함하지 않는다.
-                continue
-            else:  # 미제출은 연속 제출 횟수를 끊는다.
-                break
-        return count
+        return self.submission_state.continuous_submit_count(tz_now().date())
 
     @property
     def submission_guide_message(self) -> str:
@@ -234,6 +404,10 @@ class Content(StoreModel):
     curation_flag: str = "N"  # "Y", "N"
     ts: str = ""
     feedback_intensity: str = "HOT"  # "MILD", "HOT", "FIRE", "DIABLO"
+    # (회차 달력, dt, 회차) 달력이나 dt 가 바뀌면 다시 계산합니다.
+    _round_cache: tuple[RoundCalendar, str, int | None] | None = PrivateAttr(
+        default=None
+    )
 
     def __hash__(self) -> int:
         return hash(self.ts)
@@ -287,12 +461,22 @@ class Content(StoreModel):
             self.feedback_intensity,
         ]
 
+    @property
+    def round(self) -> int | None:
+        """컨텐츠의 회차를 반환합니다. 글또 활동 기간 이후라면 None 입니다."""
+        calendar = round_calendar()
+        cached = self._round_cache
+        if cached is None or cached[0] is not calendar or cached[1] != self.dt:
+            cached = (calendar, self.dt, calendar.round_of(self.date))
+            self._round_cache = cached
+        return cached[2]
+
     def get_round(self) -> int:
         """컨텐츠의 회차를 반환합니다."""
-        for i, due_date in enumerate(DUE_DATES):
-            if self.date <= due_date:
-                return i
-        raise BotException("글또 활동 기간이 아니에요.")
+        round = self.round
+        if round is None:
+            raise BotException("글또 활동 기간이 아니에요.")
+        return round
 
     @classmethod
     def fieldnames(self) -> list[str]:
@@ -444,6 +628,37 @@ class PointHistory(BaseModel):
         ]
 
 
+class PointBalance:
+    """
+    유저의 포인트 합계와 최근 포인트 내역입니다.
+    시트에서 받아온 행은 생성일시 순서가 아닐 수 있으므로
+    생성일시가 늦은 size 개 행을 힙으로 남깁니다.
+    """
+
+    def __init__(self, size: int = RECENT_POINT_HISTORY_COUNT) -> None:
+        self.total_point = 0
+        self._size = size
+        # (생성일시, 추가 순서, 행) 최소 힙. 가장 오래된 행이 맨 앞에 있습니다.
+        self._recent: list[tuple[str, int, dict[str, str]]] = []
+        self._count = 0
+
+    def add(self, row: dict[str, str]) -> None:
+        self.total_point += int(row["point"])
+        self._count += 1
+        entry = (row["created_at"], self._count, row)
+        if len(self._recent) < self._size:
+            heapq.heappush(self._recent, entry)
+        else:
+            heapq.heappushpop(self._recent, entry)
+
+    def recent_histories(self) -> list[PointHistory]:
+        """최근 포인트 내역을 생성일시 내림차순으로 반환합니다."""
+        return [
+            PointHistory(**row)  # type: ignore
+            for _, _, row in sorted(self._recent, reverse=True)
+        ]
+
+
 class PaperPlane(StoreModel):
     id: str = Field(default_factory=generate_unique_id)
     sender_id: str
@@ -0,0 +1,67 @@
+import threading
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class OffsetQueue(Generic[T]):
+    """
+    순번(offset)으로 소비하는 업로드 큐입니다.
+    - append 하면 단조 증가하는 offset 을 부여합니다.
+    - snapshot 으로 아직 커밋되지 않은 항목과 끝 offset 을 가져갑니다.
+    - 업로드가 끝나면 commit(offset) 으로 그 이전 항목을 한 번에 버립니다.
+    값 비교 없이 offset 만 옮기므로 같은 값이 여러 번 들어와도 각각 업로드됩니다.
+    """
+
+    def __init__(self) -> None:
+        self._items: list[T] = []
+        self._start = 0  # self._items[0] 의 offset
+        self._head = 0  # 커밋되지 않은 첫 항목의 offset
+        self._lock = threading.RLock()
+
+    @property
+    def head(self) -> int:
+        """커밋되지 않은 첫 항목의 offset 입니다."""
+        return self._head
+
+    @property
+    def tail(self) -> int:
+        """다음에 append 될 항목의 offset 입니다."""
+        return self._start + len(self._items)
+
+    def append(self, item: T) -> int:
+        """항목을 추가하고 부여한 offset 을 반환합니다."""
+        with self._lock:
+            self._items.append(item)
+            return self.tail - 1
+
+    def snapshot(self) -> tuple[int, list[T]]:
+        """커밋되지 않은 항목들과 그 끝 offset 을 반환합니다."""
+        with self._lock:
+            return self.tail, self._items[self._head - self._start :]
+
+    def commit(self, offset: int) -> None:
+        """offset 이전의 항목을 업로드 완료로 표시합니다."""
+        with self._lock:
+            offset = min(offset, self.tail)
+            if offset <= self._head:
+                return
+            self._head = offset
+
+            # 커밋된 항목이 남은 항목보다 많아지면 앞부분을 잘라냅니다. (분할 상환 O(1))
+            committed = self._head - self._start
+            if committed * 2 >= len(self._items):
+                del self._items[:committed]
+                self._start = self._head
+
+    def _reset(self, offset: int, items: list[T]) -> None:
+        with self._lock:
+            self._items = list(items)
+            self._start = self._head = offset
+
+    def __len__(self) -> int:
+        return self.tail - self._head
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.snapshot()[1])
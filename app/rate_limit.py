@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 제한기입니다.
+    - capacity 개까지 토큰을 모아두고, period 초마다 capacity 개가 다시 채워집니다.
+    - acquire 는 토큰이 생길 때까지 기다렸다가 하나를 사용합니다.
+    여러 스레드가 같은 버킷을 공유해도 할당량을 넘지 않습니다.
+    """
+
+    def __init__(self, capacity: int, period: float = 60.0) -> None:
+        self.capacity = capacity
+        self.rate = capacity / period  # 초당 채워지는 토큰 수
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """지금 사용할 수 있는 토큰 수입니다."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self) -> float:
+        """토큰 하나를 사용하고, 토큰을 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
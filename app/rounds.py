@@ -0,0 +1,33 @@
+import datetime
+from bisect import bisect_left
+from collections.abc import Sequence
+
+
+class RoundCalendar:
+    """
+    오름차순 마감일 목록으로 날짜가 속한 회차를 찾는 달력입니다.
+    n회차는 (n-1회차 마감일, n회차 마감일] 기간이며, 0회차 마감일은 글또 시작일입니다.
+    """
+
+    def __init__(self, due_dates: Sequence[datetime.date]) -> None:
+        self.source = due_dates  # 달력을 만든 원본 목록 (바뀌었는지 확인하는 용도)
+        self.due_dates = tuple(due_dates)
+
+    def round_of(self, date: datetime.date) -> int | None:
+        """날짜가 속한 회차를 반환합니다. 마지막 마감일 이후라면 None 을 반환합니다."""
+        round = bisect_left(self.due_dates, date)
+        return round if round < len(self.due_dates) else None
+
+    def due_date(self, round: int) -> datetime.date:
+        """회차의 마감일을 반환합니다."""
+        return self.due_dates[round]
+
+    def previous_due_date(self, round: int, offset: int = 1) -> datetime.date:
+        """
+        offset 회차 전 마감일을 반환합니다.
+        기존 계산과 같게 앞쪽 회차에서는 목록 끝에서부터 셉니다.
+        """
+        return self.due_dates[round - offset]
+
+    def __len__(self) -> int:
+        return len(self.due_dates)
@@ -1,8 +1,6 @@
 import asyncio
-import csv
 import re
 
-import pandas as pd
 from app.logging import logger
 
 from app.slack_notification import send_point_noti_message
@@ -41,6 +39,7 @@ from app.slack.types import (
 )
 from app.utils import dict_to_json_str, json_str_to_dict, tz_now_to_str
 from app.config import settings
+from app.tables import table_cache
 
 
 async def submit_command(
@@ -335,9 +334,9 @@ async def submit_view(
 def _modify_super_admin_subscription_channel(channel_id: str, user_id: str) -> None:
     # 슈퍼 어드민의 경우 subscriptions.csv 파일에서 target_user_channel 값을 현재 채널로 업데이트 한다.
     # 이를 통해 슈퍼 어드민이 어느 채널에 글을 제출해도 구독자들에게 정확한 알림을 보낼 수 있게 한다.
-    df = pd.read_csv("store/subscriptions.csv")
-    df.loc[df["target_user_id"] == user_id, "target_user_channel"] = channel_id
-    df.to_csv("store/subscriptions.csv", index=False, quoting=csv.QUOTE_ALL)
+    table_cache.table("subscriptions").update(
+        "target_user_id", user_id, {"target_user_channel": channel_id}
+    )
 
 
 async def open_intro_modal(
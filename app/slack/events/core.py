@@ -3,7 +3,6 @@ import csv
 import os
 from typing import TypedDict
 import tenacity
-import pandas as pd
 
 from app.client import SpreadSheetClient
 from app.config import settings
@@ -383,8 +382,9 @@ async def handle_sync_store(
         # # TODO: 슬랙으로 백업파일 보내기
         store = Store(client=SpreadSheetClient())
 
+        timings: dict[str, float] = {}
         if value == "전체":
-            store.pull_all()
+            timings = await asyncio.to_thread(store.pull_all)
         elif value == "유저":
             store.pull_users()
         elif value == "컨텐츠":
@@ -405,9 +405,13 @@ async def handle_sync_store(
                 text="동기화 테이블이 존재하지 않습니다.",
             )
 
-        await client.chat_postMessage(
-            channel=settings.ADMIN_CHANNEL, text=f"{value} 데이터 동기화 완료"
-        )
+        text = f"{value} 데이터 동기화 완료"
+        if timings:
+            text += "\n" + "\n".join(
+                f"- {table_name}: {seconds:.2f}초"
+                for table_name, seconds in timings.items()
+            )
+        await client.chat_postMessage(channel=settings.ADMIN_CHANNEL, text=text)
 
     except Exception as e:
         await client.chat_postMessage(channel=settings.ADMIN_CHANNEL, text=str(e))
@@ -823,7 +827,7 @@ async def download_point_history(
     response = await client.conversations_open(users=user.user_id)
     dm_channel_id = response["channel"]["id"]
 
-    user_point = point_service.get_user_point(user_id=user.user_id)
+    user_point = point_service.get_user_point(user_id=user.user_id, full_history=True)
     if not user_point.point_histories:
         await client.chat_postMessage(
             channel=dm_channel_id, text="포인트 획득 내역이 없습니다."
@@ -1185,6 +1189,8 @@ class InflearnCoupon(TypedDict):
 
 def get_inflearn_coupon(user_id: str) -> InflearnCoupon | None:
     """인프런 쿠폰 코드를 반환합니다."""
+    import pandas as pd  # 서버 시작 시간을 줄이기 위해 사용할 때 불러옵니다.
+
     try:
         df = pd.read_csv(
             "store/_inflearn_coupon.csv", encoding="utf-8", quoting=csv.QUOTE_ALL
@@ -1200,6 +1206,8 @@ def get_inflearn_coupon(user_id: str) -> InflearnCoupon | None:
 
 def update_inflearn_coupon_status(user_id: str, status: str) -> None:
     """인프런 쿠폰 수령 상태를 업데이트합니다."""
+    import pandas as pd
+
     df = pd.read_csv("store/_inflearn_coupon.csv", encoding="utf-8")
     df.loc[df["user_id"] == user_id, "status"] = status
     df.to_csv(
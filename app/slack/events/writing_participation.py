@@ -1,4 +1,3 @@
-import csv
 from slack_bolt.async_app import AsyncAck
 from slack_sdk.models.views import View
 from slack_sdk.web.async_client import AsyncWebClient
@@ -10,7 +9,7 @@ from slack_sdk.models.blocks import (
     Option,
     StaticSelectElement,
 )
-import pandas as pd
+from app.tables import table_cache
 from app.slack.types import ActionBodyType, ViewBodyType
 from app.utils import tz_now_to_str
 from app.config import settings
@@ -69,52 +68,24 @@ async def submit_writing_participation_view(
 ):
     await ack()
 
-    columns = ["user_id", "name", "created_at", "is_writing_participation"]
-
-    try:
-        df = pd.read_csv("store/writing_participation.csv", dtype=str, na_filter=False)
-    except FileNotFoundError:
-        df = pd.DataFrame(columns=columns)
-
-    # 필요한 컬럼 보장
-    for c in columns:
-        if c not in df.columns:
-            df[c] = ""
-
-    # 존재 여부에 따라 업데이트/삽입
-    mask = df["user_id"] == user.user_id
-    if mask.any():
-        # 이름 최신화
-        df.loc[mask, "name"] = user.name
-        # 최초 생성 시간 비어있으면 채움
-        if (df.loc[mask, "created_at"] == "").any():
-            df.loc[mask, "created_at"] = tz_now_to_str()
-
-        # 신청 여부 True로 설정
-        df.loc[mask, "is_writing_participation"] = "True"
+    table = table_cache.table("writing_participation")
+    row = table.get("user_id", user.user_id)
+    if row:
+        # 이름 최신화, 최초 생성 시간 비어있으면 채움, 신청 여부 True로 설정
+        changes = {"name": user.name, "is_writing_participation": "True"}
+        if not row.get("created_at"):
+            changes["created_at"] = tz_now_to_str()
+        table.update("user_id", user.user_id, changes)
     else:
-        df = pd.concat(
-            [
-                df,
-                pd.DataFrame(
-                    [
-                        {
-                            "user_id": user.user_id,
-                            "name": user.name,
-                            "created_at": tz_now_to_str(),
-                            "is_writing_participation": "True",
-                        }
-                    ]
-                ),
-            ],
-            ignore_index=True,
+        table.append(
+            {
+                "user_id": user.user_id,
+                "name": user.name,
+                "created_at": tz_now_to_str(),
+                "is_writing_participation": "True",
+            }
         )
 
-    # 컬럼 순서 고정
-    df = df[columns]
-
-    df.to_csv("store/writing_participation.csv", index=False, quoting=csv.QUOTE_ALL)
-
     await client.chat_postMessage(
         channel=user.user_id,
         text=f"✏️ 글쓰기 참여 신청을 완료했어요!\n🤗 글쓰기는 <#{settings.WRITING_CHANNEL}> 채널에서 진행됩니다. 채널에 참여해주세요!",
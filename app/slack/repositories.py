@@ -1,22 +1,39 @@
-import csv
 from typing import Any
-import pandas as pd
-import polars as pl
 
 from app import store
 from app import models
 from app.config import settings
 from app.exception import BotException
+from app.tables import TableSnapshot, TableView, table_cache
 from app.utils import tz_now_to_str
 
 
+def _apply_point_balances(
+    balances: dict[str, models.PointBalance], rows: list[dict[str, str]]
+) -> dict[str, models.PointBalance]:
+    for row in rows:
+        balances.setdefault(row["user_id"], models.PointBalance()).add(row)
+    return balances
+
+
+def _build_point_balances(snapshot: TableSnapshot) -> dict[str, models.PointBalance]:
+    return _apply_point_balances({}, snapshot.all())
+
+
+# 유저별 포인트 합계와 최근 내역.
+# 포인트를 추가하면 추가된 행만 반영하고, 시트에서 다시 받아오면 새로 만듭니다.
+point_balances = TableView(
+    "point_histories", _build_point_balances, _apply_point_balances
+)
+
+
 class SlackRepository:
     def __init__(self) -> None: ...
 
     def get_user(self, user_id: str) -> models.User | None:
-        """유저와 콘텐츠를 가져옵니다."""
+        """유저를 가져오고, 콘텐츠는 처음 접근할 때 불러옵니다."""
         if user := self._get_user(user_id):
-            user.contents = self._fetch_contents(user_id)
+            user.set_contents_loader(lambda: self._fetch_contents(user_id))
             return user
         return None
 
@@ -35,29 +52,20 @@ class SlackRepository:
 
     def _get_user(self, user_id: str) -> models.User | None:
         """유저를 가져옵니다."""
-        users = self._fetch_users()
-        for user in users:
-            if user["user_id"] == user_id:
-                return models.User(**user)
+        if user := table_cache.table("users").get("user_id", user_id):
+            return models.User(**user)
         return None
 
     def _fetch_users(self) -> list[dict[str, Any]]:
         """모든 유저를 가져옵니다."""
-        with open("store/users.csv") as f:
-            reader = csv.DictReader(f)
-            users = [dict(row) for row in reader]
-            return users
+        return table_cache.table("users").all()
 
     def _fetch_contents(self, user_id: str) -> list[models.Content]:
         """유저의 콘텐츠를 오름차순(날짜)으로 정렬하여 가져옵니다."""
-        with open("store/contents.csv") as f:
-            reader = csv.DictReader(f)
-            contents = [
-                models.Content(**content)
-                for content in reader
-                if content["user_id"] == user_id
-            ]
-            return contents
+        return [
+            models.Content(**content)
+            for content in table_cache.table("contents").find("user_id", user_id)
+        ]
 
     def update(self, user: models.User) -> None:
         """유저의 콘텐츠를 업데이트합니다."""
@@ -65,39 +73,33 @@ class SlackRepository:
         if not user.contents:
             raise BotException("업데이트 대상 content 가 없어요.")
         store.content_upload_queue.append(user.recent_content.to_list_for_sheet())
-        with open("store/contents.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(user.recent_content.to_list_for_csv())
+        table_cache.table("contents").append(user.recent_content.to_list_for_csv())
 
     def fetch_contents(self) -> list[models.Content]:
         """모든 콘텐츠를 가져옵니다."""
-        with open("store/contents.csv") as f:
-            reader = csv.DictReader(f)
-            contents = [
-                models.Content(**content)
-                for content in reader
-                if content["type"] == "submit"
-            ]
-            return sorted(contents, key=lambda content: content.dt_, reverse=True)
+        contents = [
+            models.Content(**content)
+            for content in table_cache.table("contents").all()
+            if content["type"] == "submit"
+        ]
+        return sorted(contents, key=lambda content: content.dt_, reverse=True)
 
     def fetch_contents_by_keyword(self, keyword: str) -> list[models.Content]:
         """키워드가 포함된 콘텐츠를 가져옵니다."""
-        with open("store/contents.csv") as f:
-            reader = csv.DictReader(f)
-            contents = [
-                models.Content(**content)
-                for content in reader
-                if keyword.lower()
-                in (content["title"] + content["description"] + content["tags"]).lower()
-                and content["type"] == "submit"
-            ]
-            return sorted(contents, key=lambda content: content.dt_, reverse=True)
+        contents = [
+            models.Content(**content)
+            for content in table_cache.table("contents").all()
+            if keyword.lower()
+            in (content["title"] + content["description"] + content["tags"]).lower()
+            and content["type"] == "submit"
+        ]
+        return sorted(contents, key=lambda content: content.dt_, reverse=True)
 
     def get_user_id_by_name(self, name: str) -> str | None:
         """이름으로 user_id를 가져옵니다."""
-        with open("store/users.csv") as f:
-            reader = csv.DictReader(f)
-            matching_users = [user for user in reader if name in user["name"]]
+        matching_users = [
+            user for user in table_cache.table("users").all() if name in user["name"]
+        ]
 
         if len(matching_users) == 1:  # 이름 부분 일치가 하나인 경우에만 반환
             return matching_users[0]["user_id"]
@@ -109,15 +111,15 @@ class SlackRepository:
 
     def fetch_user_ids_by_name(self, name: str) -> list[str]:
         """이름으로 user_ids를 가져옵니다."""
-        with open("store/users.csv") as f:
-            reader = csv.DictReader(f)
-            return [user["user_id"] for user in reader if name in user["name"]]
+        return [
+            user["user_id"]
+            for user in table_cache.table("users").all()
+            if name in user["name"]
+        ]
 
     def create_bookmark(self, bookmark: models.Bookmark) -> None:
         """북마크를 생성합니다."""
-        with open("store/bookmark.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(bookmark.to_list_for_csv())
+        table_cache.table("bookmark").append(bookmark.to_list_for_csv())
 
     def get_bookmark(
         self,
@@ -137,13 +139,11 @@ class SlackRepository:
         status: models.BookmarkStatusEnum = models.BookmarkStatusEnum.ACTIVE,
     ) -> list[models.Bookmark]:
         """유저의 삭제되지 않은 북마크를 내림차순으로 가져옵니다."""
-        with open("store/bookmark.csv") as f:
-            reader = csv.DictReader(f)
-            bookmarks = [
-                models.Bookmark(**bookmark)  # type: ignore
-                for bookmark in reader
-                if bookmark["user_id"] == user_id and bookmark["status"] == status
-            ]
+        bookmarks = [
+            models.Bookmark(**bookmark)  # type: ignore
+            for bookmark in table_cache.table("bookmark").find("user_id", user_id)
+            if bookmark["status"] == status
+        ]
 
         return sorted(bookmarks, key=lambda bookmark: bookmark.created_at, reverse=True)
 
@@ -154,16 +154,14 @@ class SlackRepository:
         new_status: models.BookmarkStatusEnum = models.BookmarkStatusEnum.ACTIVE,
     ) -> None:
         """북마크를 업데이트합니다."""
-        df = pd.read_csv("store/bookmark.csv", dtype=str, na_filter=False)
-
+        changes = {}
         if new_note:
-            df.loc[df["content_ts"] == content_ts, "note"] = new_note
+            changes["note"] = new_note
         if new_status:
-            df.loc[df["content_ts"] == content_ts, "status"] = new_status
-        if new_note or new_status:
-            df.loc[df["content_ts"] == content_ts, "updated_at"] = tz_now_to_str()
-
-        df.to_csv("store/bookmark.csv", index=False, quoting=csv.QUOTE_ALL)
+            changes["status"] = models.BookmarkStatusEnum(new_status).value
+        if changes:
+            changes["updated_at"] = tz_now_to_str()
+            table_cache.table("bookmark").update("content_ts", content_ts, changes)
 
     def update_user_intro(
         self,
@@ -171,9 +169,7 @@ class SlackRepository:
         new_intro: str,
     ) -> None:
         """유저 정보를 업데이트합니다."""
-        df = pd.read_csv("store/users.csv", dtype=str, na_filter=False)
-        df.loc[df["user_id"] == user_id, "intro"] = new_intro
-        df.to_csv("store/users.csv", index=False, quoting=csv.QUOTE_ALL)
+        table_cache.table("users").update("user_id", user_id, {"intro": new_intro})
 
         if user := self._get_user(user_id):
             store.user_update_queue.append(user.to_list_for_sheet())
@@ -192,43 +188,32 @@ class SlackRepository:
         - content_url 이 있을 경우, content_url을 검색합니다. 이는 Unique한 값입니다.
         - Unique한 값이 아닌 경우, 검색된 결과 중 가장 최신의 결과를 반환합니다.
         """
-        with open("store/contents.csv") as f:
-            reader = csv.DictReader(f)
-            contents = [
-                models.Content(**content)  # type: ignore
-                for content in reader
-                if content["ts"] == ts
-                or (content["user_id"] == user_id and content["dt"] == dt)
-                or (content["content_url"] == content_url)
-            ]
-
-        if not contents:
+        table = table_cache.table("contents")
+        rows: list[dict[str, str]] = []
+        if ts is not None:
+            rows.extend(table.find("ts", ts))
+        if user_id is not None and dt is not None:
+            rows.extend(row for row in table.find("user_id", user_id) if row["dt"] == dt)
+        if content_url is not None:
+            rows.extend(table.find("content_url", content_url))
+
+        if not rows:
             return None
 
+        # 여러 조건에 동시에 걸린 행은 한 번만 사용합니다.
+        unique_rows = list({id(row): row for row in rows}.values())
+        contents = [models.Content(**content) for content in unique_rows]  # type: ignore
         return sorted(contents, key=lambda content: content.dt_, reverse=True)[0]
 
     def create_coffee_chat_proof(self, proof: models.CoffeeChatProof) -> None:
         """커피챗 인증을 생성합니다."""
-        with open(
-            "store/coffee_chat_proof.csv", "a", newline="", encoding="utf-8"
-        ) as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(proof.to_list_for_csv())
+        table_cache.table("coffee_chat_proof").append(proof.to_list_for_csv())
 
     def get_coffee_chat_proof(self, ts: str) -> models.CoffeeChatProof | None:
         """ts로 커피챗 인증을 조회합니다."""
-        with open("store/coffee_chat_proof.csv") as f:
-            reader = csv.DictReader(f)
-            proofs = [
-                models.CoffeeChatProof(**proof)  # type: ignore
-                for proof in reader
-                if proof["ts"] == ts
-            ]
-
-        if not proofs:
-            return None
-
-        return proofs[0]
+        if proof := table_cache.table("coffee_chat_proof").get("ts", ts):
+            return models.CoffeeChatProof(**proof)  # type: ignore
+        return None
 
     def fetch_coffee_chat_proofs(
         self,
@@ -237,140 +222,129 @@ class SlackRepository:
         user_id: str | None = None,
     ) -> list[models.CoffeeChatProof]:
         """thread_ts로 커피챗 인증을 조회합니다."""
-        with open("store/coffee_chat_proof.csv") as f:
-            reader = csv.DictReader(f)
-            proofs = [
-                models.CoffeeChatProof(**proof)  # type: ignore
-                for proof in reader
-                if (not thread_ts or proof["thread_ts"] == thread_ts)
-                and (not user_id or proof["user_id"] == user_id)
-            ]
-            return sorted(proofs, key=lambda proof: proof.ts, reverse=True)
+        table = table_cache.table("coffee_chat_proof")
+        if thread_ts:
+            rows = table.find("thread_ts", thread_ts)
+        elif user_id:
+            rows = table.find("user_id", user_id)
+        else:
+            rows = table.all()
+
+        proofs = [
+            models.CoffeeChatProof(**proof)  # type: ignore
+            for proof in rows
+            if (not thread_ts or proof["thread_ts"] == thread_ts)
+            and (not user_id or proof["user_id"] == user_id)
+        ]
+        return sorted(proofs, key=lambda proof: proof.ts, reverse=True)
 
     def add_point(self, point_history: models.PointHistory) -> None:
         """포인트를 추가합니다."""
-        with open("store/point_histories.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(point_history.to_list_for_csv())
+        table_cache.table("point_histories").append(point_history.to_list_for_csv())
+
+    def get_point_balance(self, user_id: str) -> models.PointBalance:
+        """유저의 포인트 합계와 최근 내역을 가져옵니다."""
+        return point_balances.get().get(user_id) or models.PointBalance()
 
     def fetch_point_histories(self, user_id: str) -> list[models.PointHistory]:
         """포인트 히스토리를 가져옵니다."""
-        with open("store/point_histories.csv") as f:
-            reader = csv.DictReader(f)
-            point_histories = [
-                models.PointHistory(**point_history)  # type: ignore
-                for point_history in reader
-                if point_history["user_id"] == user_id
-            ]
-            return sorted(
-                point_histories, key=lambda point: point.created_at, reverse=True
+        point_histories = [
+            models.PointHistory(**point_history)  # type: ignore
+            for point_history in table_cache.table("point_histories").find(
+                "user_id", user_id
             )
+        ]
+        return sorted(point_histories, key=lambda point: point.created_at, reverse=True)
+
+    def fetch_round_submitters(self, round: int) -> list[str]:
+        """회차에 처음 글을 제출한 순서대로 유저 아이디를 가져옵니다."""
+        return models.get_round_submitters(round)
 
     def fetch_channel_users(self, channel_id: str) -> list[models.User]:
         """
         채널의 유저를 가져옵니다.
-        성능향상을 위해 polars를 사용합니다.
         글쓰기 참여를 신청한 경우에는 글쓰기 채널 유저들을 반환합니다.
         """
-        users_df = pl.read_csv("store/users.csv", dtypes={"deposit": pl.Utf8})
-        
+        users_table = table_cache.table("users")
+
         if channel_id == settings.WRITING_CHANNEL:
-            writing_participation_df = pl.read_csv(
-                "store/writing_participation.csv",
-                dtypes={"user_id": pl.Utf8, "is_writing_participation": pl.Utf8},
-            )
-            user_ids = (
-                writing_participation_df
-                .filter(pl.col("is_writing_participation") == "True")
-                .select("user_id")
-                .to_series()
-                .to_list()
-            )
-            users_df = users_df.filter(pl.col("user_id").is_in(user_ids))
+            participant_ids = {
+                participation["user_id"]
+                for participation in table_cache.table("writing_participation").all()
+                if participation["is_writing_participation"] == "True"
+            }
+            rows = [
+                user for user in users_table.all() if user["user_id"] in participant_ids
+            ]
         else:
-            users_df = users_df.filter(pl.col("channel_id") == channel_id)
-
-        users = users_df.to_dicts()
-        users = [models.User(**user) for user in users]
+            rows = [
+                user for user in users_table.all() if user["channel_id"] == channel_id
+            ]
 
-        contents_df = pl.read_csv("store/contents.csv", dtypes={"ts": pl.Utf8})
+        users = [models.User(**user) for user in rows]
         for user in users:
-            contents = contents_df.filter(pl.col("user_id") == user.user_id).to_dicts()
-            user.contents = [models.Content(**content) for content in contents]
+            user.contents = self._fetch_contents(user.user_id)
 
         return users
 
     def create_paper_plane(self, paper_plane: models.PaperPlane) -> None:
         """종이비행기를 생성합니다."""
-        with open("store/paper_plane.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(paper_plane.to_list_for_csv())
+        table_cache.table("paper_plane").append(paper_plane.to_list_for_csv())
 
     def fetch_paper_planes(self, sender_id: str) -> list[models.PaperPlane]:
         """종이비행기를 가져옵니다."""
-        with open("store/paper_plane.csv") as f:
-            reader = csv.DictReader(f)
-            paper_planes = [
-                models.PaperPlane(**paper_plane)  # type: ignore
-                for paper_plane in reader
-                if paper_plane["sender_id"] == sender_id
-            ]
-            return paper_planes
+        return [
+            models.PaperPlane(**paper_plane)  # type: ignore
+            for paper_plane in table_cache.table("paper_plane").find(
+                "sender_id", sender_id
+            )
+        ]
 
     def create_subscription(self, subscription: models.Subscription) -> None:
         """구독을 생성합니다."""
-        with open("store/subscriptions.csv", "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerow(subscription.to_list_for_csv())
+        table_cache.table("subscriptions").append(subscription.to_list_for_csv())
 
     def cancel_subscription(self, subscription_id: str) -> None:
         """구독을 취소합니다."""
-        df = pd.read_csv("store/subscriptions.csv", dtype=str, na_filter=False)
-        df.loc[df["id"] == subscription_id, "status"] = (
-            models.SubscriptionStatusEnum.CANCELED
+        table_cache.table("subscriptions").update(
+            "id",
+            subscription_id,
+            {"status": models.SubscriptionStatusEnum.CANCELED.value},
         )
-        df.to_csv("store/subscriptions.csv", index=False, quoting=csv.QUOTE_ALL)
 
     def fetch_subscriptions(self) -> list[models.Subscription]:
         """모든 구독 내역을 가져옵니다."""
-        with open("store/subscriptions.csv") as f:
-            reader = csv.DictReader(f)
-            subscriptions = [
-                models.Subscription(**subscription)  # type: ignore
-                for subscription in reader
-                if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
-            ]
-            return subscriptions
+        return [
+            models.Subscription(**subscription)  # type: ignore
+            for subscription in table_cache.table("subscriptions").all()
+            if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
+        ]
 
     def fetch_subscriptions_by_user_id(
         self,
         user_id: str,
     ) -> list[models.Subscription]:
         """유저의 구독 내역을 가져옵니다."""
-        with open("store/subscriptions.csv") as f:
-            reader = csv.DictReader(f)
-            subscriptions = [
-                models.Subscription(**subscription)  # type: ignore
-                for subscription in reader
-                if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
-                and subscription["user_id"] == user_id
-            ]
-            return subscriptions
+        return [
+            models.Subscription(**subscription)  # type: ignore
+            for subscription in table_cache.table("subscriptions").find(
+                "user_id", user_id
+            )
+            if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
+        ]
 
     def fetch_subscriptions_by_target_user_id(
         self,
         target_user_id: str,
     ) -> list[models.Subscription]:
         """타겟 유저를 기준으로 구독 내역을 가져옵니다."""
-        with open("store/subscriptions.csv") as f:
-            reader = csv.DictReader(f)
-            subscriptions = [
-                models.Subscription(**subscription)  # type: ignore
-                for subscription in reader
-                if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
-                and subscription["target_user_id"] == target_user_id
-            ]
-            return subscriptions
+        return [
+            models.Subscription(**subscription)  # type: ignore
+            for subscription in table_cache.table("subscriptions").find(
+                "target_user_id", target_user_id
+            )
+            if subscription["status"] == models.SubscriptionStatusEnum.ACTIVE
+        ]
 
     def get_subscription(
         self,
@@ -378,12 +352,9 @@ class SlackRepository:
         status: models.SubscriptionStatusEnum = models.SubscriptionStatusEnum.ACTIVE,
     ) -> models.Subscription | None:
         """구독을 가져옵니다."""
-        with open("store/subscriptions.csv") as f:
-            reader = csv.DictReader(f)
-            for subscription in reader:
-                if (
-                    subscription["id"] == subscription_id
-                    and subscription["status"] == status
-                ):
-                    return models.Subscription(**subscription)  # type: ignore
+        for subscription in table_cache.table("subscriptions").find(
+            "id", subscription_id
+        ):
+            if subscription["status"] == status:
+                return models.Subscription(**subscription)  # type: ignore
         return None
@@ -4,12 +4,12 @@ import os
 import traceback
 from typing import TypedDict
 
-import pandas as pd
 import tenacity
 from app.constants import remind_message
 from app.logging import log_event
 from app.models import User
 from app.slack.repositories import SlackRepository
+from app.tables import table_cache
 from slack_sdk.models.blocks import (
     SectionBlock,
     TextObject,
@@ -80,6 +80,7 @@ class BackgroundService:
 
     async def prepare_subscribe_message_data(self) -> None:
         """사용자에게 구독 알림 메시지 목록을 임시 CSV 파일로 저장합니다."""
+        import pandas as pd  # 서버 시작 시간을 줄이기 위해 사용할 때 불러옵니다.
 
         # 기존 임시 파일 삭제
         if os.path.exists("store/_subscription_messages.csv"):
@@ -94,7 +95,7 @@ class BackgroundService:
         }
 
         yesterday = (tz_now() - timedelta(days=1)).date()
-        contents_df = pd.read_csv("store/contents.csv")
+        contents_df = pd.read_csv(table_cache.table("contents").csv_source())
 
         # dt 컬럼을 datetime 타입으로 변환하고 date 부분만 추출합니다
         contents_df["dt"] = pd.to_datetime(contents_df["dt"]).dt.date
@@ -111,7 +112,9 @@ class BackgroundService:
 
         # 글쓰기 참여자 목록을 로드합니다.
         try:
-            writing_df = pd.read_csv("store/writing_participation.csv", dtype=str)
+            writing_df = pd.read_csv(
+                table_cache.table("writing_participation").csv_source(), dtype=str
+            )
             writing_user_ids = set(writing_df.get("user_id", pd.Series(dtype=str)).tolist())
         except FileNotFoundError:
             writing_user_ids = set()
@@ -162,6 +165,8 @@ class BackgroundService:
         if not os.path.exists("store/_subscription_messages.csv"):
             return
 
+        import pandas as pd
+
         df = pd.read_csv("store/_subscription_messages.csv")
         for _, row in df.iterrows():
             try:
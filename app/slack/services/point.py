@@ -1,9 +1,11 @@
 from pydantic import BaseModel
 from app.exception import BotException
-from app.models import PointHistory, User
+from app.models import PointHistory, User, round_calendar
 from app.slack.repositories import SlackRepository
 from app.config import settings
+from app.constants import RECENT_POINT_HISTORY_COUNT
 from app import store
+from app.utils import tz_now
 from enum import Enum
 
 # 동기부여와 자극을 주는 포인트는 공개 채널에 알림을 준다.
@@ -57,16 +59,19 @@ class PointMap(Enum):
 class UserPoint(BaseModel):
     user: User
     point_histories: list[PointHistory]
-    
+    balance: int | None = None  # 전체 내역의 포인트 합계 (point_histories 가 최근 내역만 담을 때)
+
     @property
     def total_point(self) -> int:
+        if self.balance is not None:
+            return self.balance
         return sum([point_history.point for point_history in self.point_histories])
 
 
     @property
     def point_history_text(self) -> str:
         text = ""
-        for point_history in self.point_histories[:20]:
+        for point_history in self.point_histories[:RECENT_POINT_HISTORY_COUNT]:
             text += f"[{point_history.created_at}] - *{point_history.point}점* :: {point_history.reason}\n"
 
         if not text:
@@ -80,13 +85,23 @@ class PointService:
     def __init__(self, repo: SlackRepository) -> None:
         self._repo = repo
 
-    def get_user_point(self, user_id: str) -> UserPoint:
-        """포인트 히스토리를 포함한 유저를 가져옵니다."""
+    def get_user_point(self, user_id: str, full_history: bool = False) -> UserPoint:
+        """
+        포인트 히스토리를 포함한 유저를 가져옵니다.
+        기본으로는 포인트 합계와 최근 내역만 담고, full_history 이면 전체 내역을 담습니다.
+        """
         user = self._repo.get_user(user_id)
         if not user:
             raise BotException("존재하지 않는 유저입니다.")
-        point_histories = self._repo.fetch_point_histories(user_id)
-        return UserPoint(user=user, point_histories=point_histories)
+        if full_history:
+            point_histories = self._repo.fetch_point_histories(user_id)
+            return UserPoint(user=user, point_histories=point_histories)
+        balance = self._repo.get_point_balance(user_id)
+        return UserPoint(
+            user=user,
+            point_histories=balance.recent_histories(),
+            balance=balance.total_point,
+        )
 
     def add_point_history(self, user_id: str, point_info: PointMap, point: int | None = None) -> str:
         """포인트 히스토리를 추가하고 알림 메시지를 반환합니다."""
@@ -161,14 +176,28 @@ class PointService:
         if not user:
             raise BotException("유저 정보가 없어 글 제출 포인트를 지급할 수 없습니다.")
         
-        rank_map = {}
-        channel_users = self._repo.fetch_channel_users(user.writing_channel_id)
-        for channel_user in channel_users:
-            if channel_user.is_submit is True:
-                content = channel_user.recent_content
-                rank_map[channel_user.user_id] = content.ts
-        
-        rank_user_ids = sorted(rank_map, key=lambda x: rank_map[x])[:3]
+        round = round_calendar().round_of(tz_now().date())
+        if round is None:  # 글또 활동 기간이 끝났다.
+            return None
+
+        # 이번 회차에 처음 제출한 순서대로 보면서 같은 채널 유저 3명까지 순위를 매깁니다.
+        # 글쓰기 채널은 글쓰기 참여 유저끼리,
+        # 코어채널은 글쓰기 참여 여부와 관계없이 채널 유저끼리 겨룹니다.
+        channel_id = user.writing_channel_id
+        rank_user_ids: list[str] = []
+        for submitter_id in self._repo.fetch_round_submitters(round):
+            submitter = self._repo.get_user(submitter_id)
+            if not submitter:
+                continue
+            if channel_id == settings.WRITING_CHANNEL:
+                is_channel_user = submitter.is_writing_participation
+            else:
+                is_channel_user = submitter.channel_id == channel_id
+            if is_channel_user:
+                rank_user_ids.append(submitter_id)
+                if len(rank_user_ids) == 3:
+                    break
+
         if user.user_id in rank_user_ids:
             rank = rank_user_ids.index(user.user_id) + 1
             if rank == 1:
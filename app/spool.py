@@ -0,0 +1,358 @@
+import json
+import os
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.logging import logger
+from app.queues import OffsetQueue
+
+T = TypeVar("T")
+
+
+def _default(obj: Any) -> Any:
+    """json 으로 바로 직렬화할 수 없는 값을 변환합니다."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def _dump_record(offset: int, item: Any) -> str:
+    """스풀에 기록할 한 줄입니다."""
+    record = {"offset": offset, "item": item}
+    return json.dumps(record, ensure_ascii=False, default=_default) + "\n"
+
+
+class SpoolQueue(OffsetQueue[T]):
+    """
+    디스크 스풀을 가진 업로드 큐입니다.
+    - append 한 항목은 offset 과 함께 store/spool/{name}.jsonl 에 한 줄씩 덧붙여 기록합니다.
+    - fsync 는 SPOOL_FSYNC_BATCH 개 또는 SPOOL_FSYNC_INTERVAL 초마다 묶어서 호출합니다.
+    - commit 한 offset 은 store/spool/{name}.offset 에 기록하고, 큐가 비면 스풀을 지웁니다.
+      큐가 비지 않아도 커밋된 줄이 SPOOL_COMPACT_LINES 개 쌓이면 남은 항목만 다시 씁니다.
+    - 서버 시작 시 replay 로 커밋되지 않은 항목을 복구합니다.
+    """
+
+    def __init__(self, name: str, decode: Callable[[Any], T] | None = None) -> None:
+        super().__init__()
+        self.name = name
+        self._decode = decode
+        self._file: Any = None
+        self._file_path = ""
+        self._unsynced = 0
+        self._last_synced_at = time.monotonic()
+        self._committed_lines = 0  # 스풀에 남아있는 커밋된 줄 수
+
+    @property
+    def path(self) -> str:
+        return os.path.abspath(os.path.join(settings.SPOOL_DIR, f"{self.name}.jsonl"))
+
+    @property
+    def offset_path(self) -> str:
+        return os.path.abspath(os.path.join(settings.SPOOL_DIR, f"{self.name}.offset"))
+
+    def append(self, item: T) -> int:
+        with self._lock:
+            offset = super().append(item)
+            self._write_record(offset, item)
+            return offset
+
+    def _write_record(self, offset: int, item: T) -> None:
+        """offset 과 항목을 스풀에 한 줄로 기록하고, 모아서 fsync 합니다."""
+        file = self._open(offset)
+        file.write(_dump_record(offset, item))
+        file.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= settings.SPOOL_FSYNC_BATCH
+            or time.monotonic() - self._last_synced_at >= settings.SPOOL_FSYNC_INTERVAL
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """아직 디스크에 반영되지 않은 항목을 fsync 합니다."""
+        with self._lock:
+            if self._file and self._unsynced:
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_synced_at = time.monotonic()
+
+    def commit(self, offset: int) -> None:
+        """offset 이전의 항목을 업로드 완료로 표시하고 스풀에 기록합니다."""
+        with self._lock:
+            head = self.head
+            super().commit(offset)
+            self._write_offset(self.head)
+            self._committed_lines += self.head - head
+            if not len(self):
+                self._close()
+                self._committed_lines = 0
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            elif self._committed_lines >= settings.SPOOL_COMPACT_LINES:
+                self._compact()
+
+    def _compact(self) -> None:
+        """커밋되지 않은 항목만 임시 파일에 다시 쓰고 스풀을 교체합니다."""
+        self._close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(
+                _dump_record(offset, item)
+                for offset, item in enumerate(self, start=self.head)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._committed_lines = 0
+
+    def replay(self) -> int:
+        """스풀에 남아있는 커밋되지 않은 항목을 큐로 복구하고 그 개수를 반환합니다."""
+        with self._lock:
+            self._close()
+            self._committed_lines = 0
+            committed = self._read_offset()
+            start = committed
+            items: list[T] = []
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # 쓰는 도중 종료되어 잘린 마지막 줄은 버립니다.
+                            logger.warning(
+                                f"{self.name} 스풀의 손상된 줄을 건너뜁니다."
+                            )
+                            continue
+                        if record["offset"] < committed:
+                            self._committed_lines += 1
+                            continue
+                        if not items:
+                            start = record["offset"]
+                        item = record["item"]
+                        items.append(self._decode(item) if self._decode else item)
+            self._reset(start, items)
+            return len(items)
+
+    def _read_offset(self) -> int:
+        if not os.path.exists(self.offset_path):
+            return 0
+        with open(self.offset_path, encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+
+    def _write_offset(self, offset: int) -> None:
+        os.makedirs(os.path.dirname(self.offset_path), exist_ok=True)
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_path)
+
+    def _open(self, offset: int) -> Any:
+        path = self.path
+        if self._file is None or self._file_path != path:
+            self._close()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # append 마다 다시 열지 않도록 스풀 파일을 열어 두고 _close 에서 닫습니다.
+            self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+            self._file_path = path
+        return self._file
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class SegmentedSpoolQueue(SpoolQueue[T]):
+    """
+    여러 세그먼트 파일로 나눈 디스크 스풀을 가진 업로드 큐입니다.
+    - append 한 항목은 store/spool/{name}/{첫 offset}.jsonl 세그먼트에 기록합니다.
+      세그먼트가 SPOOL_SEGMENT_BYTES 보다 커지거나 SPOOL_SEGMENT_SECONDS 가 지나면
+      새 세그먼트를 엽니다.
+    - 메모리에는 커밋되지 않은 항목을 최대 memory_cap 개만 들고 있습니다.
+      넘치는 항목은 디스크에만 두었다가, 앞선 항목이 커밋되면 세그먼트에서 다시 읽어옵니다.
+    - commit 한 offset 까지 모두 포함된 세그먼트는 통째로 지웁니다.
+    - 서버 시작 시 replay 로 남은 세그먼트를 복구합니다.
+    - 세그먼트별 크기와 첫 기록 시각으로 쌓인 바이트(pending_bytes)와
+      가장 오래된 항목의 나이(oldest_age)를 계산합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        decode: Callable[[Any], T] | None = None,
+        memory_cap: int | None = None,
+    ) -> None:
+        super().__init__(name, decode)
+        self.memory_cap = memory_cap or settings.SPOOL_MEMORY_CAP
+        self._tail = 0
+        self._segment_opened_at = 0.0
+        self._segment_start = 0
+        # 세그먼트 첫 offset -> [첫 기록 시각(epoch 초), 바이트]
+        self._segment_stats: dict[int, list[float]] = {}
+
+    @property
+    def path(self) -> str:
+        """세그먼트 파일을 두는 디렉터리입니다."""
+        return os.path.abspath(os.path.join(settings.SPOOL_DIR, self.name))
+
+    @property
+    def offset_path(self) -> str:
+        return os.path.join(self.path, "committed.offset")
+
+    @property
+    def tail(self) -> int:
+        return self._tail
+
+    @property
+    def pending_bytes(self) -> int:
+        """
+        커밋되지 않은 항목이 스풀에서 차지하는 바이트입니다.
+        첫 세그먼트는 항목 수 비율로 어림합니다.
+        """
+        with self._lock:
+            segments = sorted(self._segment_stats.items())
+            total = 0.0
+            for i, (start, (_, size)) in enumerate(segments):
+                end = segments[i + 1][0] if i + 1 < len(segments) else self._tail
+                if end <= self._head:
+                    continue
+                if start < self._head:
+                    size = size * (end - self._head) / (end - start)
+                total += size
+            return int(total)
+
+    @property
+    def oldest_age(self) -> float:
+        """
+        커밋되지 않은 가장 오래된 항목이 기록된 뒤 지난 시간(초)입니다.
+        그 항목이 든 세그먼트의 첫 기록 시각으로 계산하므로 실제보다 짧게 보지 않습니다.
+        """
+        with self._lock:
+            if self._head >= self._tail:
+                return 0.0
+            appended_at = max(
+                (
+                    at
+                    for start, (at, _) in self._segment_stats.items()
+                    if start <= self._head
+                ),
+                default=0.0,
+            )
+            return time.time() - appended_at
+
+    def append(self, item: T) -> int:
+        with self._lock:
+            offset = self._tail
+            self._tail += 1
+            # 메모리 창이 가득 찼다면 디스크에만 기록합니다.
+            memory_end = self._start + len(self._items)
+            if memory_end == offset and memory_end - self._head < self.memory_cap:
+                self._items.append(item)
+            self._write_record(offset, item)
+            self._segment_stats[self._segment_start][1] = self._file.tell()
+            return offset
+
+    def snapshot(self) -> tuple[int, list[T]]:
+        """메모리에 올라온 커밋되지 않은 항목들과 그 끝 offset 을 반환합니다."""
+        with self._lock:
+            return (
+                self._start + len(self._items),
+                self._items[self._head - self._start :],
+            )
+
+    def commit(self, offset: int) -> None:
+        """offset 이전의 항목을 업로드 완료로 표시하고, 다 쓴 세그먼트를 지웁니다."""
+        with self._lock:
+            offset = min(offset, self._tail)
+            if offset <= self._head:
+                return
+            del self._items[: offset - self._start]
+            self._start = self._head = offset
+            self._write_offset(offset)
+
+            if self._head == self._tail:
+                self._close()
+            segments = self._segments()
+            for i, (start, path) in enumerate(segments):
+                end = segments[i + 1][0] if i + 1 < len(segments) else self._tail
+                if end <= offset and not (self._file and path == self._file_path):
+                    os.remove(path)
+                    self._segment_stats.pop(start, None)
+            self._load(self._start + len(self._items))
+
+    def replay(self) -> int:
+        """남아있는 세그먼트에서 커밋되지 않은 항목을 복구하고 그 개수를 반환합니다."""
+        with self._lock:
+            self._close()
+            committed = self._read_offset()
+            offsets = [record["offset"] for _, record in self._records(committed)]
+            self._items = []
+            self._start = self._head = offsets[0] if offsets else committed
+            self._tail = offsets[-1] + 1 if offsets else committed
+            # 복구한 항목은 언제 기록됐는지 모르므로 바로 업로드 대상이 되도록 합니다.
+            self._segment_stats = {
+                start: [0.0, os.path.getsize(path)] for start, path in self._segments()
+            }
+            self._load(self._start)
+            return self._tail - self._head
+
+    def _load(self, offset: int) -> None:
+        """offset 부터 메모리 창이 찰 때까지 세그먼트에서 항목을 읽어옵니다."""
+        if len(self._items) >= self.memory_cap or offset >= self._tail:
+            return
+        for _, record in self._records(offset):
+            item = record["item"]
+            self._items.append(self._decode(item) if self._decode else item)
+            if len(self._items) >= self.memory_cap:
+                break
+
+    def _records(self, offset: int) -> Iterator[tuple[str, dict[str, Any]]]:
+        """offset 이후의 (세그먼트 경로, 기록) 을 순서대로 내보냅니다."""
+        segments = self._segments()
+        for i, (start, path) in enumerate(segments):
+            if i + 1 < len(segments) and segments[i + 1][0] <= offset:
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 쓰는 도중 종료되어 잘린 마지막 줄은 버립니다.
+                        logger.warning(f"{self.name} 스풀의 손상된 줄을 건너뜁니다.")
+                        continue
+                    if record["offset"] >= offset:
+                        yield path, record
+
+    def _segments(self) -> list[tuple[int, str]]:
+        """(첫 offset, 경로) 순으로 정렬한 세그먼트 목록입니다."""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            (int(filename.removesuffix(".jsonl")), os.path.join(self.path, filename))
+            for filename in os.listdir(self.path)
+            if filename.endswith(".jsonl")
+        )
+
+    def _open(self, offset: int) -> Any:
+        if self._file is not None and (
+            self._file.tell() >= settings.SPOOL_SEGMENT_BYTES
+            or time.monotonic() - self._segment_opened_at
+            >= settings.SPOOL_SEGMENT_SECONDS
+        ):
+            self._close()
+        if self._file is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._file_path = os.path.join(self.path, f"{offset:012d}.jsonl")
+            self._file = open(self._file_path, "a", encoding="utf-8")  # noqa: SIM115
+            self._segment_opened_at = time.monotonic()
+            self._segment_start = offset
+            self._segment_stats[offset] = [time.time(), 0]
+        return self._file
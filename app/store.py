@@ -1,120 +1,224 @@
 import asyncio
-import csv
+import hashlib
+import json
 import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 from app.client import SpreadSheetClient
-from app.logging import log_event
+from app.config import settings
+from app.logging import log_event, logger
 from app.models import Bookmark
+from app.spool import SpoolQueue
+from app.tables import table_cache
 
 queue_lock = asyncio.Lock()
 
-content_upload_queue: list[list[str]] = []
-bookmark_upload_queue: list[list[str]] = []
-bookmark_update_queue: list[Bookmark] = []  # TODO: 추후 타입 수정 필요
-user_update_queue: list[list[str]] = []
-coffee_chat_proof_upload_queue: list[list[str]] = []
-point_history_upload_queue: list[list[str]] = []
-paper_plane_upload_queue: list[list[str]] = []
-subscription_upload_queue: list[list[str]] = []
-subscription_update_queue: list[dict[str, Any]] = []
+content_upload_queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+bookmark_upload_queue: SpoolQueue[list[str]] = SpoolQueue("bookmark_upload")
+bookmark_update_queue: SpoolQueue[Bookmark] = SpoolQueue(
+    "bookmark_update", decode=lambda data: Bookmark(**data)
+)  # TODO: 추후 타입 수정 필요
+user_update_queue: SpoolQueue[list[str]] = SpoolQueue("user_update")
+coffee_chat_proof_upload_queue: SpoolQueue[list[str]] = SpoolQueue(
+    "coffee_chat_proof_upload"
+)
+point_history_upload_queue: SpoolQueue[list[str]] = SpoolQueue("point_history_upload")
+paper_plane_upload_queue: SpoolQueue[list[str]] = SpoolQueue("paper_plane_upload")
+subscription_upload_queue: SpoolQueue[list[str]] = SpoolQueue("subscription_upload")
+subscription_update_queue: SpoolQueue[dict[str, Any]] = SpoolQueue(
+    "subscription_update"
+)
+
+upload_queues: list[SpoolQueue] = [
+    content_upload_queue,
+    bookmark_upload_queue,
+    bookmark_update_queue,
+    user_update_queue,
+    coffee_chat_proof_upload_queue,
+    point_history_upload_queue,
+    paper_plane_upload_queue,
+    subscription_upload_queue,
+    subscription_update_queue,
+]
+
+TABLES = (
+    "users",
+    "contents",
+    "bookmark",
+    "coffee_chat_proof",
+    "point_histories",
+    "paper_plane",
+    "subscriptions",
+)
+# 시트 하단에만 행이 추가되는 테이블. 증분 동기화(pull_delta)를 사용합니다.
+APPEND_ONLY_TABLES = ("contents", "coffee_chat_proof", "point_histories", "paper_plane")
+SYNC_STATE_PATH = "store/_sync_state.json"
+sync_state_lock = threading.Lock()
+
+
+def _row_hash(row: list[str]) -> str:
+    """행의 해시를 반환합니다. 시트가 잘라내는 끝쪽 빈 셀은 무시합니다."""
+    values = [str(value) for value in row]
+    while values and values[-1] == "":
+        values.pop()
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode()).hexdigest()
+
+
+def _read_sync_state() -> dict[str, dict[str, Any]]:
+    if not os.path.exists(SYNC_STATE_PATH):
+        return {}
+    with open(SYNC_STATE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_sync_state(state: dict[str, dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(SYNC_STATE_PATH), exist_ok=True)
+    tmp_path = f"{SYNC_STATE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, SYNC_STATE_PATH)
+
+
+def _progress_committer(
+    queue: SpoolQueue, offset: int, count: int
+) -> Callable[[int], None]:
+    """
+    bulk_upload 이 배치를 올릴 때마다 올린 항목까지 큐를 커밋하는 콜백을 만듭니다.
+    업로드가 중간에 실패해도 다음 업로드는 마지막으로 성공한 배치 이후부터 다시 올립니다.
+    """
+    start = offset - count
+    return lambda uploaded: queue.commit(start + uploaded)
 
 
 class Store:
     def __init__(self, client: SpreadSheetClient) -> None:
         self._client = client
 
-    def pull_all(self) -> None:
-        """데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("users", values=self._client.get_values("users"))
-        self.write("contents", values=self._client.get_values("contents"))
-        self.write("bookmark", values=self._client.get_values("bookmark"))
-        self.write(
-            "coffee_chat_proof", values=self._client.get_values("coffee_chat_proof")
-        )
-        self.write("point_histories", values=self._client.get_values("point_histories"))
-        self.write("paper_plane", values=self._client.get_values("paper_plane"))
-        self.write("subscriptions", values=self._client.get_values("subscriptions"))
+    def pull_all(self) -> dict[str, float]:
+        """
+        데이터를 가져와 서버 저장소를 동기화하고 테이블별 소요 시간(초)을 반환합니다.
+        시트는 SHEET_PULL_CONCURRENCY 개까지 동시에 가져오고, 받는 대로 저장합니다.
+        """
+        timings = {}
+        with ThreadPoolExecutor(max_workers=settings.SHEET_PULL_CONCURRENCY) as pool:
+            futures = {
+                pool.submit(self._timed_pull_full, name): name for name in TABLES
+            }
+            for future in as_completed(futures):
+                timings[futures[future]] = future.result()
+        return {name: timings[name] for name in TABLES}
 
     def pull_users(self) -> None:
         """유저 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("users", values=self._client.get_values("users"))
+        self.pull_full("users")
 
     def pull_contents(self) -> None:
         """콘텐츠 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("contents", values=self._client.get_values("contents"))
+        self.pull_delta("contents")
 
     def pull_bookmark(self) -> None:
         """북마크 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("bookmark", values=self._client.get_values("bookmark"))
+        self.pull_full("bookmark")
 
     def pull_coffee_chat_proof(self) -> None:
         """커피챗 인증 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write(
-            "coffee_chat_proof", values=self._client.get_values("coffee_chat_proof")
-        )
+        self.pull_delta("coffee_chat_proof")
 
     def pull_point_histories(self) -> None:
         """포인트 내역 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("point_histories", values=self._client.get_values("point_histories"))
+        self.pull_delta("point_histories")
 
     def pull_paper_plane(self) -> None:
         """종이비행기 데이터를 가져와 서버 저장소를 동기화합니다."""
-        os.makedirs("store", exist_ok=True)
-        self.write("paper_plane", values=self._client.get_values("paper_plane"))
+        self.pull_delta("paper_plane")
 
     def pull_subscriptions(self) -> None:
         """구독 내역 데이터를 가져와 서버 저장소를 동기화합니다."""
+        self.pull_full("subscriptions")
+
+    def pull_full(self, table_name: str) -> int:
+        """시트 전체를 가져와 서버 저장소를 동기화하고 가져온 행 수를 반환합니다."""
         os.makedirs("store", exist_ok=True)
-        self.write("subscriptions", values=self._client.get_values("subscriptions"))
+        values = self._client.get_values(table_name)
+        self.write(table_name, values=values)
+        if table_name in APPEND_ONLY_TABLES:
+            self._save_watermark(table_name, len(values), values[-1] if values else [])
+        return max(len(values) - 1, 0)
+
+    def pull_delta(self, table_name: str) -> int:
+        """
+        시트에 새로 추가된 행만 가져와 서버 저장소를 동기화하고 가져온 행 수를 반환합니다.
+        - 마지막으로 동기화한 행 수와 그 행의 해시(워터마크)를 기준으로 이후 범위만 가져옵니다.
+        - 워터마크 행이 달라졌다면 위쪽 행이 수정/삭제된 것이므로 전체를 다시 가져옵니다.
+        """
+        watermark = _read_sync_state().get(table_name)
+        local = self.read(table_name)
+        if not watermark or not local or len(local) < watermark["rows"]:
+            return self.pull_full(table_name)
+
+        values = self._client.get_values_from(table_name, watermark["rows"])
+        if not values or _row_hash(values[0]) != watermark["hash"]:
+            logger.info(f"{table_name} 시트의 기존 행이 변경되어 전체 동기화합니다.")
+            return self.pull_full(table_name)
+
+        header = local[0]
+        new_rows = [row + [""] * (len(header) - len(row)) for row in values[1:]]
+        # 워터마크 이후의 로컬 행은 아직 시트에 반영되지 않았거나 새 범위에 포함된 행이다.
+        self.write(table_name, values=local[: watermark["rows"]] + new_rows)
+        self._save_watermark(table_name, watermark["rows"] + len(new_rows), values[-1])
+        return len(new_rows)
+
+    def _timed_pull_full(self, table_name: str) -> float:
+        started_at = time.perf_counter()
+        self.pull_full(table_name)
+        return time.perf_counter() - started_at
+
+    def _save_watermark(self, table_name: str, rows: int, last_row: list[str]) -> None:
+        with sync_state_lock:
+            state = _read_sync_state()
+            state[table_name] = {"rows": rows, "hash": _row_hash(last_row)}
+            _write_sync_state(state)
 
     def write(self, table_name: str, values: list[list[str]]) -> None:
         """데이터를 저장소에 저장합니다."""
-        with open(f"store/{table_name}.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerows(values)
+        table_cache.table(table_name).replace(values)
 
     def read(self, table_name: str) -> list[list[str]]:
         """저장소에서 데이터를 읽어옵니다."""
-        with open(f"store/{table_name}.csv") as f:
-            reader = csv.reader(f, quoting=csv.QUOTE_ALL)
-            data = list(reader)
-        return data
+        return table_cache.table(table_name).values()
 
     def upload_all(self, table_name: str) -> None:
         """해당 테이블의 모든 데이터를 업로드합니다."""
         values = self.read(table_name)
         self._client.bulk_upload(table_name, values)
 
+    def replay_queues(self) -> None:
+        """서버 시작 시 스풀에 남아있는 업로드 큐를 복구합니다."""
+        for queue in upload_queues:
+            count = queue.replay()
+            if count:
+                logger.info(f"{queue.name} 큐 {count}개 항목을 스풀에서 복구했습니다.")
+
     async def upload_queue(self) -> None:
         """새로 추가된 queue 가 있다면 upload 합니다."""
-        global content_upload_queue
-        global bookmark_upload_queue
-        global bookmark_update_queue
-        global user_update_queue
-        global coffee_chat_proof_upload_queue
-        global point_history_upload_queue
-        global paper_plane_upload_queue
-        global subscription_upload_queue
-        global subscription_update_queue
+        for queue in upload_queues:
+            queue.sync()
 
         async with queue_lock:
-            temp_content_upload_queue = list(content_upload_queue)
+            offset, temp_content_upload_queue = content_upload_queue.snapshot()
             if temp_content_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "contents",
                     temp_content_upload_queue,
+                    on_progress=_progress_committer(
+                        content_upload_queue, offset, len(temp_content_upload_queue)
+                    ),
                 )
-                content_upload_queue = self.initial_queue(
-                    queue=content_upload_queue,
-                    temp_queue=temp_content_upload_queue,
-                )
+                content_upload_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="uploaded_contents",
@@ -122,21 +226,22 @@ class Store:
                     description=f"{len(temp_content_upload_queue)}개 콘텐츠 업로드",
                     body={
                         "temp_content_upload_queue": temp_content_upload_queue,
-                        "content_upload_queue": content_upload_queue,  # 디버깅을 위해 추가
+                        # 디버깅을 위해 추가
+                        "content_upload_queue": list(content_upload_queue),
                     },
                 )
 
-            temp_bookmark_upload_queue = list(bookmark_upload_queue)
+            offset, temp_bookmark_upload_queue = bookmark_upload_queue.snapshot()
             if temp_bookmark_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "bookmark",
                     temp_bookmark_upload_queue,
+                    on_progress=_progress_committer(
+                        bookmark_upload_queue, offset, len(temp_bookmark_upload_queue)
+                    ),
                 )
-                bookmark_upload_queue = self.initial_queue(
-                    queue=bookmark_upload_queue,
-                    temp_queue=temp_bookmark_upload_queue,
-                )
+                bookmark_upload_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="uploaded_bookmarks",
@@ -145,57 +250,59 @@ class Store:
                     body={"temp_bookmark_upload_queue": temp_bookmark_upload_queue},
                 )
 
-            temp_bookmark_update_queue = list(bookmark_update_queue)
+            offset, temp_bookmark_update_queue = bookmark_update_queue.snapshot()
             if temp_bookmark_update_queue:
-                for bookmark in temp_bookmark_update_queue:
-                    await asyncio.to_thread(
-                        self._client.update_bookmark,
-                        "bookmark",
-                        bookmark,
-                    )
-                bookmark_update_queue = self.initial_queue(
-                    queue=bookmark_update_queue,
-                    temp_queue=temp_bookmark_update_queue,
+                saved_calls = await asyncio.to_thread(
+                    self._client.batch_update_bookmarks,
+                    "bookmark",
+                    temp_bookmark_update_queue,
                 )
+                bookmark_update_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="updated_bookmarks",
                     type="content",
-                    description=f"{len(temp_bookmark_update_queue)}개 북마크 업데이트",
+                    description=(
+                        f"{len(temp_bookmark_update_queue)}개 북마크 업데이트 "
+                        f"(API 호출 {saved_calls}회 절약)"
+                    ),
                     body={"temp_bookmark_update_queue": temp_bookmark_update_queue},
                 )
 
-            temp_user_update_queue = list(user_update_queue)
+            offset, temp_user_update_queue = user_update_queue.snapshot()
             if temp_user_update_queue:
-                for values in temp_user_update_queue:
-                    await asyncio.to_thread(
-                        self._client.update_user,
-                        "users",
-                        values,
-                    )
-                user_update_queue = self.initial_queue(
-                    queue=user_update_queue,
-                    temp_queue=temp_user_update_queue,
+                saved_calls = await asyncio.to_thread(
+                    self._client.batch_update_users,
+                    "users",
+                    temp_user_update_queue,
                 )
+                user_update_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="updated_user_introduction",
                     type="user",
-                    description=f"{len(temp_user_update_queue)}개 유저 자기소개 업데이트",
+                    description=(
+                        f"{len(temp_user_update_queue)}개 유저 자기소개 업데이트 "
+                        f"(API 호출 {saved_calls}회 절약)"
+                    ),
                     body={"temp_user_update_queue": temp_user_update_queue},
                 )
 
-            temp_coffee_chat_proof_upload_queue = list(coffee_chat_proof_upload_queue)
+            offset, temp_coffee_chat_proof_upload_queue = (
+                coffee_chat_proof_upload_queue.snapshot()
+            )
             if temp_coffee_chat_proof_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "coffee_chat_proof",
                     temp_coffee_chat_proof_upload_queue,
+                    on_progress=_progress_committer(
+                        coffee_chat_proof_upload_queue,
+                        offset,
+                        len(temp_coffee_chat_proof_upload_queue),
+                    ),
                 )
-                coffee_chat_proof_upload_queue = self.initial_queue(
-                    queue=coffee_chat_proof_upload_queue,
-                    temp_queue=temp_coffee_chat_proof_upload_queue,
-                )
+                coffee_chat_proof_upload_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="uploaded_coffee_chat_proofs",
@@ -206,17 +313,21 @@ class Store:
                     },
                 )
 
-            temp_point_history_upload_queue = list(point_history_upload_queue)
+            offset, temp_point_history_upload_queue = (
+                point_history_upload_queue.snapshot()
+            )
             if temp_point_history_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "point_histories",
                     temp_point_history_upload_queue,
+                    on_progress=_progress_committer(
+                        point_history_upload_queue,
+                        offset,
+                        len(temp_point_history_upload_queue),
+                    ),
                 )
-                point_history_upload_queue = self.initial_queue(
-                    queue=point_history_upload_queue,
-                    temp_queue=temp_point_history_upload_queue,
-                )
+                point_history_upload_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="uploaded_point_histories",
@@ -227,17 +338,19 @@ class Store:
                     },
                 )
 
-            temp_paper_plane_upload_queue = list(paper_plane_upload_queue)
+            offset, temp_paper_plane_upload_queue = paper_plane_upload_queue.snapshot()
             if temp_paper_plane_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "paper_plane",
                     temp_paper_plane_upload_queue,
+                    on_progress=_progress_committer(
+                        paper_plane_upload_queue,
+                        offset,
+                        len(temp_paper_plane_upload_queue),
+                    ),
                 )
-                paper_plane_upload_queue = self.initial_queue(
-                    queue=paper_plane_upload_queue,
-                    temp_queue=temp_paper_plane_upload_queue,
-                )
+                paper_plane_upload_queue.commit(offset)
                 # log_event(
                 #     actor="system",
                 #     event="uploaded_paper_plane",
@@ -246,17 +359,21 @@ class Store:
                 #     body="",  # 종이 비행기는 로그에 내용을 포함하지 않는다.
                 # )
 
-            temp_subscription_upload_queue = list(subscription_upload_queue)
+            offset, temp_subscription_upload_queue = (
+                subscription_upload_queue.snapshot()
+            )
             if temp_subscription_upload_queue:
                 await asyncio.to_thread(
                     self._client.bulk_upload,
                     "subscriptions",
                     temp_subscription_upload_queue,
+                    on_progress=_progress_committer(
+                        subscription_upload_queue,
+                        offset,
+                        len(temp_subscription_upload_queue),
+                    ),
                 )
-                subscription_upload_queue = self.initial_queue(
-                    queue=subscription_upload_queue,
-                    temp_queue=temp_subscription_upload_queue,
-                )
+                subscription_upload_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="uploaded_subscription",
@@ -267,23 +384,24 @@ class Store:
                     },
                 )
 
-            temp_subscription_update_queue = list(subscription_update_queue)
+            offset, temp_subscription_update_queue = (
+                subscription_update_queue.snapshot()
+            )
             if temp_subscription_update_queue:
-                for subscription_dict in temp_subscription_update_queue:
-                    await asyncio.to_thread(
-                        self._client.update_subscription,
-                        "subscriptions",
-                        subscription_dict,
-                    )
-                subscription_update_queue = self.initial_queue(
-                    queue=subscription_update_queue,
-                    temp_queue=temp_subscription_update_queue,
+                saved_calls = await asyncio.to_thread(
+                    self._client.batch_update_subscriptions,
+                    "subscriptions",
+                    temp_subscription_update_queue,
                 )
+                subscription_update_queue.commit(offset)
                 log_event(
                     actor="system",
                     event="updated_subscriptions",
                     type="subscription",
-                    description=f"{len(temp_subscription_update_queue)}개 구독 내역 업데이트",
+                    description=(
+                        f"{len(temp_subscription_update_queue)}개 구독 내역 업데이트 "
+                        f"(API 호출 {saved_calls}회 절약)"
+                    ),
                     body={
                         "temp_subscription_update_queue": temp_subscription_update_queue
                     },
@@ -296,7 +414,3 @@ class Store:
     def initialize_logs(self) -> None:
         """로그를 초기화합니다."""
         open("store/logs.csv", "w").close()
-
-    def initial_queue(self, *, queue: list, temp_queue: list) -> list:
-        """queue 에서 temp_queue 를 제거한 값을 반환합니다."""
-        return [entry for entry in queue if entry not in temp_queue]
@@ -0,0 +1,686 @@
+import csv
+import io
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from typing import Generic, TextIO, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# store 테이블별 컬럼 목록 (CSV 헤더와 SQLite 스키마에 사용)
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "users": (
+        "user_id",
+        "name",
+        "channel_name",
+        "channel_id",
+        "intro",
+        "deposit",
+        "cohort",
+    ),
+    "contents": (
+        "user_id",
+        "username",
+        "title",
+        "content_url",
+        "dt",
+        "category",
+        "description",
+        "type",
+        "tags",
+        "curation_flag",
+        "ts",
+        "feedback_intensity",
+    ),
+    "bookmark": (
+        "user_id",
+        "content_user_id",
+        "content_ts",
+        "note",
+        "status",
+        "created_at",
+        "updated_at",
+    ),
+    "coffee_chat_proof": (
+        "ts",
+        "thread_ts",
+        "user_id",
+        "text",
+        "image_urls",
+        "selected_user_ids",
+        "participant_call_thread_ts",
+        "created_at",
+    ),
+    "point_histories": ("id", "user_id", "reason", "point", "category", "created_at"),
+    "paper_plane": (
+        "id",
+        "sender_id",
+        "sender_name",
+        "receiver_id",
+        "receiver_name",
+        "text",
+        "text_color",
+        "bg_color",
+        "color_label",
+        "created_at",
+    ),
+    "subscriptions": (
+        "id",
+        "user_id",
+        "target_user_id",
+        "target_user_channel",
+        "status",
+        "created_at",
+        "updated_at",
+    ),
+    "writing_participation": (
+        "user_id",
+        "name",
+        "created_at",
+        "is_writing_participation",
+    ),
+}
+
+# 테이블별로 해시 인덱스를 유지할 자연키 컬럼 목록
+TABLE_INDEXES: dict[str, tuple[str, ...]] = {
+    "users": ("user_id",),
+    "contents": ("user_id", "ts", "content_url"),
+    "bookmark": ("user_id", "content_ts"),
+    "coffee_chat_proof": ("ts", "thread_ts", "user_id"),
+    "point_histories": ("user_id",),
+    "paper_plane": ("sender_id", "receiver_id"),
+    "subscriptions": ("id", "user_id", "target_user_id"),
+    "writing_participation": ("user_id",),
+}
+
+
+class TableSnapshot:
+    """
+    특정 버전의 테이블 내용입니다.
+    발행된 뒤에는 바뀌지 않으므로 잠금 없이 읽을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        fieldnames: Iterable[str],
+        rows: list[dict[str, str]],
+        indexes: dict[str, dict[str, list[int]]],
+        size: int | None = None,
+    ) -> None:
+        self.version = version
+        self.fieldnames = tuple(fieldnames)
+        # rows, indexes 는 이후 append 로 뒤에 행이 붙을 수 있으므로 size 까지만 봅니다.
+        self._rows = rows
+        self._indexes = indexes
+        self._size = len(rows) if size is None else size
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        fieldnames: Iterable[str],
+        rows: list[dict[str, str]],
+        index_columns: Iterable[str],
+    ) -> "TableSnapshot":
+        """행 목록으로 인덱스를 만들어 스냅샷을 생성합니다."""
+        return cls(version, fieldnames, rows, build_indexes(rows, index_columns))
+
+    def all(self) -> list[dict[str, str]]:
+        return self._rows[: self._size]
+
+    def find(self, column: str, value: str) -> list[dict[str, str]]:
+        """인덱스가 없는 컬럼은 전체를 탐색합니다."""
+        if column in self._indexes:
+            return [
+                self._rows[i]
+                for i in self._indexes[column].get(value, ())
+                if i < self._size
+            ]
+        return [row for row in self.all() if row.get(column) == value]
+
+    def get(self, column: str, value: str) -> dict[str, str] | None:
+        rows = self.find(column, value)
+        return rows[0] if rows else None
+
+    def appended_since(self, other: "TableSnapshot") -> list[dict[str, str]] | None:
+        """
+        other 이후 뒤에 추가만 된 스냅샷이라면 추가된 행을 반환합니다.
+        행이 수정되거나 테이블 전체가 바뀌었다면 None 을 반환합니다.
+        """
+        if self._rows is not other._rows or self._size < other._size:
+            return None
+        return self._rows[other._size : self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def build_indexes(
+    rows: list[dict[str, str]], index_columns: Iterable[str]
+) -> dict[str, dict[str, list[int]]]:
+    """컬럼 값 -> 행 위치 목록 형태의 해시 인덱스를 만듭니다."""
+    indexes: dict[str, dict[str, list[int]]] = {column: {} for column in index_columns}
+    for position, row in enumerate(rows):
+        for column, index in indexes.items():
+            index.setdefault(row.get(column, ""), []).append(position)
+    return indexes
+
+
+class Table(ABC):
+    """store 테이블 저장소 인터페이스입니다. 조회 결과로 받은 행은 수정하지 않아야 합니다."""
+
+    fieldnames: list[str]
+
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """테이블 내용이 바뀔 때마다 증가하는 버전입니다."""
+        ...
+
+    @abstractmethod
+    def snapshot(self) -> TableSnapshot:
+        """현재 버전의 스냅샷을 반환합니다."""
+        ...
+
+    @abstractmethod
+    def append(self, values: list[str] | dict[str, str]) -> None:
+        """행을 추가합니다. 리스트는 컬럼 순서대로 값을 담습니다."""
+        ...
+
+    @abstractmethod
+    def update(self, column: str, value: str, changes: dict[str, str]) -> int:
+        """컬럼 값이 일치하는 행들을 수정하고 수정한 행 수를 반환합니다."""
+        ...
+
+    @abstractmethod
+    def replace(self, values: list[list[str]]) -> None:
+        """헤더를 포함한 값으로 테이블 전체를 교체합니다."""
+        ...
+
+    @abstractmethod
+    def csv_source(self) -> str | io.BytesIO:
+        """pandas/polars 의 read_csv 에 그대로 넘길 수 있는 CSV 원본을 반환합니다."""
+        ...
+
+    def all(self) -> list[dict[str, str]]:
+        """모든 행을 저장된 순서대로 반환합니다."""
+        return self.snapshot().all()
+
+    def find(self, column: str, value: str) -> list[dict[str, str]]:
+        """컬럼 값이 일치하는 행을 반환합니다."""
+        return self.snapshot().find(column, value)
+
+    def get(self, column: str, value: str) -> dict[str, str] | None:
+        """컬럼 값이 일치하는 첫 번째 행을 반환합니다."""
+        return self.snapshot().get(column, value)
+
+    def values(self) -> list[list[str]]:
+        """헤더를 포함한 모든 값을 반환합니다."""
+        snapshot = self.snapshot()
+        return [list(snapshot.fieldnames)] + [
+            [row.get(column, "") for column in snapshot.fieldnames]
+            for row in snapshot.all()
+        ]
+
+
+class CsvTable(Table):
+    """
+    CSV 파일 하나를 메모리에 올려두고 자연키 해시 인덱스로 조회하는 테이블입니다.
+    - 파일은 처음 조회할 때 한 번만 파싱합니다.
+    - 쓰기는 CSV 와 메모리에 동시에 반영하고, 새 버전의 스냅샷을 발행합니다.
+    - 파일 전체를 다시 쓸 때는 임시 파일에 쓰고 fsync 한 뒤 이름을 바꿔 교체합니다.
+    - 다른 곳에서 파일을 덮어쓴 경우(시트 동기화 등) stat 정보가 바뀌므로 다시 읽어옵니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index_columns: Iterable[str] = (),
+        columns: Iterable[str] = (),
+    ) -> None:
+        self.path = path
+        self.index_columns = tuple(index_columns)
+        self.columns = tuple(columns)
+        self.fieldnames = list(self.columns)
+        self._rows: list[dict[str, str]] = []
+        self._indexes: dict[str, dict[str, list[int]]] = {}
+        self._snapshot: TableSnapshot | None = None
+        self._version = 0
+        self._signature: tuple[int, int, int] | None = None
+        self._header_matches = True
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def snapshot(self) -> TableSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_current():
+            return snapshot
+        with self._lock:
+            self._ensure_loaded()
+            return self._snapshot  # type: ignore[return-value]
+
+    def append(self, values: list[str] | dict[str, str]) -> None:
+        """행을 CSV 끝에 추가하고 메모리에도 반영합니다."""
+        with self._lock:
+            self._ensure_loaded()
+            row = (
+                dict(values)
+                if isinstance(values, dict)
+                else dict(zip(self.fieldnames, values))
+            )
+            if self._signature is None or not self._header_matches:
+                # 파일이 없거나 헤더에 누락된 컬럼이 있으면 전체를 다시 씁니다.
+                self._rows = self._rows + [row]
+                self._indexes = build_indexes(self._rows, self.index_columns)
+                self._rewrite()
+                return
+
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=self.fieldnames, quoting=csv.QUOTE_ALL
+                )
+                writer.writerow(row)
+            # 이전 스냅샷은 자기 size 까지만 보므로 목록과 인덱스를 그대로 이어 씁니다.
+            self._rows.append(row)
+            for column, index in self._indexes.items():
+                index.setdefault(row.get(column, ""), []).append(len(self._rows) - 1)
+            self._signature = self._stat()
+            self._publish()
+
+    def update(self, column: str, value: str, changes: dict[str, str]) -> int:
+        """일치하는 행들을 수정하고 CSV 를 다시 씁니다."""
+        with self._lock:
+            self._ensure_loaded()
+            snapshot = self._snapshot
+            assert snapshot is not None
+            targets = {id(row) for row in snapshot.find(column, value)}
+            if not targets:
+                return 0
+
+            # 발행된 스냅샷의 행은 바꾸지 않고 새 행 목록을 만듭니다.
+            self._rows = [
+                {**row, **changes} if id(row) in targets else row for row in self._rows
+            ]
+            if any(c in self._indexes for c in changes):
+                self._indexes = build_indexes(self._rows, self.index_columns)
+            self._rewrite()
+            return len(targets)
+
+    def replace(self, values: list[list[str]]) -> None:
+        """시트에서 받아온 값으로 CSV 를 교체합니다."""
+        with self._lock:
+            self._write_atomically(
+                lambda f: csv.writer(f, quoting=csv.QUOTE_ALL).writerows(values)
+            )
+            header = list(values[0]) if values else []
+            self._rows = [dict(zip(header, row)) for row in values[1:]]
+            self.fieldnames = header + [c for c in self.columns if c not in header]
+            self._header_matches = self.fieldnames == header
+            self._indexes = build_indexes(self._rows, self.index_columns)
+            self._signature = self._stat()
+            self._publish()
+
+    def csv_source(self) -> str:
+        return self.path
+
+    def invalidate(self) -> None:
+        """메모리에 올려둔 데이터를 버리고 다음 조회 때 다시 읽도록 합니다."""
+        with self._lock:
+            self._snapshot = None
+            self._signature = None
+            self._rows = []
+            self._indexes = {}
+
+    def _is_current(self) -> bool:
+        try:
+            return self._stat() == self._signature
+        except FileNotFoundError:
+            return self._signature is None
+
+    def _ensure_loaded(self) -> None:
+        try:
+            signature = self._stat()
+        except FileNotFoundError:
+            if not self.columns:
+                raise
+            if self._snapshot is not None and self._signature is None:
+                return
+            # 컬럼을 알고 있는 테이블은 파일이 없으면 빈 테이블로 취급합니다.
+            self._rows = []
+            self.fieldnames = list(self.columns)
+            self._indexes = build_indexes(self._rows, self.index_columns)
+            self._signature = None
+            self._publish()
+            return
+
+        if self._snapshot is not None and signature == self._signature:
+            return
+
+        with open(self.path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            self._rows = [dict(row) for row in reader]
+            header = list(reader.fieldnames or [])
+        self.fieldnames = header + [c for c in self.columns if c not in header]
+        self._header_matches = self.fieldnames == header
+        self._indexes = build_indexes(self._rows, self.index_columns)
+        self._signature = signature
+        self._publish()
+
+    def _publish(self) -> None:
+        self._version += 1
+        self._snapshot = TableSnapshot(
+            self._version, self.fieldnames, self._rows, self._indexes, len(self._rows)
+        )
+
+    def _rewrite(self) -> None:
+        rows = self._rows
+        fieldnames = self.fieldnames
+
+        def write(f: TextIO) -> None:
+            writer = csv.DictWriter(
+                f, fieldnames=fieldnames, restval="", quoting=csv.QUOTE_ALL
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+
+        self._write_atomically(write)
+        self._header_matches = True
+        self._signature = self._stat()
+        self._publish()
+
+    def _write_atomically(self, write: Callable[[TextIO], object]) -> None:
+        """임시 파일에 쓰고 fsync 한 뒤 원래 파일과 교체합니다."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _stat(self) -> tuple[int, int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class SqliteDatabase:
+    """store 테이블을 담는 SQLite(WAL) 데이터베이스입니다."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for name, columns in TABLE_COLUMNS.items():
+            definition = ", ".join(f"\"{c}\" TEXT NOT NULL DEFAULT ''" for c in columns)
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{name}" ({definition})')
+            for column in TABLE_INDEXES.get(name, ()):
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{name}_{column}" '
+                    f'ON "{name}" ("{column}")'
+                )
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class SqliteTable(Table):
+    """
+    SQLite 테이블 하나를 감싸는 테이블입니다. 수정은 해당 행만 갱신합니다.
+    스냅샷 이후 행이 추가되기만 했다면 추가된 행만 이어 붙여 새 스냅샷을 만듭니다.
+    """
+
+    def __init__(self, database: SqliteDatabase, name: str) -> None:
+        self._db = database
+        self.name = name
+        self.fieldnames = list(TABLE_COLUMNS[name])
+        self._select = (
+            "SELECT " + ", ".join(f'"{c}"' for c in self.fieldnames) + f' FROM "{name}"'
+        )
+        self._version = 0
+        self._snapshot: TableSnapshot | None = None
+        # 스냅샷 이후 추가한 행. 수정이나 교체가 있었다면 None 입니다.
+        self._appended: list[dict[str, str]] | None = []
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self) -> TableSnapshot:
+        """버전이 바뀌지 않았다면 이전에 만든 스냅샷을 재사용합니다."""
+        with self._db.lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+            if snapshot is not None and self._appended is not None:
+                # 이전 스냅샷은 자기 size 까지만 보므로 행 목록과 인덱스를 그대로 이어 씁니다.
+                rows, indexes = snapshot._rows, snapshot._indexes
+                for row in self._appended:
+                    rows.append(row)
+                    for column, index in indexes.items():
+                        index.setdefault(row.get(column, ""), []).append(len(rows) - 1)
+                self._snapshot = TableSnapshot(
+                    self._version, self.fieldnames, rows, indexes, len(rows)
+                )
+            else:
+                self._snapshot = TableSnapshot.build(
+                    self._version,
+                    self.fieldnames,
+                    self._select_all(),
+                    TABLE_INDEXES.get(self.name, ()),
+                )
+            self._appended = []
+            return self._snapshot
+
+    def all(self) -> list[dict[str, str]]:
+        return self._select_all()
+
+    def get(self, column: str, value: str) -> dict[str, str] | None:
+        rows = self.find(column, value)
+        return rows[0] if rows else None
+
+    def find(self, column: str, value: str) -> list[dict[str, str]]:
+        self._check_column(column)
+        with self._db.lock:
+            cursor = self._db.conn.execute(
+                f'{self._select} WHERE "{column}" = ? ORDER BY rowid', (value,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def append(self, values: list[str] | dict[str, str]) -> None:
+        row = values if isinstance(values, dict) else dict(zip(self.fieldnames, values))
+        with self._db.lock:
+            self._insert([row])
+            if self._appended is not None:
+                self._appended.append({c: row.get(c, "") for c in self.fieldnames})
+
+    def update(self, column: str, value: str, changes: dict[str, str]) -> int:
+        self._check_column(column)
+        changes = {c: v for c, v in changes.items() if c in self.fieldnames}
+        if not changes:
+            return 0
+        assignments = ", ".join(f'"{c}" = ?' for c in changes)
+        with self._db.lock:
+            cursor = self._db.conn.execute(
+                f'UPDATE "{self.name}" SET {assignments} WHERE "{column}" = ?',
+                (*changes.values(), value),
+            )
+            if cursor.rowcount:
+                self._version += 1
+                self._appended = None
+            return cursor.rowcount
+
+    def replace(self, values: list[list[str]]) -> None:
+        if not values:
+            header, rows = [], []
+        else:
+            header, rows = values[0], values[1:]
+        with self._db.lock:
+            self._db.conn.execute("BEGIN")
+            try:
+                self._db.conn.execute(f'DELETE FROM "{self.name}"')
+                self._insert(
+                    [dict(zip(header, row)) for row in rows], transaction=False
+                )
+                self._db.conn.execute("COMMIT")
+            except Exception:
+                self._db.conn.execute("ROLLBACK")
+                raise
+            self._version += 1
+            self._appended = None
+
+    def csv_source(self) -> io.BytesIO:
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(self.values())
+        return io.BytesIO(buffer.getvalue().encode("utf-8"))
+
+    def _insert(self, rows: list[dict[str, str]], transaction: bool = True) -> None:
+        columns = ", ".join(f'"{c}"' for c in self.fieldnames)
+        placeholders = ", ".join("?" for _ in self.fieldnames)
+        params = [tuple(row.get(c, "") for c in self.fieldnames) for row in rows]
+        with self._db.lock:
+            if transaction:
+                self._db.conn.execute("BEGIN")
+            try:
+                self._db.conn.executemany(
+                    f'INSERT INTO "{self.name}" ({columns}) VALUES ({placeholders})',
+                    params,
+                )
+                if transaction:
+                    self._db.conn.execute("COMMIT")
+            except Exception:
+                if transaction:
+                    self._db.conn.execute("ROLLBACK")
+                raise
+            self._version += 1
+
+    def _select_all(self) -> list[dict[str, str]]:
+        with self._db.lock:
+            cursor = self._db.conn.execute(f"{self._select} ORDER BY rowid")
+            return [dict(row) for row in cursor.fetchall()]
+
+    def _check_column(self, column: str) -> None:
+        if column not in self.fieldnames:
+            raise KeyError(f"{self.name} 테이블에 {column} 컬럼이 없습니다.")
+
+
+class TableCache:
+    """
+    프로세스 전역에서 공유하는 store 테이블 모음입니다.
+    settings.STORE_BACKEND 에 따라 CSV 또는 SQLite 테이블을 반환합니다.
+    """
+
+    def __init__(self, base_dir: str = "store") -> None:
+        self._base_dir = base_dir
+        self._tables: dict[str, Table] = {}
+        self._databases: dict[str, SqliteDatabase] = {}
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> Table:
+        """테이블을 반환합니다. 작업 디렉터리별로 캐시를 분리합니다."""
+        if settings.STORE_BACKEND == "sqlite" and name in TABLE_COLUMNS:
+            path = os.path.abspath(settings.SQLITE_PATH)
+            key = f"{path}:{name}"
+        else:
+            path = os.path.abspath(os.path.join(self._base_dir, f"{name}.csv"))
+            key = path
+
+        with self._lock:
+            if key not in self._tables:
+                if settings.STORE_BACKEND == "sqlite" and name in TABLE_COLUMNS:
+                    self._tables[key] = SqliteTable(self._database(path), name)
+                else:
+                    self._tables[key] = CsvTable(
+                        path, TABLE_INDEXES.get(name, ()), TABLE_COLUMNS.get(name, ())
+                    )
+            return self._tables[key]
+
+    def clear(self) -> None:
+        """모든 테이블 캐시를 비웁니다."""
+        with self._lock:
+            self._tables.clear()
+            for database in self._databases.values():
+                database.close()
+            self._databases.clear()
+
+    def _database(self, path: str) -> SqliteDatabase:
+        if path not in self._databases:
+            self._databases[path] = SqliteDatabase(path)
+        return self._databases[path]
+
+
+table_cache = TableCache()
+
+
+class TableView(Generic[T]):
+    """
+    테이블 스냅샷으로 만든 파생 데이터(집합, 집계 등)입니다.
+    테이블에 쓰거나 시트에서 다시 받아와 스냅샷이 바뀌면 다음 조회 때 다시 만듭니다.
+    apply 가 있으면 행이 뒤에 추가되기만 한 경우 추가된 행만 반영합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[TableSnapshot], T],
+        apply: Callable[[T, list[dict[str, str]]], T] | None = None,
+    ) -> None:
+        self.name = name
+        self._build = build
+        self._apply = apply
+        self._source: TableSnapshot | None = None
+        self._value: T | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        snapshot = table_cache.table(self.name).snapshot()
+        with self._lock:
+            if snapshot is not self._source:
+                appended = (
+                    snapshot.appended_since(self._source)
+                    if self._apply and self._source is not None
+                    else None
+                )
+                if appended is None:
+                    self._value = self._build(snapshot)
+                else:
+                    self._value = self._apply(self._value, appended)  # type: ignore
+                self._source = snapshot
+            return self._value  # type: ignore[return-value]
+
+    def invalidate(self) -> None:
+        """다음 조회 때 파생 데이터를 처음부터 다시 만들도록 합니다."""
+        with self._lock:
+            self._source = None
+            self._value = None
+
+
+def import_csv_to_sqlite(
+    base_dir: str = "store", db_path: str | None = None
+) -> dict[str, int]:
+    """store 의 CSV 파일들을 SQLite 로 옮기고 테이블별 행 수를 반환합니다."""
+    database = SqliteDatabase(os.path.abspath(db_path or settings.SQLITE_PATH))
+    counts = {}
+    try:
+        for name in TABLE_COLUMNS:
+            path = os.path.join(base_dir, f"{name}.csv")
+            if not os.path.exists(path):
+                continue
+            with open(path, newline="", encoding="utf-8") as f:
+                values = list(csv.reader(f))
+            SqliteTable(database, name).replace(values)
+            counts[name] = max(len(values) - 1, 0)
+    finally:
+        database.close()
+    return counts
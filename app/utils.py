@@ -1,4 +1,3 @@
-import csv
 import random
 import string
 from typing import Any
@@ -10,6 +9,8 @@ from zoneinfo import ZoneInfo
 
 import googletrans
 
+from app.tables import table_cache
+
 
 def tz_now(tz: str = "Asia/Seoul") -> datetime.datetime:
     """현재시간 반환합니다."""
@@ -68,9 +69,9 @@ def slack_link_to_markdown(text):
 
 def convert_user_id_to_name(message: str) -> str:
     """슬랙 메시지에서 user_id를 name으로 변경합니다."""
-    with open("store/users.csv") as f:
-        reader = csv.DictReader(f)
-        user_dict = {row["user_id"]: row["name"] for row in reader}
+    user_dict = {
+        row["user_id"]: row["name"] for row in table_cache.table("users").all()
+    }
 
     user_ids = re.findall("<@([A-Z0-9]+)>", message)
 
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+서버 시작 비용을 모듈별로 측정합니다.
+
+사용법: python scripts/benchmark_startup.py [반복 횟수]
+- import: 새 파이썬 프로세스에서 app 을 import 할 때 모듈별 누적 import 시간 (-X importtime)
+- boot: app 을 import 하고 헬스 체크(/) 요청에 처음 응답하기까지 걸린 시간
+헬스 체크 경로에서 필요 없는 무거운 라이브러리가 불러와졌다면 함께 표시합니다.
+각 항목은 반복 측정한 값의 중앙값입니다.
+"""
+
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+MODULES = [
+    "app.config",
+    "app.client",
+    "app.bigquery.client",
+    "app.store",
+    "app.slack.event_handler",
+    "app",
+]
+
+# 헬스 체크 경로에서는 필요 없는 라이브러리
+HEAVY_LIBRARIES = [
+    "pandas",
+    "polars",
+    "pyarrow",
+    "gspread",
+    "oauth2client",
+    "google.cloud.bigquery",
+    "pandas_gbq",
+]
+
+BOOT_CODE = """
+import time
+started = time.perf_counter()
+import app
+from fastapi.testclient import TestClient
+TestClient(app.app).get("/")
+print(time.perf_counter() - started)
+"""
+
+
+def measure_imports() -> dict[str, float]:
+    """app 을 import 하고 모듈별 누적 import 시간(초)을 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total) / 1_000_000
+    return cumulative
+
+
+def measure_boot() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT_CODE], capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str]) -> None:
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+
+    imports: dict[str, list[float]] = defaultdict(list)
+    for _ in range(repeat):
+        for name, seconds in measure_imports().items():
+            imports[name].append(seconds)
+
+    print(f"{'module':<28}{'import (s)':>12}")
+    for name in MODULES + HEAVY_LIBRARIES:
+        if name in imports:
+            print(f"{name:<28}{statistics.median(imports[name]):>12.3f}")
+        elif name in HEAVY_LIBRARIES:
+            print(f"{name:<28}{'not loaded':>12}")
+
+    boot = statistics.median(measure_boot() for _ in range(repeat))
+    print()
+    print(f"health check ready in {boot:.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
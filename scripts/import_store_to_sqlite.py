@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""
+store 디렉터리의 CSV 파일들을 SQLite 데이터베이스로 옮깁니다.
+
+사용법: python scripts/import_store_to_sqlite.py [store 경로] [db 경로]
+옮긴 뒤 .env 에 STORE_BACKEND=sqlite 를 설정하면 SQLite 저장소를 사용합니다.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv: list[str]) -> None:
+    # scripts/ 에서 실행해도 app 패키지를 찾을 수 있도록 저장소 루트를 추가합니다.
+    sys.path.insert(0, ROOT_DIR)
+    from app.tables import import_csv_to_sqlite
+
+    base_dir = argv[1] if len(argv) > 1 else "store"
+    db_path = argv[2] if len(argv) > 2 else None
+    counts = import_csv_to_sqlite(base_dir, db_path)
+    for name, count in counts.items():
+        print(f"{name}: {count} rows")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -15,10 +15,9 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-# app.client 의 SpreadSheetClient 는 default argument 로 gc.open_by_url(...) 을 호출한다.
-# 즉 app 을 import 만 해도 import 시점에 Google Sheets 네트워크 호출이 일어난다.
-# 테스트는 외부 의존성을 모두 mock 하므로, gspread 도 import 전에 mock 으로 차단해서
-# CI 환경(더미 크리덴셜) 에서도 안전하게 import 되도록 한다.
+# SpreadSheetClient 를 시트 없이 만들면 처음 한 번 gspread 인증과 open_by_url(...) 을 호출한다.
+# 테스트는 외부 의존성을 모두 mock 하므로, 실수로 만들더라도 네트워크 호출이 일어나지 않도록
+# gspread 인증을 mock 으로 차단해서 CI 환경(더미 크리덴셜) 에서도 안전하게 동작하도록 한다.
 import gspread
 
 gspread.authorize = MagicMock(return_value=MagicMock())  # type: ignore[assignment]
@@ -178,6 +177,18 @@ _STORE_FILES: dict[str, list[str]] = {
 }
 
 
+@pytest.fixture(autouse=True)
+def _isolate_spool_dir(tmp_path, monkeypatch) -> None:
+    """
+    업로드 큐가 append 할 때 쓰는 디스크 스풀을 실제 store/ 대신 임시 디렉터리에 둔다.
+    테스트마다 빈 디렉터리를 써서 스풀 파일과 커밋 오프셋이 다른 테스트로 넘어가지 않는다.
+    """
+    from app.config import settings
+
+    spool_dir = tmp_path / "spool"
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(spool_dir))
+
+
 @pytest.fixture(autouse=True, scope="session")
 def _ensure_store_csv_skeleton() -> None:
     """`tmp_store` 픽스처를 쓰지 않는 테스트들이 `User.is_writing_participation` 같은 property 를
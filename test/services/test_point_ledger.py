@@ -0,0 +1,88 @@
+"""유저별 포인트 합계(원장) 테스트.
+
+대상: app/slack/repositories.py (get_point_balance), app/models.py (PointBalance),
+      app/slack/services/point.py
+- 포인트를 추가하면 추가된 행만 반영해 합계와 최근 내역을 유지하는지
+- 최근 내역은 정해진 개수만 남기고 합계는 전체 내역 기준인지
+- 행이 생성일시 순서가 아니어도 생성일시가 늦은 내역을 최근 내역으로 남기는지
+- 전체 내역이 필요하면(full_history) 테이블 전체를 읽는지
+"""
+
+from pytest_mock import MockerFixture
+
+from app import models
+from app.constants import RECENT_POINT_HISTORY_COUNT
+from app.slack.repositories import SlackRepository
+from app.slack.services.point import PointService
+from test import factories
+
+
+def _history(point: int, created_at: str, user_id: str = "U_A") -> models.PointHistory:
+    return factories.make_point_history(
+        user_id=user_id, point=point, created_at=created_at
+    )
+
+
+def test_balance_follows_appended_points(tmp_store) -> None:
+    """✅ 포인트를 추가할 때마다 테이블 전체를 다시 읽지 않고 합계와 최근 내역에 반영한다."""
+    repo = SlackRepository()
+    repo.add_point(_history(100, "2024-11-01 12:00:00"))
+    repo.add_point(_history(50, "2024-11-02 12:00:00", user_id="U_B"))
+    balance = repo.get_point_balance("U_A")
+
+    repo.add_point(_history(10, "2024-11-03 12:00:00"))
+
+    assert repo.get_point_balance("U_A") is balance
+    assert balance.total_point == 110
+    assert [h.point for h in balance.recent_histories()] == [10, 100]
+    assert repo.get_point_balance("U_B").total_point == 50
+    assert repo.get_point_balance("U_없음").total_point == 0
+
+
+def test_recent_histories_are_bounded(tmp_store) -> None:
+    """🌀 최근 내역은 정해진 개수만 남기지만 합계는 전체 내역으로 계산한다."""
+    repo = SlackRepository()
+    count = RECENT_POINT_HISTORY_COUNT + 5
+    for day in range(1, count + 1):
+        repo.add_point(_history(day, f"2024-10-{day:02d} 12:00:00"))
+
+    balance = repo.get_point_balance("U_A")
+
+    assert balance.total_point == sum(range(1, count + 1))
+    recent = balance.recent_histories()
+    assert len(recent) == RECENT_POINT_HISTORY_COUNT
+    assert recent[0].point == count
+    assert recent[-1].point == 6
+
+
+def test_recent_histories_follow_created_at_not_row_order(tmp_store) -> None:
+    """⚠️ 시트에서 받아온 행이 생성일시 순서가 아니어도 가장 최근 내역을 남긴다."""
+    repo = SlackRepository()
+    count = RECENT_POINT_HISTORY_COUNT + 5
+    for day in reversed(range(1, count + 1)):  # 최신 내역부터 기록된 시트
+        repo.add_point(_history(day, f"2024-10-{day:02d} 12:00:00"))
+
+    recent = repo.get_point_balance("U_A").recent_histories()
+
+    assert [h.point for h in recent] == list(range(count, 5, -1))
+
+
+def test_get_user_point_uses_ledger_unless_full_history(
+    tmp_store, mocker: MockerFixture
+) -> None:
+    """✅ 기본은 원장의 합계와 최근 내역을 쓰고, full_history 이면 전체 내역을 읽는다."""
+    repo = SlackRepository()
+    mocker.patch.object(
+        repo, "get_user", return_value=factories.make_user(user_id="U_A")
+    )
+    count = RECENT_POINT_HISTORY_COUNT + 1
+    for day in range(1, count + 1):
+        repo.add_point(_history(10, f"2024-10-{day:02d} 12:00:00"))
+    service = PointService(repo)
+
+    user_point = service.get_user_point("U_A")
+    full = service.get_user_point("U_A", full_history=True)
+
+    assert user_point.total_point == full.total_point == 10 * count
+    assert len(user_point.point_histories) == RECENT_POINT_HISTORY_COUNT
+    assert len(full.point_histories) == count
@@ -0,0 +1,77 @@
+"""회차 달력 테스트.
+
+대상: app/rounds.py, app/models.py
+- RoundCalendar.round_of: 마감일 당일은 그 회차, 다음 날부터 다음 회차, 마지막 마감일 이후는 None
+- Content.round: 달력(DUE_DATES)이나 dt 가 바뀌면 다시 계산
+- User.get_submit_status: 회차마다 마지막 콘텐츠로 제출/패스/미제출 판단
+"""
+
+import datetime
+
+from pytest_mock import MockerFixture
+
+from app.rounds import RoundCalendar
+from test import factories
+
+DUE_DATES = [
+    datetime.date(2024, 9, 29),  # 0회차 (시작일)
+    datetime.date(2024, 10, 13),  # 1회차
+    datetime.date(2024, 10, 27),  # 2회차
+    datetime.date(2024, 11, 10),  # 3회차 (현재 회차)
+]
+
+
+def _linear_round(date: datetime.date) -> int | None:
+    for i, due_date in enumerate(DUE_DATES):
+        if date <= due_date:
+            return i
+    return None
+
+
+def test_round_of_matches_linear_scan() -> None:
+    """✅ 모든 날짜에서 기존 선형 탐색과 같은 회차를 반환한다."""
+    calendar = RoundCalendar(DUE_DATES)
+    start = datetime.date(2024, 9, 20)
+
+    for days in range(60):
+        date = start + datetime.timedelta(days=days)
+        assert calendar.round_of(date) == _linear_round(date)
+
+    assert calendar.round_of(datetime.date(2024, 10, 13)) == 1
+    assert calendar.round_of(datetime.date(2024, 10, 14)) == 2
+    assert calendar.round_of(datetime.date(2024, 11, 11)) is None
+
+
+def test_content_round_follows_patched_due_dates(mocker: MockerFixture) -> None:
+    """🌀 DUE_DATES 를 바꾸거나 dt 가 바뀌면 캐시한 회차를 다시 계산한다."""
+    content = factories.make_content(dt="2024-10-20 12:00:00")
+    mocker.patch("app.models.DUE_DATES", DUE_DATES)
+    assert content.round == 2
+
+    mocker.patch("app.models.DUE_DATES", DUE_DATES[:2] + [datetime.date(2024, 10, 20)])
+    assert content.round == 2
+    content.dt = "2024-10-10 12:00:00"
+    assert content.round == 1
+    content.dt = "2025-01-01 12:00:00"
+    assert content.round is None
+
+
+def test_submit_status_uses_last_content_per_round(mocker: MockerFixture) -> None:
+    """✅ 지난 회차마다 마지막 콘텐츠로 판단하고, 현재 회차와 0회차는 제외한다."""
+    mocker.patch("app.models.DUE_DATES", DUE_DATES)
+    mocker.patch(
+        "app.models.tz_now",
+        return_value=datetime.datetime(2024, 11, 1, tzinfo=datetime.UTC),
+    )
+    user = factories.make_user(
+        contents=[
+            factories.make_content(ts="1", type="submit", dt="2024-09-28 12:00:00"),
+            factories.make_content(ts="2", type="pass", dt="2024-10-01 12:00:00"),
+            factories.make_content(ts="3", type="submit", dt="2024-10-13 23:00:00"),
+            factories.make_content(ts="4", type="submit", dt="2024-11-01 12:00:00"),
+        ]
+    )
+
+    assert user.get_submit_status() == {1: "제출", 2: "미제출"}
+    assert user.get_due_date() == (3, datetime.date(2024, 11, 10))
+    assert user.is_submit
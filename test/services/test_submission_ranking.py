@@ -0,0 +1,147 @@
+"""코어채널 제출 순위 테스트.
+
+대상: app/models.py (RoundSubmissions, get_round_submitters), app/slack/services/point.py
+- 회차별로 처음 제출한 순서만 남기고, 패스와 같은 회차의 추가 제출은 순서를 바꾸지 않는지
+- 채널 유저들의 콘텐츠를 불러오지 않고 같은 채널 안에서 제출 순위를 매기는지
+- 코어채널 순위에는 글쓰기 참여 유저도 포함하고, 글쓰기 채널 순위는 글쓰기 참여 유저끼리 매기는지
+"""
+
+import datetime
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app import models
+from app.slack.repositories import SlackRepository
+from app.slack.services.point import PointMap, PointService
+from app.tables import table_cache
+from test import factories
+
+DUE_DATES = [
+    datetime.date(2024, 11, 10),  # 0회차 (시작일)
+    datetime.date(2024, 11, 24),  # 1회차
+    datetime.date(2024, 12, 8),  # 2회차 (현재 회차)
+]
+NOW = datetime.datetime(2024, 11, 30, 15, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def calendar(mocker: MockerFixture) -> None:
+    mocker.patch("app.models.DUE_DATES", DUE_DATES)
+    mocker.patch("app.models.tz_now", return_value=NOW)
+    mocker.patch("app.slack.services.point.tz_now", return_value=NOW)
+    mocker.patch("app.slack.services.point.store")
+
+
+def _submit(user_id: str, ts: str, dt: str, type: str = "submit") -> None:
+    content = factories.make_content(user_id=user_id, ts=ts, dt=dt, type=type)
+    table_cache.table("contents").append(content.to_list_for_csv())
+
+
+def _users(csv_writer_helper, tmp_store, users: list[models.User]) -> None:
+    csv_writer_helper(
+        tmp_store / "users.csv",
+        list(users[0].model_dump()),
+        [user.model_dump() for user in users],
+    )
+
+
+def test_round_submitters_keep_first_submission_order(tmp_store) -> None:
+    """✅ 회차마다 처음 제출한 순서대로 담고, 패스나 같은 회차의 추가 제출은 무시한다."""
+    _submit("U_A", "1.3", "2024-11-20 12:00:00")  # 1회차
+    _submit("U_B", "1.2", "2024-11-26 12:00:00")
+    _submit("U_C", "1.1", "2024-11-25 12:00:00", type="pass")
+    _submit("U_A", "1.4", "2024-11-27 12:00:00")
+    _submit("U_B", "1.5", "2024-11-28 12:00:00")  # 추가 제출
+    submitters = models.get_round_submitters(2)
+
+    _submit("U_C", "1.6", "2024-11-29 12:00:00")
+
+    assert models.get_round_submitters(1) == ["U_A"]
+    assert submitters == ["U_B", "U_A"]
+    assert models.get_round_submitters(2) == ["U_B", "U_A", "U_C"]
+
+
+def test_ranking_counts_only_same_channel_submitters(
+    tmp_store, csv_writer_helper, mocker: MockerFixture
+) -> None:
+    """✅ 다른 채널 유저는 건너뛰고 같은 채널에서 세 번째로 제출하면 3등 포인트를 지급한다."""
+    _users(
+        csv_writer_helper,
+        tmp_store,
+        [
+            factories.make_user(user_id="U_A", channel_id="C_1"),
+            factories.make_user(user_id="U_B", channel_id="C_2"),
+            factories.make_user(user_id="U_C", channel_id="C_1"),
+            factories.make_user(user_id="U_D", channel_id="C_1"),
+            factories.make_user(user_id="U_E", channel_id="C_1"),
+        ],
+    )
+    for i, user_id in enumerate(["U_A", "U_B", "U_C", "U_D", "U_E"]):
+        _submit(user_id, f"1.{i}", f"2024-11-2{5 + i // 3} 12:00:00")
+    repo = SlackRepository()
+    fetch_contents = mocker.spy(repo, "_fetch_contents")
+    service = PointService(repo)
+
+    message = service.grant_if_post_submitted_to_core_channel_ranking("U_D")
+
+    assert message is not None
+    assert PointMap.글_제출_코어채널_3등.reason in message
+    assert service.grant_if_post_submitted_to_core_channel_ranking("U_E") is None
+    fetch_contents.assert_not_called()  # 채널 유저들의 콘텐츠를 불러오지 않는다.
+
+
+def test_core_channel_ranking_includes_writing_participants(
+    tmp_store, csv_writer_helper
+) -> None:
+    """🌀 글쓰기 참여 유저도 코어채널 순위에 들어가고, 글쓰기 채널에서는 참여 유저끼리 겨룬다."""
+    _users(
+        csv_writer_helper,
+        tmp_store,
+        [
+            factories.make_user(user_id="U_W", channel_id="C_1"),
+            factories.make_user(user_id="U_A", channel_id="C_1"),
+        ],
+    )
+    csv_writer_helper(
+        tmp_store / "writing_participation.csv",
+        ["user_id", "name", "created_at", "is_writing_participation"],
+        [
+            {
+                "user_id": "U_W",
+                "name": "글쓰기 참여자",
+                "created_at": "2024-11-01 09:00:00",
+                "is_writing_participation": "True",
+            }
+        ],
+    )
+    _submit("U_W", "1.0", "2024-11-25 12:00:00")
+    _submit("U_A", "1.1", "2024-11-26 12:00:00")
+    service = PointService(SlackRepository())
+
+    core_message = service.grant_if_post_submitted_to_core_channel_ranking("U_A")
+    writing_message = service.grant_if_post_submitted_to_core_channel_ranking("U_W")
+
+    assert core_message is not None
+    assert PointMap.글_제출_코어채널_2등.reason in core_message
+    assert writing_message is not None
+    assert PointMap.글_제출_코어채널_1등.reason in writing_message
+
+
+def test_ranking_after_activity_period_is_skipped(
+    tmp_store, csv_writer_helper, mocker: MockerFixture
+) -> None:
+    """⚠️ 글또 활동 기간이 끝난 뒤의 제출에는 순위 포인트를 지급하지 않는다."""
+    _users(csv_writer_helper, tmp_store, [factories.make_user(user_id="U_A")])
+    _submit("U_A", "1.0", "2024-12-20 12:00:00")
+    mocker.patch(
+        "app.slack.services.point.tz_now",
+        return_value=datetime.datetime(2024, 12, 20, 15, 0, 0),
+    )
+
+    assert (
+        PointService(SlackRepository()).grant_if_post_submitted_to_core_channel_ranking(
+            "U_A"
+        )
+        is None
+    )
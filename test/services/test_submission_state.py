@@ -0,0 +1,114 @@
+"""유저별 제출 상태 테스트.
+
+대상: app/models.py (SubmissionState, get_submission_state), app/tables.py (TableView)
+- contents 테이블로 만든 상태와 콘텐츠 목록으로 만든 상태가 같은지
+- 글을 제출(append)하면 추가된 행만 반영하고, 시트에서 다시 받아오면(replace) 새로 만드는지
+- 저장소에서 가져온 유저는 콘텐츠를 불러오지 않고 콤보/패스를 확인하는지
+"""
+
+import datetime
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app import models
+from app.slack.repositories import SlackRepository
+from app.tables import table_cache
+from test import factories
+
+DUE_DATES = [
+    datetime.date(2024, 9, 29),  # 0회차 (시작일)
+    datetime.date(2024, 10, 13),  # 1회차
+    datetime.date(2024, 10, 27),  # 2회차
+    datetime.date(2024, 11, 10),  # 3회차
+    datetime.date(2024, 11, 24),  # 4회차
+    datetime.date(2024, 12, 8),  # 5회차 (현재 회차)
+]
+
+
+@pytest.fixture(autouse=True)
+def calendar(mocker: MockerFixture) -> None:
+    mocker.patch("app.models.DUE_DATES", DUE_DATES)
+    mocker.patch(
+        "app.models.tz_now",
+        return_value=datetime.datetime(2024, 11, 25, 15, 0, 0),
+    )
+
+
+def _content(ts: str, dt: str, type: str = "submit") -> models.Content:
+    return factories.make_content(user_id="U_A", ts=ts, dt=dt, type=type)
+
+
+CONTENTS = [
+    _content("1", "2024-10-10 12:00:00"),  # 1회차 제출
+    _content("2", "2024-10-20 12:00:00", type="pass"),  # 2회차 패스
+    _content("3", "2024-11-01 12:00:00"),  # 3회차 제출
+    _content("4", "2024-11-20 12:00:00", type="pass"),  # 4회차 패스
+    _content("5", "2024-11-21 12:00:00"),  # 4회차 마지막 콘텐츠는 제출
+]
+
+
+def test_table_state_matches_contents_state(tmp_store) -> None:
+    """✅ contents 테이블로 만든 상태는 콘텐츠 목록으로 계산한 상태와 같다."""
+    table = table_cache.table("contents")
+    for content in reversed(CONTENTS):  # CSV 순서와 무관하게 생성일시로 판단한다.
+        table.append(content.to_list_for_csv())
+
+    state = models.get_submission_state("U_A")
+
+    assert state == models.SubmissionState.from_contents(CONTENTS)
+    assert state.submitted_rounds == [1, 3, 4]
+    assert state.passed_rounds == [2]
+    assert state.pass_count == 2
+    assert state.last_submit_dt == "2024-11-21 12:00:00"
+    assert state.continuous_submit_count(datetime.date(2024, 11, 25)) == 3
+
+
+def test_submit_applies_only_appended_rows(tmp_store) -> None:
+    """✅ 글을 제출하면 기존 상태에 새 행만 반영하고, 시트에서 다시 받아오면 새로 만든다."""
+    repo = SlackRepository()
+    user = factories.make_user(user_id="U_A", contents=CONTENTS[:3])
+    for i in range(1, 4):
+        repo.update(factories.make_user(user_id="U_A", contents=CONTENTS[:i]))
+    _, states = models._submission_states.get()
+    assert (
+        models.get_submission_state("U_A").continuous_submit_count(
+            datetime.date(2024, 11, 25)
+        )
+        == 0
+    )  # 4회차 미제출
+
+    user.contents.append(CONTENTS[4])
+    repo.update(user)
+
+    assert models._submission_states.get()[1] is states
+    assert models.get_submission_state("U_A").rounds[4] == (
+        "2024-11-21 12:00:00",
+        "submit",
+    )
+
+    table_cache.table("contents").replace([models.Content.fieldnames()])
+    assert models._submission_states.get()[1] is not states
+    assert models.get_submission_state("U_A") == models.SubmissionState()
+
+
+def test_repository_user_checks_combo_without_loading_contents(
+    tmp_store, csv_writer_helper
+) -> None:
+    """🌀 저장소에서 가져온 유저는 콘텐츠를 불러오지 않고 제출 상태로 콤보와 패스를 확인한다."""
+    user = factories.make_user(user_id="U_A")
+    csv_writer_helper(
+        tmp_store / "users.csv", list(user.model_dump()), [user.model_dump()]
+    )
+    table = table_cache.table("contents")
+    for content in CONTENTS:
+        table.append(content.to_list_for_csv())
+
+    loaded = SlackRepository().get_user("U_A")
+    assert loaded is not None
+
+    assert loaded.get_continuous_submit_count() == 3
+    assert loaded.pass_count == 2
+    assert not loaded.is_prev_pass
+    assert not loaded.is_contents_loaded
+    assert loaded.get_submit_status() == {1: "제출", 2: "패스", 3: "제출", 4: "제출"}
@@ -328,6 +328,43 @@ async def test_handle_sync_store_dispatches_per_option(
     assert fake_slack_client.chat_postMessage.await_count == 2
 
 
+@pytest.mark.asyncio
+async def test_handle_sync_store_all_reports_table_timings(
+    ack, say, fake_slack_client, factory, slack_service, point_service_mock, mocker
+) -> None:
+    """✅ value=전체 → store.pull_all 호출 후 완료 메시지에 테이블별 소요 시간 포함."""
+    fake_store = MagicMock()
+    fake_store.pull_all.return_value = {"users": 0.5, "contents": 1.25}
+    mocker.patch("app.slack.events.core.Store", return_value=fake_store)
+    mocker.patch("app.slack.events.core.SpreadSheetClient")
+
+    body = make_action_body(
+        state={
+            "values": {
+                "sync_store_block": {
+                    "sync_store_select": {"selected_option": {"value": "전체"}}
+                }
+            }
+        }
+    )
+
+    await core_events.handle_sync_store(
+        ack=ack,
+        body=body,
+        say=say,
+        client=fake_slack_client,
+        user=factory.make_user(),
+        service=slack_service,
+        point_service=point_service_mock,
+    )
+
+    fake_store.pull_all.assert_called_once()
+    done_text = fake_slack_client.chat_postMessage.await_args.kwargs["text"]
+    assert done_text.startswith("전체 데이터 동기화 완료")
+    assert "- users: 0.50초" in done_text
+    assert "- contents: 1.25초" in done_text
+
+
 @pytest.mark.asyncio
 async def test_handle_sync_store_unknown_option(
     ack, say, fake_slack_client, factory, slack_service, point_service_mock, mocker
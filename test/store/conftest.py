@@ -0,0 +1,23 @@
+"""
+test/store 공용 픽스처.
+
+- `client` : 싱글톤을 우회하고 인증 정보와 빅쿼리 클라이언트를 가짜로 채운 BigqueryClient
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.bigquery.client import BigqueryClient
+
+
+@pytest.fixture
+def client() -> BigqueryClient:
+    # 싱글톤을 우회하고 인증 정보와 빅쿼리 클라이언트를 가짜로 채운다.
+    instance = object.__new__(BigqueryClient)
+    instance.__init__()  # type: ignore[misc]
+    instance._credentials = MagicMock(project_id="project")
+    instance._client = MagicMock()
+    return instance
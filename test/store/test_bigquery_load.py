@@ -0,0 +1,141 @@
+"""빅쿼리 Parquet 적재 테스트.
+
+대상: app/bigquery/arrow.py, app/bigquery/client.py
+- to_arrow_schema: json 스키마의 타입/필수 여부를 Arrow 스키마로 변환
+- write_parquet: 판다스 없이 행을 Parquet 으로 직렬화, 제너레이터는 나눠서 기록
+- BigqueryClient.load_rows: Parquet load job 으로 적재하고 (행 수, 바이트) 반환
+- BigqueryClient.merge_rows: 스테이징 테이블에 적재한 뒤 이벤트 키로 MERGE
+  스테이징 테이블은 항상 삭제하고, 대상 테이블은 배치의 tddate 파티션만 비교
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.bigquery import client as client_module
+from app.bigquery.arrow import to_arrow_schema, write_parquet
+from app.bigquery.client import BigqueryClient, TableNameEnum
+
+
+def _post(i: int) -> dict:
+    return {
+        "user_id": f"U_{i}",
+        "channel_id": "C_A",
+        "ts": f"{i}.0",
+        "tddate": date(2025, 1, 1),
+        "createtime": datetime(2025, 1, 1, 9, 0, i),
+        "text": "글 내용",
+    }
+
+
+def test_arrow_schema_follows_json_schema(client: BigqueryClient) -> None:
+    """✅ DATE/DATETIME 은 날짜/타임스탬프로, REQUIRED 는 not null 로 변환한다."""
+    schema = to_arrow_schema(client.schemas[TableNameEnum.POSTS_LOG])
+
+    assert schema.field("tddate").type == pa.date32()
+    assert schema.field("createtime").type == pa.timestamp("us")
+    assert not schema.field("user_id").nullable
+
+
+def test_unknown_type_raises() -> None:
+    """⚠️ 변환할 수 없는 타입은 적재 전에 알린다."""
+    with pytest.raises(ValueError):
+        to_arrow_schema([{"name": "geo", "type": "GEOGRAPHY", "mode": "NULLABLE"}])
+
+
+def test_write_parquet_streams_generator_in_row_groups(client: BigqueryClient) -> None:
+    """🌀 제너레이터를 row_group_size 개씩 나눠 기록하고 값은 그대로 읽힌다."""
+    schema = to_arrow_schema(client.schemas[TableNameEnum.POSTS_LOG])
+
+    buffer, count = write_parquet(
+        (_post(i) for i in range(5)), schema, row_group_size=2
+    )
+
+    parquet = pq.ParquetFile(buffer)
+    assert count == 5
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().to_pylist() == [_post(i) for i in range(5)]
+
+
+def test_load_rows_submits_parquet_load_job(client: BigqueryClient) -> None:
+    """✅ Parquet load job 하나로 적재하고 적재한 행 수를 반환한다."""
+    count, size = client.load_rows([_post(1), _post(2)], TableNameEnum.POSTS_LOG)
+
+    assert count == 2
+    assert size > 0
+    client.client.load_table_from_file.assert_called_once()
+    args, kwargs = client.client.load_table_from_file.call_args
+    assert args[1] == f"project.{client.database_id}.posts_log"
+    assert kwargs["job_config"].source_format == "PARQUET"
+
+
+def test_load_rows_skips_empty_rows(client: BigqueryClient) -> None:
+    """⚠️ 적재할 행이 없으면 load job 을 만들지 않는다."""
+    assert client.load_rows([], TableNameEnum.POSTS_LOG) == (0, 0)
+    client.client.load_table_from_file.assert_not_called()
+
+
+def test_merge_rows_loads_staging_and_merges_on_event_keys(
+    client: BigqueryClient,
+) -> None:
+    """✅ 스테이징 테이블에 적재하고 (channel_id, ts) 로 비교해 없는 행만 추가한다."""
+    client.client.query.return_value.num_dml_affected_rows = 1
+
+    count, _ = client.merge_rows([_post(1), _post(1)], TableNameEnum.POSTS_LOG)
+
+    assert count == 2
+    staging = client.client.create_table.call_args.args[0]
+    assert staging.table_id.startswith("posts_log_staging_")
+    assert staging.expires is not None
+    loaded_path = client.client.load_table_from_file.call_args.args[1]
+    assert loaded_path.endswith(staging.table_id)
+
+    query = client.client.query.call_args.args[0]
+    assert f"MERGE `project.{client.database_id}.posts_log` T" in query
+    assert "PARTITION BY channel_id, ts" in query
+    assert "ON T.channel_id = S.channel_id AND T.ts = S.ts" in query
+    assert "AND T.tddate BETWEEN @min_tddate AND @max_tddate" in query
+    assert "WHEN NOT MATCHED THEN" in query
+    assert f"FROM `{loaded_path}`" in query
+    client.client.delete_table.assert_called_once()
+
+
+def test_merge_rows_scans_only_batch_partitions(client: BigqueryClient) -> None:
+    """✅ 배치 행들의 tddate 범위를 파라미터로 넘겨 대상 테이블의 해당 파티션만 읽는다."""
+    rows = [
+        _post(1),
+        {**_post(2), "tddate": date(2025, 1, 3)},
+        {**_post(3), "tddate": date(2024, 12, 31)},
+    ]
+
+    client.merge_rows(rows, TableNameEnum.POSTS_LOG)
+
+    job_config = client.client.query.call_args.kwargs["job_config"]
+    params = {p.name: p.value for p in job_config.query_parameters}
+    assert params == {"min_tddate": date(2024, 12, 31), "max_tddate": date(2025, 1, 3)}
+
+
+def test_merge_rows_drops_staging_table_on_failure(client: BigqueryClient) -> None:
+    """⚠️ MERGE 가 실패해도 스테이징 테이블을 지우고 오류를 올려 다시 시도하게 한다."""
+    client.client.query.return_value.result.side_effect = RuntimeError("MERGE 실패")
+
+    with pytest.raises(RuntimeError):
+        client.merge_rows([_post(1)], TableNameEnum.POSTS_LOG)
+
+    client.client.delete_table.assert_called_once()
+    assert client.client.delete_table.call_args.kwargs == {"not_found_ok": True}
+
+
+def test_ingest_rows_follows_ingest_mode(client: BigqueryClient, monkeypatch) -> None:
+    """🌀 append 모드에서는 스테이징 없이 대상 테이블에 바로 적재한다."""
+    monkeypatch.setattr(client_module.settings, "BIGQUERY_INGEST_MODE", "append")
+
+    client.ingest_rows([_post(1)], TableNameEnum.POSTS_LOG)
+
+    client.client.create_table.assert_not_called()
+    client.client.query.assert_not_called()
+    assert client.client.load_table_from_file.call_args.args[1].endswith(".posts_log")
@@ -0,0 +1,125 @@
+"""빅쿼리 파라미터 쿼리와 조회 결과 캐시 테스트.
+
+대상: app/bigquery/query.py, app/bigquery/client.py
+- to_query_parameters: 파이썬 값을 빅쿼리 쿼리 파라미터(스칼라/배열)로 변환
+- query_rows/run_query_to_dataframe: 공백만 다른 같은 쿼리와 파라미터는 ttl 동안 캐시에서 반환
+- delete_table 은 캐시를 비우고, ttl=0 이면 캐시하지 않음
+- run_query_to_dataframe: 호출한 쪽이 결과를 수정해도 캐시된 DataFrame 은 그대로
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import pandas as pd
+import pytest
+
+from app.bigquery import query as query_module
+from app.bigquery.client import BigqueryClient, TableNameEnum
+from app.bigquery.query import QueryCache, to_query_parameters
+
+QUERY = "SELECT user_id FROM `logs` WHERE tddate = @tddate AND channel_id IN UNNEST(@channels)"
+PARAMS = {"tddate": date(2025, 1, 1), "channels": ["C_A", "C_B"]}
+
+
+@pytest.fixture
+def client(client: BigqueryClient) -> BigqueryClient:
+    result = client.client.query.return_value.result.return_value
+    result.to_arrow.return_value.to_pylist.return_value = [{"user_id": "U_A"}]
+    return client
+
+
+def test_query_parameters_follow_python_types() -> None:
+    """✅ 값의 타입에 맞는 파라미터 타입을 쓰고, 리스트는 배열 파라미터가 된다."""
+    parameters = to_query_parameters(
+        {
+            "flag": True,
+            "count": 1,
+            "tddate": date(2025, 1, 1),
+            "createtime": datetime(2025, 1, 1, 9),
+            "at": datetime(2025, 1, 1, tzinfo=UTC),
+            "channels": ("C_A",),
+        }
+    )
+
+    types = {
+        parameter.name: getattr(parameter, "type_", None) or parameter.array_type
+        for parameter in parameters
+    }
+    assert types == {
+        "flag": "BOOL",
+        "count": "INT64",
+        "tddate": "DATE",
+        "createtime": "DATETIME",
+        "at": "TIMESTAMP",
+        "channels": "STRING",
+    }
+
+
+def test_unsupported_parameter_raises() -> None:
+    """⚠️ 타입을 정할 수 없는 값은 쿼리를 보내기 전에 알린다."""
+    with pytest.raises(ValueError):
+        to_query_parameters({"channels": []})
+    with pytest.raises(ValueError):
+        to_query_parameters({"data": {"a": 1}})
+
+
+def test_query_rows_are_cached_by_normalized_query_and_params(
+    client: BigqueryClient,
+) -> None:
+    """✅ 공백만 다른 같은 쿼리와 파라미터는 빅쿼리에 다시 묻지 않는다."""
+    rows = client.query_rows(QUERY, PARAMS)
+    again = client.query_rows(QUERY.replace(" WHERE", "\n   WHERE"), dict(PARAMS))
+
+    assert rows == again == [{"user_id": "U_A"}]
+    client.client.query.assert_called_once()
+    job_config = client.client.query.call_args.kwargs["job_config"]
+    assert {p.name for p in job_config.query_parameters} == {"tddate", "channels"}
+
+    client.query_rows(QUERY, {**PARAMS, "tddate": date(2025, 1, 2)})
+    assert client.client.query.call_count == 2
+
+
+def test_cache_expires_and_can_be_skipped(client: BigqueryClient, monkeypatch) -> None:
+    """🌀 ttl 이 지나거나 ttl=0 이면 다시 조회하고, delete_table 후에는 캐시를 비운다."""
+    now = [100.0]
+    monkeypatch.setattr(query_module.time, "monotonic", lambda: now[0])
+
+    client.query_rows(QUERY, PARAMS, ttl=10)
+    now[0] += 11
+    client.query_rows(QUERY, PARAMS, ttl=10)
+    client.query_rows(QUERY, PARAMS, ttl=0)
+    assert client.client.query.call_count == 3
+
+    client.delete_table(
+        TableNameEnum.POSTS_LOG, "WHERE tddate = @tddate", {"tddate": date(2025, 1, 1)}
+    )
+    assert len(client.query_cache) == 0
+
+
+def test_cached_dataframe_is_not_shared_between_callers(
+    client: BigqueryClient,
+) -> None:
+    """⚠️ 한 호출자가 DataFrame 을 수정해도 다음 호출자는 원래 결과를 받는다."""
+    result = client.client.query.return_value.result.return_value
+    result.to_dataframe.return_value = pd.DataFrame({"user_id": ["U_A"]})
+
+    first = client.run_query_to_dataframe(QUERY, PARAMS)
+    first.loc[0, "user_id"] = "U_변경"
+    first["count"] = 1
+    second = client.run_query_to_dataframe(QUERY, PARAMS)
+
+    client.client.query.assert_called_once()
+    assert second.to_dict("records") == [{"user_id": "U_A"}]
+
+
+def test_cache_drops_least_recently_used() -> None:
+    """🌀 max_size 를 넘으면 가장 오래전에 사용한 결과부터 버린다."""
+    cache = QueryCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
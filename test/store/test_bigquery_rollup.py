@@ -0,0 +1,187 @@
+"""댓글/이모지 일별 집계 테스트.
+
+대상: app/bigquery/rollup.py, app/bigquery/queue.py, app/bigquery/client.py
+- rollup_rows: (tddate, channel_id, user_id, reaction) 별 개수로 집계
+- BIGQUERY_ROLLUP_MODE: only 는 집계만, both 는 원본과 집계를 함께 업로드
+- 업로드에 실패해 다시 보내면 같은 batch_id 로 개수를 새 값으로 바꾼다
+- 집계만 실패하면 원본 로그는 다시 올리지 않고, daily_activity 병합은 한 번에 하나씩 실행한다
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.bigquery import queue as bigquery_queue
+from app.bigquery.client import BigqueryClient, TableNameEnum
+from app.bigquery.rollup import rollup_rows
+from app.config import settings
+from app.queues import OffsetQueue
+
+
+def _emoji(user_id: str, reaction: str, day: int = 1) -> dict:
+    return {
+        "user_id": user_id,
+        "channel_id": "C_A",
+        "ts": "1.0",
+        "reactions_ts": f"{day}.{user_id}.{reaction}",
+        "tddate": date(2025, 1, day),
+        "createtime": datetime(2025, 1, day, 9),
+        "reaction": reaction,
+    }
+
+
+@pytest.fixture
+def emojis(monkeypatch) -> OffsetQueue:
+    queue: OffsetQueue[dict] = OffsetQueue()
+    monkeypatch.setattr(bigquery_queue, "comments_upload_queue", OffsetQueue())
+    monkeypatch.setattr(bigquery_queue, "emojis_upload_queue", queue)
+    monkeypatch.setattr(bigquery_queue, "posts_upload_queue", OffsetQueue())
+    monkeypatch.setattr(
+        bigquery_queue,
+        "flush_metrics",
+        {name: bigquery_queue.FlushMetrics() for name in TableNameEnum},
+    )
+    monkeypatch.setattr(bigquery_queue, "ingested_offsets", {})
+    return queue
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    client.ingest_rows.side_effect = lambda rows, table_name: (len(rows), 100)
+    client.merge_rows.side_effect = lambda rows, table_name: (len(rows), 10)
+    return client
+
+
+def test_rollup_counts_per_day_channel_user_reaction() -> None:
+    """✅ 같은 날짜, 채널, 사용자, 이모지의 로그는 개수 하나로 합친다."""
+    rows = [_emoji("U_A", "+1"), _emoji("U_A", "+1"), _emoji("U_A", "eyes")]
+    rows += [_emoji("U_A", "+1", day=2)]
+
+    activities = rollup_rows(rows, TableNameEnum.EMOJIS_LOG, batch_id="emojis_log:0")
+
+    assert [(a["tddate"].day, a["reaction"], a["count"]) for a in activities] == [
+        (1, "+1", 2),
+        (1, "eyes", 1),
+        (2, "+1", 1),
+    ]
+    assert {a["activity"] for a in activities} == {"emoji"}
+
+
+@pytest.mark.asyncio
+async def test_only_mode_uploads_aggregates_instead_of_raw_rows(
+    emojis: OffsetQueue, monkeypatch
+) -> None:
+    """✅ only 모드에서는 원본 로그 없이 집계만 daily_activity 에 병합한다."""
+    monkeypatch.setattr(settings, "BIGQUERY_ROLLUP_MODE", "only")
+    for _ in range(3):
+        emojis.append(_emoji("U_A", "+1"))
+    client = _client()
+
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    client.ingest_rows.assert_not_called()
+    rows, table_name = client.merge_rows.call_args.args
+    assert table_name == TableNameEnum.DAILY_ACTIVITY
+    assert [(row["batch_id"], row["count"]) for row in rows] == [("emojis_log:0", 3)]
+    assert len(emojis) == 0
+
+
+@pytest.mark.asyncio
+async def test_both_mode_uploads_raw_rows_and_aggregates(
+    emojis: OffsetQueue, monkeypatch
+) -> None:
+    """✅ both 모드에서는 원본 로그와 집계를 모두 올린다."""
+    monkeypatch.setattr(settings, "BIGQUERY_ROLLUP_MODE", "both")
+    emojis.append(_emoji("U_A", "+1"))
+    client = _client()
+
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    client.ingest_rows.assert_called_once()
+    assert client.merge_rows.call_args.args[1] == TableNameEnum.DAILY_ACTIVITY
+
+
+@pytest.mark.asyncio
+async def test_retry_recounts_same_batch(emojis: OffsetQueue, monkeypatch) -> None:
+    """🌀 업로드가 실패하면 다음 업로드는 같은 batch_id 로 새로 쌓인 로그까지 다시 센다."""
+    monkeypatch.setattr(settings, "BIGQUERY_ROLLUP_MODE", "only")
+    emojis.append(_emoji("U_A", "+1"))
+    client = _client()
+    client.merge_rows.side_effect = [ValueError("적재 실패"), (1, 10)]
+
+    with pytest.raises(ValueError):
+        await bigquery_queue.BigqueryQueue(client=client).upload()
+    emojis.append(_emoji("U_A", "+1"))
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    rows = client.merge_rows.call_args.args[0]
+    assert [(row["batch_id"], row["count"]) for row in rows] == [("emojis_log:0", 2)]
+
+
+@pytest.mark.asyncio
+async def test_rollup_failure_does_not_reingest_raw_rows(
+    emojis: OffsetQueue, monkeypatch
+) -> None:
+    """⚠️ 원본 적재 후 집계만 실패하면 다시 올릴 때 새로 쌓인 원본만 적재한다."""
+    monkeypatch.setattr(settings, "BIGQUERY_ROLLUP_MODE", "both")
+    emojis.append(_emoji("U_A", "+1"))
+    client = _client()
+    client.merge_rows.side_effect = [ValueError("집계 실패"), (1, 10)]
+
+    with pytest.raises(ValueError):
+        await bigquery_queue.BigqueryQueue(client=client).upload()
+    emojis.append(_emoji("U_B", "+1"))
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    ingested = [call.args[0] for call in client.ingest_rows.call_args_list]
+    assert [[row["user_id"] for row in rows] for rows in ingested] == [["U_A"], ["U_B"]]
+    assert len(emojis) == 0
+    assert bigquery_queue.ingested_offsets == {}
+
+
+@pytest.mark.asyncio
+async def test_daily_activity_merges_run_one_at_a_time(
+    emojis: OffsetQueue, monkeypatch
+) -> None:
+    """🌀 댓글과 이모지를 동시에 올려도 daily_activity 병합은 겹치지 않는다."""
+    monkeypatch.setattr(settings, "BIGQUERY_ROLLUP_MODE", "only")
+    emojis.append(_emoji("U_A", "+1"))
+    bigquery_queue.comments_upload_queue.append(
+        {**_emoji("U_B", ""), "comment_ts": "2.0", "text": "댓글"}
+    )
+    running, overlaps = [0], []
+    guard = threading.Lock()
+
+    def _merge(rows: list, table_name: TableNameEnum) -> tuple[int, int]:
+        with guard:
+            running[0] += 1
+            overlaps.append(running[0])
+        time.sleep(0.05)
+        with guard:
+            running[0] -= 1
+        return len(rows), 10
+
+    client = _client()
+    client.merge_rows.side_effect = _merge
+
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    assert client.merge_rows.call_count == 2
+    assert overlaps == [1, 1]
+
+
+def test_daily_activity_merge_replaces_count() -> None:
+    """⚠️ 집계 테이블의 MERGE 는 이미 있는 batch_id 의 개수를 더하지 않고 바꾼다."""
+    client = object.__new__(BigqueryClient)
+    client.__init__()  # type: ignore[misc]
+    client._credentials = MagicMock(project_id="project")
+
+    query = client._merge_query(TableNameEnum.DAILY_ACTIVITY, "project.dataset.stg")
+
+    assert "WHEN MATCHED THEN UPDATE SET count = S.count" in query
+    assert "T.batch_id = S.batch_id" in query
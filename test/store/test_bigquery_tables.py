@@ -0,0 +1,99 @@
+"""빅쿼리 로그 테이블 준비 테스트.
+
+대상: app/bigquery/client.py
+- ensure_tables: 없는 테이블은 tddate 파티션, channel_id/user_id 클러스터링으로 생성
+- 이미 있는 테이블은 클러스터링을 맞추고 json 스키마와 다른 컬럼/타입/파티션을 경고
+"""
+
+from __future__ import annotations
+
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery
+
+from app.bigquery.client import BigqueryClient, TableNameEnum
+
+
+def _live_table(
+    client: BigqueryClient, table_name: TableNameEnum, optimized: bool = True
+) -> bigquery.Table:
+    table = bigquery.Table(
+        f"project.dataset.{table_name}",
+        schema=[
+            bigquery.SchemaField.from_api_repr(field)
+            for field in client.schemas[table_name]
+        ],
+    )
+    if optimized:
+        table.time_partitioning = bigquery.TimePartitioning(field="tddate")
+        table.clustering_fields = ["channel_id", "user_id"]
+    return table
+
+
+def test_missing_tables_are_created_partitioned_and_clustered(
+    client: BigqueryClient,
+) -> None:
+    """✅ 없는 테이블은 tddate 일 단위 파티션과 channel_id, user_id 클러스터링으로 만든다."""
+    client.client.get_table.side_effect = NotFound("없음")
+
+    drifts = client.ensure_tables()
+
+    assert drifts == {table_name: [] for table_name in TableNameEnum}
+    created = [call.args[0] for call in client.client.create_table.call_args_list]
+    assert [table.table_id for table in created] == list(TableNameEnum)
+    for table in created:
+        assert table.time_partitioning.type_ == bigquery.TimePartitioningType.DAY
+        assert table.time_partitioning.field == "tddate"
+        assert table.clustering_fields == ["channel_id", "user_id"]
+
+
+def test_matching_tables_are_left_alone(client: BigqueryClient) -> None:
+    """✅ 스키마와 파티션, 클러스터링이 맞으면 아무것도 바꾸지 않는다."""
+    client.client.get_table.side_effect = lambda path: _live_table(
+        client, TableNameEnum(path.rsplit(".", 1)[1])
+    )
+
+    drifts = client.ensure_tables()
+
+    assert drifts == {table_name: [] for table_name in TableNameEnum}
+    client.client.create_table.assert_not_called()
+    client.client.update_table.assert_not_called()
+
+
+def test_schema_drift_is_reported(client: BigqueryClient) -> None:
+    """⚠️ 컬럼이 빠지거나 타입이 다르거나 파티션이 없으면 경고하고, 클러스터링은 맞춘다."""
+    table = _live_table(client, TableNameEnum.POSTS_LOG, optimized=False)
+    schema = [field for field in table.schema if field.name != "text"]
+    schema[0] = bigquery.SchemaField("user_id", "INT64", mode="REQUIRED")
+    table.schema = schema + [bigquery.SchemaField("extra", "STRING")]
+
+    client.client.get_table.side_effect = lambda path: (
+        table
+        if path.endswith(".posts_log")
+        else _live_table(client, TableNameEnum(path.rsplit(".", 1)[1]))
+    )
+
+    drift = client.ensure_tables()[TableNameEnum.POSTS_LOG]
+
+    assert drift == [
+        "text 컬럼이 테이블에 없습니다.",
+        "extra 컬럼이 json 스키마에 없습니다.",
+        "user_id 컬럼이 다릅니다. 스키마: ('STRING', 'REQUIRED'), 테이블: ('INTEGER', 'REQUIRED')",
+        "tddate 파티션이 없습니다.",
+    ]
+    client.client.update_table.assert_called_once_with(table, ["clustering_fields"])
+    assert table.clustering_fields == ["channel_id", "user_id"]
+
+
+def test_type_aliases_are_not_drift(client: BigqueryClient) -> None:
+    """🌀 INT64/INTEGER 처럼 이름만 다른 같은 타입, 모드 생략(NULLABLE)은 불일치가 아니다."""
+    client.schemas[TableNameEnum.POSTS_LOG] = [
+        {"name": "count", "type": "INTEGER"},
+    ]
+
+    assert (
+        client._schema_drift(
+            TableNameEnum.POSTS_LOG,
+            [bigquery.SchemaField("count", "INT64", mode="NULLABLE")],
+        )
+        == []
+    )
@@ -0,0 +1,258 @@
+"""offset 기반 업로드 큐 테스트.
+
+대상: app/queues.py, app/bigquery/queue.py
+- OffsetQueue: snapshot/commit 의미, 중복 값 보존, 업로드 중 추가된 항목 유지
+- BigqueryQueue.upload: 업로드한 offset 까지만 비우는지
+- BigqueryQueue.upload: 테이블별로 따로 재시도하고, 한 테이블이 실패해도 나머지는 업로드하는지
+- BigqueryQueue.upload(only_due=True): 행 수/바이트/나이 기준에 닿은 테이블만 업로드, 대기 지표
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+import tenacity
+from google.api_core import exceptions
+
+from app.bigquery import queue as bigquery_queue
+from app.bigquery.client import TableNameEnum
+from app.config import settings
+from app.queues import OffsetQueue
+from app.spool import SegmentedSpoolQueue
+
+
+def test_commit_drops_entries_before_offset() -> None:
+    """✅ commit(offset) 은 offset 이전 항목만 버린다."""
+    queue: OffsetQueue[str] = OffsetQueue()
+    assert [queue.append(v) for v in ["a", "b", "c"]] == [0, 1, 2]
+
+    queue.commit(2)
+
+    assert list(queue) == ["c"]
+    assert (queue.head, queue.tail) == (2, 3)
+
+
+def test_duplicated_entries_are_all_kept() -> None:
+    """✅ 같은 값이 두 번 들어와도 둘 다 업로드 대상이다. (값 비교로 지우지 않음)"""
+    queue: OffsetQueue[list[str]] = OffsetQueue()
+    queue.append(["U_A", "100"])
+    offset, first = queue.snapshot()
+    queue.append(["U_A", "100"])  # 업로드 중에 같은 값이 추가됨
+
+    queue.commit(offset)
+
+    assert first == [["U_A", "100"]]
+    assert list(queue) == [["U_A", "100"]]
+
+
+def test_commit_is_idempotent_and_bounded() -> None:
+    """🌀 이미 지난 offset 이나 tail 을 넘는 offset 으로 commit 해도 안전하다."""
+    queue: OffsetQueue[int] = OffsetQueue()
+    for i in range(10):
+        queue.append(i)
+
+    queue.commit(8)
+    queue.commit(3)
+    assert list(queue) == [8, 9]
+
+    queue.commit(100)
+    assert len(queue) == 0
+    assert queue.append(10) == 10
+
+
+@pytest.mark.asyncio
+async def test_bigquery_upload_commits_only_uploaded_offset(monkeypatch) -> None:
+    """✅ 업로드 도중 추가된 로그는 다음 업로드를 위해 남긴다."""
+    comments: OffsetQueue[dict] = OffsetQueue()
+    comments.append({"user_id": "U_A", "text": "댓글"})
+    monkeypatch.setattr(bigquery_queue, "comments_upload_queue", comments)
+    monkeypatch.setattr(bigquery_queue, "emojis_upload_queue", OffsetQueue())
+    monkeypatch.setattr(bigquery_queue, "posts_upload_queue", OffsetQueue())
+
+    def ingest_rows(rows, table_name):
+        comments.append({"user_id": "U_A", "text": "댓글"})
+        return len(rows), 100
+
+    client = MagicMock()
+    client.ingest_rows.side_effect = ingest_rows
+
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    client.ingest_rows.assert_called_once()
+    assert list(comments) == [{"user_id": "U_A", "text": "댓글"}]
+
+
+@pytest.fixture
+def bigquery_queues(monkeypatch) -> dict[TableNameEnum, OffsetQueue]:
+    queues: dict[TableNameEnum, OffsetQueue] = {
+        TableNameEnum.COMMENTS_LOG: OffsetQueue(),
+        TableNameEnum.EMOJIS_LOG: OffsetQueue(),
+        TableNameEnum.POSTS_LOG: OffsetQueue(),
+    }
+    monkeypatch.setattr(
+        bigquery_queue, "comments_upload_queue", queues[TableNameEnum.COMMENTS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue, "emojis_upload_queue", queues[TableNameEnum.EMOJIS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue, "posts_upload_queue", queues[TableNameEnum.POSTS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue,
+        "flush_metrics",
+        {name: bigquery_queue.FlushMetrics() for name in TableNameEnum},
+    )
+    # 재시도 대기 없이 바로 다시 시도한다.
+    monkeypatch.setattr(
+        bigquery_queue.tenacity,
+        "wait_random_exponential",
+        lambda **kwargs: tenacity.wait_none(),
+    )
+    for queue in queues.values():
+        queue.append({"user_id": "U_A"})
+    return queues
+
+
+@pytest.mark.asyncio
+async def test_bigquery_upload_isolates_failed_table(bigquery_queues) -> None:
+    """⚠️ 댓글 업로드가 실패해도 이모지/게시글은 업로드하고, 실패한 댓글만 남긴다."""
+
+    def ingest_rows(rows, table_name):
+        if table_name == TableNameEnum.COMMENTS_LOG:
+            raise exceptions.BadRequest("스키마 오류")
+        return len(rows), 100
+
+    client = MagicMock()
+    client.ingest_rows.side_effect = ingest_rows
+
+    with pytest.raises(exceptions.BadRequest):
+        await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    assert [len(queue) for queue in bigquery_queues.values()] == [1, 0, 0]
+    metrics = bigquery_queue.flush_metrics
+    assert metrics[TableNameEnum.COMMENTS_LOG].failures == 1
+    assert metrics[TableNameEnum.POSTS_LOG].rows == 1
+    assert metrics[TableNameEnum.POSTS_LOG].bytes == 100
+
+
+@pytest.mark.asyncio
+async def test_bigquery_upload_retries_each_table(bigquery_queues) -> None:
+    """🌀 할당량 초과(429)는 그 테이블만 다시 시도해 성공한다."""
+    attempts = {name: 0 for name in bigquery_queues}
+
+    def ingest_rows(rows, table_name):
+        attempts[table_name] += 1
+        if table_name == TableNameEnum.EMOJIS_LOG and attempts[table_name] == 1:
+            raise exceptions.TooManyRequests("quota")
+        return len(rows), 100
+
+    client = MagicMock()
+    client.ingest_rows.side_effect = ingest_rows
+
+    await bigquery_queue.BigqueryQueue(client=client).upload()
+
+    assert attempts == {
+        TableNameEnum.COMMENTS_LOG: 1,
+        TableNameEnum.EMOJIS_LOG: 2,
+        TableNameEnum.POSTS_LOG: 1,
+    }
+    assert all(len(queue) == 0 for queue in bigquery_queues.values())
+    assert bigquery_queue.flush_metrics[TableNameEnum.EMOJIS_LOG].failures == 0
+
+
+@pytest.fixture
+def spooled_queues(monkeypatch) -> dict[TableNameEnum, SegmentedSpoolQueue]:
+    queues = {
+        TableNameEnum.COMMENTS_LOG: SegmentedSpoolQueue("comments"),
+        TableNameEnum.EMOJIS_LOG: SegmentedSpoolQueue("emojis"),
+        TableNameEnum.POSTS_LOG: SegmentedSpoolQueue("posts"),
+    }
+    monkeypatch.setattr(
+        bigquery_queue, "comments_upload_queue", queues[TableNameEnum.COMMENTS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue, "emojis_upload_queue", queues[TableNameEnum.EMOJIS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue, "posts_upload_queue", queues[TableNameEnum.POSTS_LOG]
+    )
+    monkeypatch.setattr(
+        bigquery_queue,
+        "flush_metrics",
+        {name: bigquery_queue.FlushMetrics() for name in TableNameEnum},
+    )
+    monkeypatch.setattr(settings, "BIGQUERY_FLUSH_ROWS", 3)
+    monkeypatch.setattr(settings, "BIGQUERY_FLUSH_BYTES", 10_000)
+    monkeypatch.setattr(settings, "BIGQUERY_FLUSH_AGE_SECONDS", 60)
+    return queues
+
+
+def _uploaded_tables(client: MagicMock) -> set[TableNameEnum]:
+    return {call.args[1] for call in client.ingest_rows.call_args_list}
+
+
+@pytest.mark.asyncio
+async def test_upload_due_flushes_only_tables_over_threshold(
+    spooled_queues, monkeypatch
+) -> None:
+    """✅ 행 수, 바이트, 나이 중 하나라도 기준에 닿은 테이블만 업로드한다."""
+    for i in range(3):  # 행 수 기준
+        spooled_queues[TableNameEnum.COMMENTS_LOG].append({"i": i})
+    spooled_queues[TableNameEnum.EMOJIS_LOG].append(
+        {"text": "가" * 5000}
+    )  # 바이트 기준
+    spooled_queues[TableNameEnum.POSTS_LOG].append({"i": 0})  # 아직 기준 미달
+    client = MagicMock()
+    client.ingest_rows.side_effect = lambda rows, table_name: (len(rows), 100)
+
+    await bigquery_queue.BigqueryQueue(client=client).upload(only_due=True)
+
+    assert _uploaded_tables(client) == {
+        TableNameEnum.COMMENTS_LOG,
+        TableNameEnum.EMOJIS_LOG,
+    }
+    assert len(spooled_queues[TableNameEnum.POSTS_LOG]) == 1
+
+    # 가장 오래된 행이 나이 기준을 넘으면 업로드한다.
+    now = bigquery_queue.time.time()
+    monkeypatch.setattr(bigquery_queue.time, "time", lambda: now + 61)
+    await bigquery_queue.BigqueryQueue(client=client).upload(only_due=True)
+
+    assert len(spooled_queues[TableNameEnum.POSTS_LOG]) == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_due_waits_after_failure(spooled_queues) -> None:
+    """⚠️ 실패한 테이블은 잠시 쉬었다가 다시 시도해 관리자 알림이 쏟아지지 않는다."""
+    for i in range(3):
+        spooled_queues[TableNameEnum.COMMENTS_LOG].append({"i": i})
+    client = MagicMock()
+    client.ingest_rows.side_effect = exceptions.BadRequest("스키마 오류")
+
+    with pytest.raises(exceptions.BadRequest):
+        await bigquery_queue.BigqueryQueue(client=client).upload(only_due=True)
+    await bigquery_queue.BigqueryQueue(client=client).upload(only_due=True)
+
+    assert client.ingest_rows.call_count == 1
+    assert len(spooled_queues[TableNameEnum.COMMENTS_LOG]) == 3
+
+
+def test_queue_gauges_report_depth_bytes_and_lag(spooled_queues) -> None:
+    """🌀 대기 행 수/바이트/지연을 테이블별로 보여주고, 커밋하면 줄어든다."""
+    queue = spooled_queues[TableNameEnum.POSTS_LOG]
+    queue.append({"i": 0})
+    queue.append({"i": 1})
+
+    gauges = bigquery_queue.queue_gauges()[TableNameEnum.POSTS_LOG]
+    assert gauges["depth"] == 2
+    assert gauges["bytes"] > 0
+    assert gauges["lag"] >= 0
+
+    queue.commit(queue.tail)
+    assert bigquery_queue.queue_gauges()[TableNameEnum.POSTS_LOG] == {
+        "depth": 0,
+        "bytes": 0,
+        "lag": 0.0,
+    }
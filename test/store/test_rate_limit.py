@@ -0,0 +1,58 @@
+"""요청 제한기 테스트.
+
+대상: app/rate_limit.py
+- TokenBucket: 모아둔 토큰만큼은 바로 통과, 다 쓰면 채워질 때까지 대기
+"""
+
+from __future__ import annotations
+
+from app import rate_limit
+from app.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_within_capacity_does_not_wait(monkeypatch) -> None:
+    """✅ 분당 할당량만큼은 기다리지 않고 바로 보낸다."""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    bucket = TokenBucket(capacity=3, period=60)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert clock.sleeps == []
+
+
+def test_acquire_waits_for_refill_when_empty(monkeypatch) -> None:
+    """⚠️ 토큰을 다 쓰면 하나가 채워질 때까지(60초/3개 = 20초) 기다린다."""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    bucket = TokenBucket(capacity=3, period=60)
+    for _ in range(3):
+        bucket.acquire()
+
+    waited = bucket.acquire()
+
+    assert waited == 20
+    assert bucket.tokens == 0
+
+
+def test_tokens_never_exceed_capacity(monkeypatch) -> None:
+    """🌀 오래 쉬어도 토큰은 capacity 이상 쌓이지 않는다."""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    bucket = TokenBucket(capacity=3, period=60)
+    bucket.acquire()
+    clock.now += 3600
+
+    assert bucket.tokens == 3
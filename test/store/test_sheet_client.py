@@ -0,0 +1,300 @@
+"""스프레드시트 클라이언트 행 위치 인덱스 테스트.
+
+대상: app/client.py
+- get_values 로 전체를 받아올 때 인덱스를 만들고, update_* 는 get_all_records 없이 대상 행만 확인
+- bulk_upload 로 추가한 행도 인덱스에 반영
+- 시트 행이 밀리면 인덱스를 다시 만들어 올바른 행을 수정
+- batch_update_*: 같은 키는 마지막 값만 한 번의 batch_update 로 쓰고, 줄어든 API 호출 수 반환
+- 429 응답은 백오프 후 다시 시도, bulk_upload 는 배치마다 진행 상황을 알림
+- append 가 5xx 응답을 받으면 시트 끝 행을 확인해 추가되지 않았을 때만 다시 보냄
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from gspread.exceptions import APIError
+
+from app import client as client_module
+from app.client import SpreadSheetClient
+from app.models import Bookmark
+
+BOOKMARK_HEADER = [
+    "user_id",
+    "content_user_id",
+    "content_ts",
+    "note",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+
+class FakeWorksheet:
+    """행 목록을 메모리에 들고 있는 가짜 gspread Worksheet."""
+
+    def __init__(self, title: str, values: list[list[str]]) -> None:
+        self.title = title
+        self.values = [list(row) for row in values]
+        self.calls: list[str] = []
+        self.errors: list[Exception | None] = []  # append_rows 호출마다 발생시킬 오류
+        # 행을 추가한 뒤 발생시킬 오류 (시트에는 반영됐지만 응답이 실패한 경우)
+        self.errors_after_append: list[Exception | None] = []
+
+    def get_all_values(self) -> list[list[str]]:
+        self.calls.append("get_all_values")
+        return [list(row) for row in self.values]
+
+    def get_all_records(self) -> list[dict[str, Any]]:
+        raise AssertionError("get_all_records 를 호출하면 안 됩니다.")
+
+    def row_values(self, row: int) -> list[str]:
+        self.calls.append(f"row_values:{row}")
+        return list(self.values[row - 1]) if row <= len(self.values) else []
+
+    def update(self, range_name: str, values: list[list[str]]) -> None:
+        self.calls.append(f"update:{range_name}")
+        row = int(re.match(r"[A-Z]+(\d+)", range_name).group(1))  # type: ignore[union-attr]
+        self.values[row - 1] = list(values[0])
+
+    def batch_get(self, ranges: list[str]) -> list[list[list[str]]]:
+        self.calls.append("batch_get")
+        rows = [int(re.match(r"A(\d+)", r).group(1)) for r in ranges]  # type: ignore[union-attr]
+        return [
+            [list(self.values[row - 1])] if row <= len(self.values) else []
+            for row in rows
+        ]
+
+    def batch_update(self, data: list[dict[str, Any]]) -> None:
+        self.calls.append("batch_update")
+        for item in data:
+            row = int(re.match(r"[A-Z]+(\d+)", item["range"]).group(1))  # type: ignore[union-attr]
+            self.values[row - 1] = list(item["values"][0])
+
+    def append_rows(self, rows: list[list[str]]) -> dict[str, Any]:
+        self.calls.append("append_rows")
+        error = self.errors.pop(0) if self.errors else None
+        if error:
+            raise error
+        start = len(self.values) + 1
+        self.values.extend(list(row) for row in rows)
+        error = self.errors_after_append.pop(0) if self.errors_after_append else None
+        if error:
+            raise error
+        end = len(self.values)
+        return {"updates": {"updatedRange": f"{self.title}!A{start}:G{end}"}}
+
+
+def _bookmark_row(user_id: str, content_ts: str, note: str = "") -> list[str]:
+    return [user_id, "U_W", content_ts, note, "ACTIVE", "2025-01-01", "2025-01-01"]
+
+
+@pytest.fixture
+def sheet() -> FakeWorksheet:
+    worksheet = FakeWorksheet(
+        "bookmark",
+        [BOOKMARK_HEADER, _bookmark_row("U_A", "1.0"), _bookmark_row("U_B", "2.0")],
+    )
+    return worksheet
+
+
+def _api_error(code: int) -> APIError:
+    response = MagicMock()
+    response.json.return_value = {
+        "error": {"code": code, "message": "error", "status": "ERROR"}
+    }
+    return APIError(response)
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch) -> None:
+    for method in (
+        SpreadSheetClient._call,
+        SpreadSheetClient._call_write,
+        SpreadSheetClient._resend_rows,
+    ):
+        monkeypatch.setattr(method.retry, "sleep", lambda seconds: None)  # type: ignore[attr-defined]
+
+
+@pytest.fixture
+def client(sheet: FakeWorksheet) -> SpreadSheetClient:
+    # 싱글톤을 우회해 가짜 시트를 가진 인스턴스를 만든다.
+    instance = object.__new__(SpreadSheetClient)
+    instance.__init__(doc=None, sheets={"bookmark": sheet})  # type: ignore[arg-type, misc]
+    return instance
+
+
+def _bookmark(user_id: str, content_ts: str, note: str) -> Bookmark:
+    return Bookmark(
+        user_id=user_id,
+        content_user_id="U_W",
+        content_ts=content_ts,
+        note=note,
+        created_at="2025-01-01",
+        updated_at="2025-01-02",
+    )
+
+
+def test_update_uses_index_built_at_pull(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """✅ pull 때 만든 인덱스로 대상 행 하나만 읽어 확인하고 수정한다."""
+    client.get_values("bookmark")
+    sheet.calls.clear()
+
+    client.update_bookmark("bookmark", _bookmark("U_B", "2.0", "메모"))
+
+    assert sheet.calls == ["row_values:3", "update:A3:G3"]
+    assert sheet.values[2][3] == "메모"
+
+
+def test_bulk_upload_extends_index(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """✅ bulk_upload 로 추가한 행은 시트를 다시 읽지 않고 바로 찾는다."""
+    client.get_values("bookmark")
+    client.bulk_upload("bookmark", [_bookmark_row("U_C", "3.0")])
+    sheet.calls.clear()
+
+    assert client.find_row("bookmark", ("U_C", "3.0")) == 4
+    assert sheet.calls == ["row_values:4"]
+
+
+def test_index_is_rebuilt_when_rows_shift(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """🌀 누군가 시트 위쪽 행을 지워 위치가 바뀌면 다시 읽어 올바른 행을 수정한다."""
+    client.get_values("bookmark")
+    del sheet.values[1]  # U_A 행 삭제 → U_B 가 2행으로 이동
+    sheet.calls.clear()
+
+    client.update_bookmark("bookmark", _bookmark("U_B", "2.0", "메모"))
+
+    assert sheet.calls == ["row_values:3", "get_all_values", "update:A2:G2"]
+    assert sheet.values[1][3] == "메모"
+
+
+def test_update_missing_key_does_not_write(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """⚠️ 시트에 없는 키는 다른 행을 덮어쓰지 않고 건너뛴다."""
+    client.update_bookmark("bookmark", _bookmark("U_없음", "9.0", "메모"))
+
+    assert not any(call.startswith("update") for call in sheet.calls)
+    assert [row[3] for row in sheet.values[1:]] == ["", ""]
+
+
+def test_batch_update_coalesces_same_key(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """✅ 같은 키의 업데이트는 마지막 값만 batch_update 한 번으로 쓰고 절약한 호출 수를 반환한다."""
+    client.get_values("bookmark")
+    sheet.calls.clear()
+
+    saved = client.batch_update_bookmarks(
+        "bookmark",
+        [
+            _bookmark("U_A", "1.0", "첫 메모"),
+            _bookmark("U_B", "2.0", "메모"),
+            _bookmark("U_A", "1.0", "마지막 메모"),
+        ],
+    )
+
+    assert sheet.calls == ["batch_get", "batch_update"]
+    assert saved == 3 * 2 - 2
+    assert [row[3] for row in sheet.values[1:]] == ["마지막 메모", "메모"]
+
+
+def test_batch_update_rebuilds_index_once_when_rows_shift(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """🌀 인덱스가 가리키는 행이 달라졌다면 시트를 한 번만 다시 읽어 올바른 행에 쓴다."""
+    client.get_values("bookmark")
+    del sheet.values[1]  # U_A 행 삭제 → U_B 가 2행으로 이동
+    sheet.values.append(_bookmark_row("U_C", "3.0"))
+    sheet.calls.clear()
+
+    client.batch_update_bookmarks(
+        "bookmark",
+        [_bookmark("U_B", "2.0", "메모 B"), _bookmark("U_C", "3.0", "메모 C")],
+    )
+
+    assert sheet.calls == ["get_all_values", "batch_update"]
+    assert [row[3] for row in sheet.values[1:]] == ["메모 B", "메모 C"]
+
+
+def test_batch_update_skips_missing_keys(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """⚠️ 시트에 없는 키만 있으면 batch_update 를 호출하지 않는다."""
+    client.get_values("bookmark")
+    sheet.calls.clear()
+
+    client.batch_update_bookmarks("bookmark", [_bookmark("U_없음", "9.0", "메모")])
+
+    assert "batch_update" not in sheet.calls
+    assert [row[3] for row in sheet.values[1:]] == ["", ""]
+
+
+def test_quota_error_is_retried(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """✅ 429 응답은 다시 시도하고, 5xx 응답은 추가되지 않은 것을 확인한 뒤 다시 보낸다."""
+    sheet.errors = [_api_error(429), _api_error(503)]
+
+    client.bulk_upload("bookmark", [_bookmark_row("U_C", "3.0")])
+
+    assert sheet.calls == [
+        "append_rows",
+        "append_rows",
+        "get_all_values",
+        "append_rows",
+    ]
+    assert [row[0] for row in sheet.values[1:]] == ["U_A", "U_B", "U_C"]
+
+
+def test_server_error_after_append_is_not_resent(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """⚠️ 시트에 반영된 뒤 5xx 응답을 받으면 다시 보내지 않아 행이 중복되지 않는다."""
+    client.get_values("bookmark")
+    sheet.errors_after_append = [_api_error(503)]
+    sheet.calls.clear()
+
+    client.bulk_upload("bookmark", [_bookmark_row("U_C", "3.0")])
+
+    assert sheet.calls == ["append_rows", "get_all_values"]
+    assert [row[0] for row in sheet.values[1:]] == ["U_A", "U_B", "U_C"]
+    assert client.find_row("bookmark", ("U_C", "3.0")) == 4
+
+
+def test_client_error_is_not_retried(
+    client: SpreadSheetClient, sheet: FakeWorksheet
+) -> None:
+    """⚠️ 400 같은 요청 오류는 다시 시도하지 않고 바로 올린다."""
+    sheet.errors = [_api_error(400)]
+
+    with pytest.raises(APIError):
+        client.bulk_upload("bookmark", [_bookmark_row("U_C", "3.0")])
+
+    assert sheet.calls == ["append_rows"]
+
+
+def test_bulk_upload_reports_progress_per_batch(
+    client: SpreadSheetClient, sheet: FakeWorksheet, monkeypatch
+) -> None:
+    """🌀 배치가 성공할 때마다 올린 행 수를 알리고, 실패한 배치 이후는 보내지 않는다."""
+    monkeypatch.setattr(client_module, "APPEND_BATCH_SIZE", 2)
+    sheet.errors = [None, _api_error(400)]
+    rows = [_bookmark_row(f"U_{i}", f"{i}.0") for i in range(5)]
+    progress: list[int] = []
+
+    with pytest.raises(APIError):
+        client.bulk_upload("bookmark", rows, on_progress=progress.append)
+
+    assert progress == [2]
+    assert sheet.calls == ["append_rows"] * 2
+    assert [row[0] for row in sheet.values[3:]] == ["U_0", "U_1"]
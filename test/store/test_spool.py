@@ -0,0 +1,229 @@
+"""업로드 큐 디스크 스풀 테스트.
+
+대상: app/spool.py, app/store.py, app/bigquery/queue.py
+- SpoolQueue: append 시 스풀 기록, replay 로 복구, commit 한 offset 이후만 남김
+  커밋된 줄이 쌓이면 남은 항목만 다시 써서 스풀이 계속 커지지 않는지
+- SegmentedSpoolQueue: 크기/시간으로 세그먼트 교체, 다 쓴 세그먼트 삭제, 메모리 상한,
+  빅쿼리 로그 복구
+- Store.upload_queue: 업로드가 확인된 뒤에만 스풀을 비우는지, 성공한 배치까지는 커밋하는지
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import ANY, MagicMock
+
+import pytest
+
+from app import store
+from app.bigquery import queue as bigquery_queue
+from app.config import settings
+from app.models import Bookmark, BookmarkStatusEnum
+from app.spool import SegmentedSpoolQueue, SpoolQueue
+
+
+@pytest.fixture
+def spool_dir(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "spool"
+    monkeypatch.setattr(settings, "SPOOL_DIR", str(path))
+    return path
+
+
+def test_append_writes_spool_and_replay_restores(spool_dir: Path) -> None:
+    """✅ append 한 항목은 스풀에 남고, 새 프로세스(새 큐)에서 replay 로 복구된다."""
+    queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    queue.append(["U_A", "제목"])
+    queue.append(["U_A", "제목"])  # 같은 값도 각각 보존
+
+    restored: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    count = restored.replay()
+
+    assert count == 2
+    assert list(restored) == [["U_A", "제목"], ["U_A", "제목"]]
+
+
+def test_commit_skips_committed_entries_on_replay(spool_dir: Path) -> None:
+    """✅ commit 한 offset 이전 항목은 replay 에서 복구하지 않고, 모두 커밋되면 스풀을 지운다."""
+    queue: SpoolQueue[list[str]] = SpoolQueue("point_history_upload")
+    queue.append(["1"])
+    offset = queue.append(["2"])
+
+    queue.commit(offset)
+    restored: SpoolQueue[list[str]] = SpoolQueue("point_history_upload")
+    assert restored.replay() == 1
+    assert list(restored) == [["2"]]
+    assert restored.head == offset
+
+    restored.commit(restored.tail)
+    assert len(restored) == 0
+    assert not (spool_dir / "point_history_upload.jsonl").exists()
+    assert SpoolQueue("point_history_upload").replay() == 0
+
+
+def test_commit_compacts_spool_past_threshold(spool_dir: Path, monkeypatch) -> None:
+    """🌀 큐가 비지 않아도 커밋된 줄이 기준만큼 쌓이면 커밋되지 않은 줄만 남긴다."""
+    monkeypatch.setattr(settings, "SPOOL_COMPACT_LINES", 3)
+    queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    for i in range(5):
+        queue.append([str(i)])
+    path = spool_dir / "content_upload.jsonl"
+
+    queue.commit(2)
+    assert len(path.read_text().splitlines()) == 5  # 기준 전에는 그대로 둔다.
+
+    queue.commit(3)
+    queue.append(["5"])
+    offsets = [json.loads(line)["offset"] for line in path.read_text().splitlines()]
+    assert offsets == [3, 4, 5]
+
+    restored: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    assert restored.replay() == 3
+    assert list(restored) == [["3"], ["4"], ["5"]]
+    assert restored.head == 3
+
+
+def test_replay_decodes_models(spool_dir: Path) -> None:
+    """✅ decode 가 있으면 복구한 항목을 모델로 되돌린다."""
+    bookmark = Bookmark(user_id="U_A", content_user_id="U_B", content_ts="1.0")
+    SpoolQueue("bookmark_update").append(bookmark)
+
+    restored: SpoolQueue[Bookmark] = SpoolQueue(
+        "bookmark_update", decode=lambda data: Bookmark(**data)
+    )
+    restored.replay()
+
+    assert list(restored) == [bookmark]
+    assert next(iter(restored)).status == BookmarkStatusEnum.ACTIVE
+
+
+def test_replay_skips_torn_last_line(spool_dir: Path) -> None:
+    """🌀 쓰는 도중 종료되어 잘린 마지막 줄은 건너뛴다."""
+    spool_dir.mkdir()
+    (spool_dir / "paper_plane_upload.jsonl").write_text(
+        json.dumps({"offset": 0, "item": ["ok"]}) + "\n" + '["잘린', encoding="utf-8"
+    )
+
+    queue: SpoolQueue[list[str]] = SpoolQueue("paper_plane_upload")
+
+    assert queue.replay() == 1
+    assert list(queue) == [["ok"]]
+
+
+@pytest.mark.asyncio
+async def test_upload_queue_truncates_spool_after_upload(
+    spool_dir: Path, monkeypatch
+) -> None:
+    """✅ bulk_upload 가 성공하면 큐와 스풀이 비워진다."""
+    queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    queue.append(["U_A", "제목"])
+    monkeypatch.setattr(store, "content_upload_queue", queue)
+    client = MagicMock()
+
+    await store.Store(client=client).upload_queue()
+
+    client.bulk_upload.assert_any_call("contents", [["U_A", "제목"]], on_progress=ANY)
+    assert len(queue) == 0
+    assert SpoolQueue("content_upload").replay() == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_queue_keeps_spool_when_upload_fails(
+    spool_dir: Path, monkeypatch
+) -> None:
+    """⚠️ bulk_upload 가 실패하면 큐와 스풀을 그대로 둔다."""
+    queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    queue.append(["U_A", "제목"])
+    monkeypatch.setattr(store, "content_upload_queue", queue)
+    client = MagicMock()
+    client.bulk_upload.side_effect = RuntimeError("시트 오류")
+
+    with pytest.raises(RuntimeError):
+        await store.Store(client=client).upload_queue()
+
+    assert list(queue) == [["U_A", "제목"]]
+    assert SpoolQueue("content_upload").replay() == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_queue_commits_uploaded_batches_before_failure(
+    spool_dir: Path, monkeypatch
+) -> None:
+    """🌀 일부 배치만 올라간 뒤 실패하면, 다음 업로드는 남은 항목부터 다시 올린다."""
+    queue: SpoolQueue[list[str]] = SpoolQueue("content_upload")
+    for title in ["첫 글", "둘째 글", "셋째 글"]:
+        queue.append(["U_A", title])
+    monkeypatch.setattr(store, "content_upload_queue", queue)
+
+    def upload_first_batch(sheet_name, values, on_progress):
+        on_progress(2)  # 첫 배치(2행) 업로드 성공
+        raise RuntimeError("시트 오류")
+
+    client = MagicMock()
+    client.bulk_upload.side_effect = upload_first_batch
+
+    with pytest.raises(RuntimeError):
+        await store.Store(client=client).upload_queue()
+
+    assert list(queue) == [["U_A", "셋째 글"]]
+    assert SpoolQueue("content_upload").replay() == 1
+
+
+def test_segments_rotate_and_are_removed_after_commit(
+    spool_dir: Path, monkeypatch
+) -> None:
+    """✅ 세그먼트가 크기를 넘으면 새로 열고, 커밋이 끝난 세그먼트만 지운다."""
+    monkeypatch.setattr(settings, "SPOOL_SEGMENT_BYTES", 1)  # 한 줄마다 교체
+    queue: SegmentedSpoolQueue[dict] = SegmentedSpoolQueue("events")
+    for i in range(3):
+        queue.append({"i": i})
+    segments = sorted(p.name for p in (spool_dir / "events").glob("*.jsonl"))
+    assert segments == [f"{i:012d}.jsonl" for i in range(3)]
+
+    queue.commit(2)
+
+    assert sorted(p.name for p in (spool_dir / "events").glob("*.jsonl")) == [
+        f"{2:012d}.jsonl"
+    ]
+    assert list(queue) == [{"i": 2}]
+
+
+def test_memory_cap_keeps_overflow_on_disk(spool_dir: Path) -> None:
+    """🌀 메모리 상한을 넘는 항목은 디스크에만 두었다가 앞선 항목을 커밋하면 읽어온다."""
+    queue: SegmentedSpoolQueue[dict] = SegmentedSpoolQueue("events", memory_cap=2)
+    for i in range(5):
+        queue.append({"i": i})
+
+    offset, items = queue.snapshot()
+    assert (offset, items) == (2, [{"i": 0}, {"i": 1}])
+    assert len(queue) == 5
+
+    queue.commit(offset)
+    assert queue.snapshot() == (4, [{"i": 2}, {"i": 3}])
+    queue.append({"i": 5})  # 창이 가득 차 있으므로 디스크에만 기록
+    queue.commit(4)
+    assert queue.snapshot() == (6, [{"i": 4}, {"i": 5}])
+
+
+def test_segmented_replay_restores_uncommitted_events(spool_dir: Path) -> None:
+    """✅ 재시작하면 커밋되지 않은 빅쿼리 로그를 날짜/시간 타입 그대로 복구한다."""
+    event = {
+        "user_id": "U_A",
+        "channel_id": "C_A",
+        "ts": "1.0",
+        "tddate": date(2025, 1, 1),
+        "createtime": datetime(2025, 1, 1, 9, 0, 0, 123),
+        "text": "글",
+    }
+    name = bigquery_queue.posts_upload_queue.name
+    queue = SegmentedSpoolQueue(name, decode=bigquery_queue._decode_event)
+    queue.append({**event, "ts": "0.0"})
+    queue.append(event)
+    queue.commit(queue.head + 1)
+
+    restored = SegmentedSpoolQueue(name, decode=bigquery_queue._decode_event)
+
+    assert restored.replay() == 1
+    assert list(restored) == [event]
+    assert restored.append(event) == queue.tail
@@ -0,0 +1,152 @@
+"""SQLite 저장소 백엔드 테스트.
+
+대상: app/tables.py
+- SqliteTable: 조회/append/update/replace, values 는 헤더 + 행
+- TableCache: STORE_BACKEND=sqlite 일 때 SQLite 테이블 반환
+- import_csv_to_sqlite: CSV 일괄 이관
+- SlackRepository 가 SQLite 백엔드에서도 그대로 동작하는지
+- 행을 추가하기만 했다면 스냅샷을 이어 붙여 TableView 가 추가된 행만 반영하는지
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app import models
+from app.config import settings
+from app.slack.repositories import SlackRepository
+from app.tables import SqliteTable, import_csv_to_sqlite, table_cache
+from test import factories
+
+
+@pytest.fixture
+def sqlite_store(tmp_store: Path, monkeypatch):
+    """STORE_BACKEND 를 sqlite 로 바꾸고 임시 DB 를 사용합니다."""
+    db_path = tmp_store / "store.db"
+    monkeypatch.setattr(settings, "STORE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(db_path))
+    table_cache.clear()
+    yield db_path
+    table_cache.clear()
+
+
+def test_table_cache_returns_sqlite_table_with_wal(sqlite_store: Path) -> None:
+    """✅ sqlite 백엔드에서는 SqliteTable 을 반환하고 WAL 모드로 연다."""
+    table = table_cache.table("contents")
+
+    assert isinstance(table, SqliteTable)
+    assert table.all() == []
+    with sqlite3.connect(sqlite_store) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_table_append_find_update(sqlite_store: Path) -> None:
+    """✅ append 한 행을 인덱스 컬럼으로 조회하고 update 로 바꾼다."""
+    table = table_cache.table("subscriptions")
+    table.append(factories.make_subscription(id="S1", user_id="U_A").to_list_for_csv())
+    table.append(factories.make_subscription(id="S2", user_id="U_A").to_list_for_csv())
+
+    updated = table.update("id", "S2", {"status": "CANCELED"})
+
+    assert updated == 1
+    assert [row["status"] for row in table.find("user_id", "U_A")] == [
+        "ACTIVE",
+        "CANCELED",
+    ]
+    assert table.get("id", "없음") is None
+
+
+def test_sqlite_table_replace_and_values(sqlite_store: Path) -> None:
+    """✅ replace 는 전체 행을 교체하고 values 는 헤더 + 행을 반환한다."""
+    table = table_cache.table("writing_participation")
+    header = ["user_id", "name", "created_at", "is_writing_participation"]
+    table.append(["U_OLD", "기존", "2025-01-01 09:00:00", "True"])
+
+    table.replace([header, ["U_NEW", "새유저", "2025-02-01 09:00:00", "False"]])
+
+    assert table.values() == [
+        header,
+        ["U_NEW", "새유저", "2025-02-01 09:00:00", "False"],
+    ]
+
+
+def test_sqlite_table_csv_source_is_readable_by_pandas(sqlite_store: Path) -> None:
+    """🌀 csv_source 로 pandas 가 CSV 와 같은 방식으로 읽을 수 있다."""
+    table = table_cache.table("contents")
+    table.append(factories.make_content(ts="1.0").to_list_for_csv())
+
+    df = pd.read_csv(table.csv_source())
+
+    assert list(df.columns) == models.Content.fieldnames()
+    assert len(df) == 1
+
+
+def test_sqlite_table_rejects_unknown_column(sqlite_store: Path) -> None:
+    """⚠️ 존재하지 않는 컬럼으로 조회하면 KeyError."""
+    with pytest.raises(KeyError):
+        table_cache.table("users").find("user_id; DROP TABLE users", "x")
+
+
+def test_import_csv_to_sqlite_copies_rows(tmp_store: Path, csv_writer_helper) -> None:
+    """✅ store 의 CSV 를 SQLite 로 옮기고 테이블별 행 수를 반환한다."""
+    rows = [factories.make_content(ts=f"{i}.0").model_dump() for i in range(2)]
+    csv_writer_helper(tmp_store / "contents.csv", models.Content.fieldnames(), rows)
+    db_path = tmp_store / "imported.db"
+
+    counts = import_csv_to_sqlite(str(tmp_store), str(db_path))
+
+    assert counts["contents"] == 2
+    assert counts["users"] == 0
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT ts FROM contents ORDER BY rowid").fetchall() == [
+            ("0.0",),
+            ("1.0",),
+        ]
+
+
+def test_repository_works_on_sqlite_backend(sqlite_store: Path) -> None:
+    """✅ SlackRepository 가 SQLite 백엔드에서도 같은 결과를 돌려준다."""
+    repo = SlackRepository()
+    content = factories.make_content(user_id="U_A", ts="100.0", content_url="https://a")
+    user = factories.make_user(user_id="U_A", contents=[content])
+
+    repo.update(user)
+
+    assert repo.get_content_by(ts="100.0") == content
+    assert repo.get_content_by(content_url="https://a") == content
+
+
+def test_sqlite_snapshot_is_reused_until_version_changes(sqlite_store: Path) -> None:
+    """🌀 버전이 같으면 스냅샷을 재사용하고, 쓰기 후에는 새 스냅샷을 만든다."""
+    table = table_cache.table("users")
+    table.append({"user_id": "U_A", "name": "유저", "intro": "-"})
+    first = table.snapshot()
+
+    assert table.snapshot() is first
+    table.update("user_id", "U_A", {"intro": "안녕하세요"})
+
+    assert table.snapshot().version > first.version
+    assert table.snapshot().get("user_id", "U_A")["intro"] == "안녕하세요"  # type: ignore[index]
+    assert first.get("user_id", "U_A")["intro"] != "안녕하세요"  # type: ignore[index]
+
+
+def test_sqlite_append_extends_snapshot(sqlite_store: Path) -> None:
+    """✅ 추가만 했다면 새 스냅샷에 추가된 행만 이어 붙이고, 수정하면 다시 읽어 만든다."""
+    table = table_cache.table("users")
+    table.append({"user_id": "U_A", "name": "유저", "intro": "-"})
+    first = table.snapshot()
+
+    table.append({"user_id": "U_B", "name": "유저", "intro": "-"})
+    second = table.snapshot()
+
+    assert [row["user_id"] for row in second.appended_since(first)] == ["U_B"]  # type: ignore[union-attr]
+    assert len(first) == 1
+    assert first.find("user_id", "U_B") == []
+    assert second.get("user_id", "U_B") == table.get("user_id", "U_B")
+
+    table.update("user_id", "U_A", {"intro": "안녕하세요"})
+    assert table.snapshot().appended_since(second) is None
@@ -0,0 +1,130 @@
+"""시트 → 서버 저장소 동기화 테스트.
+
+대상: app/store.py
+- Store.pull_delta: 워터마크 이후 범위만 가져와 병합, 워터마크 행이 바뀌면 전체 동기화
+- Store.pull_full: 전체 동기화 후 워터마크 기록
+- Store.pull_all: 제한된 동시성으로 시트를 가져오고 테이블별 소요 시간 반환
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.store import TABLES, Store
+
+HEADER = ["id", "user_id", "reason", "point", "category", "created_at"]
+
+
+class FakeSheetClient:
+    """시트 값을 메모리에 들고 있는 가짜 SpreadSheetClient."""
+
+    def __init__(self, values: list[list[str]]) -> None:
+        self.values = values
+        self.calls: list[tuple[str, int]] = []
+
+    def get_values(self, sheet_name: str) -> list[list[str]]:
+        self.calls.append(("full", 1))
+        return [list(row) for row in self.values]
+
+    def get_values_from(self, sheet_name: str, start_row: int) -> list[list[str]]:
+        self.calls.append(("delta", start_row))
+        return [list(row) for row in self.values[start_row - 1 :]]
+
+
+def _row(i: int) -> list[str]:
+    return [f"P{i}", "U_A", "글 제출", "100", "글쓰기", f"2025-01-0{i} 09:00:00"]
+
+
+def test_first_delta_pull_falls_back_to_full(tmp_store: Path) -> None:
+    """✅ 워터마크가 없으면 전체를 가져온다."""
+    client = FakeSheetClient([HEADER, _row(1), _row(2)])
+
+    count = Store(client=client).pull_delta("point_histories")  # type: ignore[arg-type]
+
+    assert count == 2
+    assert client.calls == [("full", 1)]
+    assert Store(client=client).read("point_histories") == [HEADER, _row(1), _row(2)]  # type: ignore[arg-type]
+
+
+def test_delta_pull_fetches_only_new_rows(tmp_store: Path) -> None:
+    """✅ 두 번째부터는 마지막 동기화 행부터의 범위만 가져와 뒤에 붙인다."""
+    client = FakeSheetClient([HEADER, _row(1), _row(2)])
+    store = Store(client=client)  # type: ignore[arg-type]
+    store.pull_full("point_histories")
+    client.values += [_row(3), _row(4)]
+    client.calls.clear()
+
+    count = store.pull_delta("point_histories")
+
+    assert count == 2
+    assert client.calls == [("delta", 3)]
+    assert store.read("point_histories") == [HEADER] + [_row(i) for i in range(1, 5)]
+
+
+def test_delta_pull_replaces_local_rows_after_watermark(tmp_store: Path) -> None:
+    """🌀 워터마크 이후 로컬에만 추가된 행은 시트의 새 범위로 대체되어 중복되지 않는다."""
+    client = FakeSheetClient([HEADER, _row(1)])
+    store = Store(client=client)  # type: ignore[arg-type]
+    store.pull_full("point_histories")
+    store.write("point_histories", [HEADER, _row(1), _row(2)])  # 로컬 append
+    client.values.append(_row(2))  # 업로드 후 시트에 반영
+
+    store.pull_delta("point_histories")
+
+    assert store.read("point_histories") == [HEADER, _row(1), _row(2)]
+
+
+def test_delta_pull_falls_back_when_rows_above_watermark_changed(
+    tmp_store: Path,
+) -> None:
+    """⚠️ 워터마크 행이 바뀌었다면(수정/삭제) 전체를 다시 가져온다."""
+    client = FakeSheetClient([HEADER, _row(1), _row(2)])
+    store = Store(client=client)  # type: ignore[arg-type]
+    store.pull_full("point_histories")
+    client.values = [HEADER, _row(2), _row(3)]  # 첫 행 삭제 후 새 행 추가
+    client.calls.clear()
+
+    count = store.pull_delta("point_histories")
+
+    assert client.calls == [("delta", 3), ("full", 1)]
+    assert count == 2
+    assert store.read("point_histories") == [HEADER, _row(2), _row(3)]
+
+
+def test_pull_all_records_watermark_for_append_only_tables(tmp_store: Path) -> None:
+    """✅ 전체 동기화 후에는 증분 동기화가 새 범위만 가져온다."""
+    client = FakeSheetClient([HEADER, _row(1)])
+    store = Store(client=client)  # type: ignore[arg-type]
+    store.pull_all()
+    client.calls.clear()
+
+    assert store.pull_delta("point_histories") == 0
+    assert client.calls == [("delta", 2)]
+
+
+def test_pull_all_fetches_sheets_concurrently_within_limit(
+    tmp_store: Path, monkeypatch
+) -> None:
+    """✅ 시트를 SHEET_PULL_CONCURRENCY 개까지 동시에 가져오고 테이블별 소요 시간을 반환한다."""
+    monkeypatch.setattr(settings, "SHEET_PULL_CONCURRENCY", 3)
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    class SlowClient(FakeSheetClient):
+        def get_values(self, sheet_name: str) -> list[list[str]]:
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return super().get_values(sheet_name)
+
+    timings = Store(client=SlowClient([HEADER, _row(1)])).pull_all()  # type: ignore[arg-type]
+
+    assert list(timings) == list(TABLES)
+    assert all(seconds > 0 for seconds in timings.values())
+    assert running["max"] == 3
@@ -0,0 +1,307 @@
+"""store 테이블 캐시 테스트.
+
+대상: app/tables.py
+- CsvTable: 최초 1회 로드, 인덱스 조회, append/update 의 CSV·메모리 동시 반영, 외부 변경 감지
+- 스냅샷: 이후 쓰기와 무관한 일관된 읽기, 버전 증가, 원자적 파일 교체
+- SlackRepository 가 캐시를 통해 조회/쓰기 하는지
+- SlackRepository.fetch_channel_users: 글쓰기 채널은 참여 유저를 users.csv 순서로 한 번씩만 반환
+- SlackRepository.get_user: 콘텐츠는 처음 접근할 때 한 번만 불러오는지
+- TableView: 스냅샷이 바뀔 때만 파생 데이터를 다시 만드는지 (글쓰기 참여 집합)
+"""
+
+from __future__ import annotations
+
+import builtins
+import csv
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from app import models
+from app.slack.repositories import SlackRepository
+from app.tables import CsvTable, TableView, table_cache
+from test import factories
+
+CONTENTS_HEADER = models.Content.fieldnames()
+SUBSCRIPTIONS_HEADER = [
+    "id",
+    "user_id",
+    "target_user_id",
+    "target_user_channel",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+
+def _read_csv(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def test_table_loads_file_once_for_repeated_lookups(
+    tmp_store, csv_writer_helper, mocker: MockerFixture
+) -> None:
+    """✅ 같은 테이블을 여러 번 조회해도 파일은 한 번만 연다."""
+    rows = [
+        factories.make_content(user_id=f"U_{i}", ts=f"{i}.0").model_dump()
+        for i in range(3)
+    ]
+    csv_writer_helper(tmp_store / "contents.csv", CONTENTS_HEADER, rows)
+    table = CsvTable(str(tmp_store / "contents.csv"), ("user_id", "ts"))
+    open_spy = mocker.spy(builtins, "open")
+
+    assert table.get("ts", "1.0")["user_id"] == "U_1"  # type: ignore[index]
+    assert [row["ts"] for row in table.find("user_id", "U_2")] == ["2.0"]
+    assert table.find("user_id", "U_없음") == []
+
+    assert open_spy.call_count == 1
+
+
+def test_table_append_updates_csv_and_index(tmp_store) -> None:
+    """✅ append 는 CSV 끝에 행을 쓰고 인덱스에도 바로 반영된다."""
+    table = CsvTable(str(tmp_store / "contents.csv"), ("ts",))
+    content = factories.make_content(ts="42.0")
+
+    table.append(content.to_list_for_csv())
+
+    assert table.get("ts", "42.0")["title"] == content.title  # type: ignore[index]
+    assert _read_csv(tmp_store / "contents.csv")[0]["ts"] == "42.0"
+
+
+def test_table_update_rewrites_only_matching_rows(tmp_store, csv_writer_helper) -> None:
+    """✅ update 는 일치하는 행만 바꾸고 CSV 를 다시 쓴다."""
+    path = tmp_store / "subscriptions.csv"
+    csv_writer_helper(
+        path,
+        SUBSCRIPTIONS_HEADER,
+        [
+            factories.make_subscription(id="S1").model_dump(),
+            factories.make_subscription(id="S2").model_dump(),
+        ],
+    )
+    table = CsvTable(str(path), ("id",))
+
+    updated = table.update("id", "S2", {"status": "CANCELED"})
+
+    assert updated == 1
+    assert [row["status"] for row in _read_csv(path)] == ["ACTIVE", "CANCELED"]
+    assert table.get("id", "S2")["status"] == "CANCELED"  # type: ignore[index]
+
+
+def test_table_update_reindexes_changed_key(tmp_store, csv_writer_helper) -> None:
+    """🌀 인덱스 컬럼 값을 바꾸면 새 값으로 조회된다."""
+    path = tmp_store / "subscriptions.csv"
+    csv_writer_helper(
+        path, SUBSCRIPTIONS_HEADER, [factories.make_subscription(id="S1").model_dump()]
+    )
+    table = CsvTable(str(path), ("id", "user_id"))
+
+    table.update("id", "S1", {"user_id": "U_NEW"})
+
+    assert table.get("user_id", "U_NEW")["id"] == "S1"  # type: ignore[index]
+
+
+def test_table_reloads_when_file_is_rewritten_externally(
+    tmp_store, csv_writer_helper
+) -> None:
+    """🌀 다른 곳에서 CSV 를 덮어쓰면(시트 동기화 등) 다음 조회에서 다시 읽는다."""
+    path = tmp_store / "contents.csv"
+    table = CsvTable(str(path), ("ts",))
+    assert table.all() == []
+
+    csv_writer_helper(
+        path, CONTENTS_HEADER, [factories.make_content(ts="7.0").model_dump()]
+    )
+
+    assert table.get("ts", "7.0") is not None
+
+
+def test_table_cache_reuses_table_per_directory(tmp_store) -> None:
+    """🌀 같은 작업 디렉터리에서는 같은 테이블 객체를 재사용한다."""
+    first = table_cache.table("contents")
+    assert table_cache.table("contents") is first
+    assert first.path == str(tmp_store / "contents.csv")
+
+
+def test_repository_reads_and_writes_through_cache(tmp_store) -> None:
+    """✅ SlackRepository 로 쓴 콘텐츠를 ts/url/user_id 인덱스로 바로 조회한다."""
+    repo = SlackRepository()
+    content = factories.make_content(user_id="U_A", ts="100.0", content_url="https://a")
+    user = factories.make_user(user_id="U_A", contents=[content])
+
+    repo.update(user)
+
+    assert repo.get_content_by(ts="100.0") == content
+    assert repo.get_content_by(content_url="https://a") == content
+    assert repo.get_content_by(user_id="U_A", dt=content.dt) == content
+    assert repo.get_content_by(ts="없음") is None
+    assert _read_csv(tmp_store / "contents.csv")[0]["ts"] == "100.0"
+
+
+def test_fetch_writing_channel_users_once_in_users_order(
+    tmp_store, csv_writer_helper
+) -> None:
+    """⚠️ 참여 신청 행이 중복되어도 유저는 한 번만, users.csv 순서대로 반환한다."""
+    users = [factories.make_user(user_id=user_id) for user_id in ("U_A", "U_B", "U_C")]
+    csv_writer_helper(
+        tmp_store / "users.csv",
+        list(users[0].model_dump()),
+        [user.model_dump() for user in users],
+    )
+    table = table_cache.table("writing_participation")
+    for user_id in ("U_C", "U_A", "U_C"):
+        table.append(
+            {
+                "user_id": user_id,
+                "name": user_id,
+                "created_at": "",
+                "is_writing_participation": "True",
+            }
+        )
+
+    channel_users = SlackRepository().fetch_channel_users(
+        models.settings.WRITING_CHANNEL
+    )
+
+    assert [user.user_id for user in channel_users] == ["U_A", "U_C"]
+
+
+def test_get_user_loads_contents_on_first_access(
+    tmp_store, csv_writer_helper, mocker: MockerFixture
+) -> None:
+    """✅ 콘텐츠를 보지 않는 핸들러는 contents.csv 를 읽지 않고, 처음 접근할 때 한 번만 불러온다."""
+    user = factories.make_user(user_id="U_A")
+    csv_writer_helper(
+        tmp_store / "users.csv",
+        list(user.model_dump()),
+        [user.model_dump()],
+    )
+    contents = [
+        factories.make_content(user_id="U_A", ts=f"{i}.0", dt=f"2025-01-0{i} 12:00:00")
+        for i in (2, 1)
+    ]
+    csv_writer_helper(
+        tmp_store / "contents.csv",
+        CONTENTS_HEADER,
+        [content.model_dump() for content in contents],
+    )
+    fetch_contents = mocker.spy(SlackRepository, "_fetch_contents")
+
+    loaded = SlackRepository().get_user("U_A")
+    assert loaded is not None
+    assert loaded.channel_id == user.channel_id
+    assert not loaded.is_contents_loaded
+    fetch_contents.assert_not_called()
+
+    assert [content.ts for content in loaded.contents] == ["1.0", "2.0"]
+    loaded.contents.append(factories.make_content(user_id="U_A", ts="3.0"))
+    assert len(loaded.contents) == 3
+    fetch_contents.assert_called_once()
+
+
+def test_writing_participation_is_set_lookup_rebuilt_on_write(tmp_store) -> None:
+    """✅ 글쓰기 참여 여부는 집합으로 조회하고, 신청(append/update)하면 다시 만든다."""
+    table = table_cache.table("writing_participation")
+    table.append(
+        {
+            "user_id": "U_A",
+            "name": "A",
+            "created_at": "",
+            "is_writing_participation": "True",
+        }
+    )
+    table.append(
+        {
+            "user_id": "U_B",
+            "name": "B",
+            "created_at": "",
+            "is_writing_participation": "False",
+        }
+    )
+    user_a = factories.make_user(user_id="U_A")
+    user_b = factories.make_user(user_id="U_B")
+
+    assert user_a.is_writing_participation
+    assert not user_b.is_writing_participation
+    assert user_a.writing_channel_id == models.settings.WRITING_CHANNEL
+    participants = models.writing_participants.get()
+    assert participants == {"U_A"}
+    assert models.writing_participants.get() is participants
+
+    table.update("user_id", "U_B", {"is_writing_participation": "True"})
+
+    assert user_b.is_writing_participation
+    assert models.writing_participants.get() is not participants
+
+
+def test_table_view_follows_external_rewrite(tmp_store, csv_writer_helper) -> None:
+    """🌀 시트 동기화로 CSV 가 바뀌면 파생 데이터도 새 내용으로 만든다."""
+    view = TableView("contents", lambda snapshot: len(snapshot))
+    assert view.get() == 0
+
+    csv_writer_helper(
+        tmp_store / "contents.csv",
+        CONTENTS_HEADER,
+        [factories.make_content(ts="1.0").model_dump()],
+    )
+
+    assert view.get() == 1
+
+
+def test_snapshot_is_unaffected_by_later_writes(tmp_store, csv_writer_helper) -> None:
+    """✅ 먼저 가져간 스냅샷은 이후 update/append 와 무관하게 그대로 읽힌다."""
+    path = tmp_store / "subscriptions.csv"
+    csv_writer_helper(
+        path, SUBSCRIPTIONS_HEADER, [factories.make_subscription(id="S1").model_dump()]
+    )
+    table = CsvTable(str(path), ("id",))
+    before = table.snapshot()
+
+    table.update("id", "S1", {"status": "CANCELED"})
+    table.append(factories.make_subscription(id="S2").to_list_for_csv())
+
+    assert before.get("id", "S1")["status"] == "ACTIVE"  # type: ignore[index]
+    assert before.get("id", "S2") is None
+    assert len(before) == 1
+    assert len(table.snapshot()) == 2
+
+
+def test_version_increases_on_every_change(tmp_store, csv_writer_helper) -> None:
+    """✅ 쓰기와 외부 변경마다 버전이 올라가고, 읽기만 하면 그대로다."""
+    path = tmp_store / "contents.csv"
+    table = CsvTable(str(path), ("ts",))
+    versions = [table.version]
+
+    table.append(factories.make_content(ts="1.0").to_list_for_csv())
+    versions.append(table.version)
+    table.find("ts", "1.0")
+    versions.append(table.version)
+    table.update("ts", "1.0", {"title": "새 제목"})
+    versions.append(table.version)
+    table.replace([CONTENTS_HEADER])
+    versions.append(table.version)
+    csv_writer_helper(
+        path, CONTENTS_HEADER, [factories.make_content(ts="2.0").model_dump()]
+    )
+    versions.append(table.version)
+
+    assert versions[1] > versions[0]
+    assert versions[2] == versions[1]
+    assert versions[0] < versions[3] < versions[4] < versions[5]
+
+
+def test_rewrite_replaces_file_atomically(tmp_store, csv_writer_helper) -> None:
+    """🌀 전체 다시 쓰기는 새 파일로 교체하므로 임시 파일이 남지 않고 inode 가 바뀐다."""
+    path = tmp_store / "subscriptions.csv"
+    csv_writer_helper(
+        path, SUBSCRIPTIONS_HEADER, [factories.make_subscription(id="S1").model_dump()]
+    )
+    table = CsvTable(str(path), ("id",))
+    inode = path.stat().st_ino
+
+    table.update("id", "S1", {"status": "CANCELED"})
+
+    assert path.stat().st_ino != inode
+    assert not (tmp_store / "subscriptions.csv.tmp").exists()
+    assert _read_csv(path)[0]["status"] == "CANCELED"